@@ -0,0 +1,38 @@
+"""tweets search
+
+Revision ID: 9a4c2e7b1f60
+Revises: f3c7a2d8b154
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c2e7b1f60'
+down_revision: Union[str, None] = 'f3c7a2d8b154'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Колонка и индекс не описаны в модели (см. SEARCH_DDL в app/database/models/tweet.py).
+    op.add_column(
+        'tweets',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple'::regconfig, content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_tweets_search_vector', 'tweets', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tweets_search_vector', table_name='tweets', postgresql_using='gin')
+    op.drop_column('tweets', 'search_vector')
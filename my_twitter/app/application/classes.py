@@ -1,8 +1,18 @@
 import logging.config
+from collections import Counter
 from typing import Any
 
 from app.database.database import Database
 from app.settings.classes import Settings
+from app.utils.etag import ProfileVersions
+from app.utils.event_hub import EventHub
+from app.utils.feed_cache import FeedCache
+from app.utils.follow_graph import FollowGraph
+from app.utils.like_buffer import LikeBuffer
+from app.utils.popularity import PopularityUpdater
+from app.utils.single_flight import SingleFlight
+from app.utils.trending import TrendingEngine
+from app.utils.user_cache import UserCache
 from fastapi import FastAPI
 
 
@@ -21,6 +31,33 @@ class CustomFastApi(FastAPI):
         self.__settings.makedirs_MEDIA_FOLDER_ROOT()
         self.__settings.makedirs_LOGGING_ROOT()
         logging.config.dictConfig(self.__settings.LOG_SETTINGS.LOGGING_CONFIG)
+        self.__single_flight = SingleFlight()
+        self.__feed_cache = FeedCache(max_bytes=settings.FEED_CACHE_MAX_BYTES)
+        self.__event_hub = EventHub(
+            db=db, settings=settings, logger=self.get_logger("event_hub")
+        )
+        self.__like_buffer = LikeBuffer(
+            db=db,
+            flush_interval=settings.LIKE_BUFFER_FLUSH_INTERVAL_MS / 1000,
+            max_ops=settings.LIKE_BUFFER_MAX_OPS,
+            popularity_half_life_s=settings.POPULAR_HALF_LIFE_S,
+            logger=self.get_logger("like_buffer"),
+            on_write=self.__on_likes_written,
+        )
+        self.__follow_graph = FollowGraph(
+            compact_threshold=settings.FOLLOW_GRAPH_COMPACT_THRESHOLD
+        )
+        self.__user_cache = UserCache(
+            max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_S
+        )
+        self.__profile_versions = ProfileVersions(slots=settings.PROFILE_VERSION_SLOTS)
+        self.__trending = TrendingEngine(settings=settings)
+        self.__popularity = PopularityUpdater(
+            db=db,
+            half_life_s=settings.POPULAR_HALF_LIFE_S,
+            interval=settings.POPULAR_RECOMPUTE_S,
+            logger=self.get_logger("popularity"),
+        )
 
     @staticmethod
     def get_logger(name: str) -> logging.Logger:
@@ -47,3 +84,88 @@ class CustomFastApi(FastAPI):
         :return: Database.
         """
         return self.__db
+
+    def get_like_buffer(self) -> LikeBuffer:
+        """
+        Возвращает буфер лайков с отложенной записью.
+
+        :return: LikeBuffer.
+        """
+        return self.__like_buffer
+
+    def get_user_cache(self) -> UserCache:
+        """
+        Возвращает кэш пользователей по api_key.
+
+        :return: UserCache.
+        """
+        return self.__user_cache
+
+    def get_follow_graph(self) -> FollowGraph:
+        """
+        Возвращает граф подписок в памяти.
+
+        :return: FollowGraph.
+        """
+        return self.__follow_graph
+
+    def get_feed_cache(self) -> FeedCache:
+        """
+        Возвращает кэш страниц общей ленты.
+
+        :return: FeedCache.
+        """
+        return self.__feed_cache
+
+    def get_single_flight(self) -> SingleFlight:
+        """
+        Возвращает объединение одинаковых одновременных запросов.
+
+        :return: SingleFlight.
+        """
+        return self.__single_flight
+
+    def get_event_hub(self) -> EventHub:
+        """
+        Возвращает рассылку событий ленты (SSE).
+
+        :return: EventHub.
+        """
+        return self.__event_hub
+
+    def __on_likes_written(self, deltas: Counter[int]) -> None:
+        """
+        Вызывается после записи пачки лайков из буфера.
+        Тренды получают только фактически записанные лайки и дизлайки.
+
+        :param deltas: Изменение количества лайков по ID твитов.
+        :return: None.
+        """
+        self.__feed_cache.invalidate()
+        self.__event_hub.publish_likes(deltas)
+        for tweet_id, delta in deltas.items():
+            self.__trending.add_like(tweet_id, delta)
+
+    def get_profile_versions(self) -> ProfileVersions:
+        """
+        Возвращает счётчики версий профилей пользователей (для ETag).
+
+        :return: ProfileVersions.
+        """
+        return self.__profile_versions
+
+    def get_trending(self) -> TrendingEngine:
+        """
+        Возвращает тренды (хэштеги и твиты).
+
+        :return: TrendingEngine.
+        """
+        return self.__trending
+
+    def get_popularity(self) -> PopularityUpdater:
+        """
+        Возвращает фоновый пересчёт оценок популярности твитов.
+
+        :return: PopularityUpdater.
+        """
+        return self.__popularity
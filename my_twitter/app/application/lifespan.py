@@ -12,7 +12,11 @@ async def lifespan_func(app: CustomFastApi) -> AsyncGenerator[None, None]:
     """
     lifespan_func функция, обычно выполняет что-то до и после запуска приложения.
     В данной функции выполняется подключение к БД для создания таблиц, если таких ещё нет.
-    А также создаёт тестового пользователя из-за особенности фронта.
+    А также создаёт тестового пользователя из-за особенности фронта, строит граф подписок в памяти,
+    восстанавливает тренды, запускает фоновый пересчёт оценок популярности
+    и подключает рассылку событий через LISTEN/NOTIFY (если включена).
+    При остановке приложения записывает в БД всё, что осталось в буфере лайков,
+    останавливает пересчёт оценок популярности и рассылку событий.
 
     :param app: CustomFastApi.
     :return: AsyncGenerator[None, None].
@@ -37,6 +41,12 @@ async def lifespan_func(app: CustomFastApi) -> AsyncGenerator[None, None]:
                 loger.info("Успешное подключение к БД.")
                 async with app.get_db().get_sessionmaker() as session:
                     await get_or_create_test_user(session, app.get_settings())
+                await app.get_follow_graph().ensure_built(db)
+                loger.info("Граф подписок построен.")
+                await app.get_trending().rebuild(db)
+                loger.info("Тренды восстановлены.")
+                app.get_popularity().start()
+                await app.get_event_hub().start()
                 break
 
     task = asyncio.create_task(db_connect())  # Запускаем процесс подключения
@@ -47,4 +57,7 @@ async def lifespan_func(app: CustomFastApi) -> AsyncGenerator[None, None]:
     finally:
         stop_event.set()  # Ставим флаг остановки
         await task  # Дожидаемся завершения подключения к БД
+        await app.get_like_buffer().close()  # Записываем оставшиеся лайки
+        await app.get_popularity().close()  # Останавливаем пересчёт популярности
+        await app.get_event_hub().close()  # Отключаем поток событий
         loger.info("Завершаю работу приложения.")
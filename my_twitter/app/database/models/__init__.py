@@ -1,7 +1,10 @@
 from .attachment import Attachment
+from .hashtag import Hashtag
 from .like import Like
 from .subscriptions import Subscriptions
+from .timeline import Timeline
 from .tweet import Tweet
+from .tweet_hashtag import TweetHashtag
 from .user import User
 
 __all__ = [
@@ -10,4 +13,7 @@ __all__ = [
     "Like",
     "Tweet",
     "Subscriptions",
+    "Timeline",
+    "Hashtag",
+    "TweetHashtag",
 ]
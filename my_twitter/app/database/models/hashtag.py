@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING, List
+
+from app.database.models.base import Base
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+if TYPE_CHECKING:
+    from app.database.models.tweet_hashtag import TweetHashtag
+
+MAX_TAG_LENGTH = 100
+
+
+class Hashtag(Base):
+    """
+    Хэштег (#tag) или упоминание (@name), найденные в тексте твитов.
+
+    **id** ID хэштега. \n
+    **kind** Вид: "#" - хэштег, "@" - упоминание. \n
+    **tag** Текст без # и @ в нижнем регистре. \n
+    **tweet_entries** Связи с твитами.
+    """
+
+    __tablename__ = "hashtags"
+    __table_args__ = (UniqueConstraint("kind", "tag", name="hashtag_kind_tag"),)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(1), nullable=False)
+    tag: Mapped[str] = mapped_column(String(MAX_TAG_LENGTH), nullable=False)
+
+    tweet_entries: Mapped[List["TweetHashtag"]] = relationship(
+        back_populates="hashtag", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from app.database.models.base import Base
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -21,7 +21,10 @@ class Like(Base):
     """
 
     __tablename__ = "likes"
-    __table_args__ = (UniqueConstraint("tweet_id", "user_id", name="tweet_id_user_id"),)
+    __table_args__ = (
+        UniqueConstraint("tweet_id", "user_id", name="tweet_id_user_id"),
+        Index("ix_likes_tweet_id_id", "tweet_id", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     tweet_id: Mapped[int] = mapped_column(
         ForeignKey(column="tweets.id"), nullable=False
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from app.database.models.base import Base
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 if TYPE_CHECKING:
@@ -16,6 +16,7 @@ class Subscriptions(Base):
     __tablename__ = "subscriptions"
     __table_args__ = (
         UniqueConstraint("user_id", "follower_id", name="user_id_follower_id"),
+        Index("ix_subscriptions_follower_id_user_id", "follower_id", "user_id"),
     )
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey(column="users.id"), nullable=False)
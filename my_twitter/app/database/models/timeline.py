@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from app.database.models.base import Base
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+if TYPE_CHECKING:
+    from app.database.models.tweet import Tweet
+
+
+class Timeline(Base):
+    """
+    Запись домашней ленты пользователя (материализованная лента).
+    Заполняется при создании твита для каждого подписчика автора (fan-out on write).
+
+    **id** ID записи. \n
+    **user_id** ID владельца ленты. \n
+    **tweet_id** ID твита. \n
+    **author_id** ID автора твита (нужен для очистки ленты при отписке). \n
+    **created** Дата и время создания твита (копия Tweet.created для сортировки по индексу). \n
+    **tweet** Связанный твит.
+    """
+
+    __tablename__ = "timelines"
+    __table_args__ = (
+        UniqueConstraint("user_id", "tweet_id", name="timeline_user_id_tweet_id"),
+        Index(
+            "ix_timelines_user_id_created_tweet_id", "user_id", "created", "tweet_id"
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey(column="users.id", ondelete="CASCADE"), nullable=False
+    )
+    tweet_id: Mapped[int] = mapped_column(
+        ForeignKey(column="tweets.id", ondelete="CASCADE"), nullable=False
+    )
+    author_id: Mapped[int] = mapped_column(
+        ForeignKey(column="users.id", ondelete="CASCADE"), nullable=False
+    )
+    created: Mapped[datetime] = mapped_column(nullable=False)
+
+    tweet: Mapped["Tweet"] = relationship(back_populates="timeline_entries")
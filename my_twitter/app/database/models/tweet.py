@@ -1,13 +1,15 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
 
 from app.database.models.base import Base
-from sqlalchemy import ForeignKey, String, func
+from sqlalchemy import Connection, ForeignKey, Index, String, Table, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 if TYPE_CHECKING:
     from app.database.models.attachment import Attachment
     from app.database.models.like import Like
+    from app.database.models.timeline import Timeline
+    from app.database.models.tweet_hashtag import TweetHashtag
     from app.database.models.user import User
 
 MAX_TWEET_LENGTH = 5000
@@ -21,18 +23,32 @@ class Tweet(Base):
     **user_id** ID пользователя. \n
     **content** Текстовое содержимое твита. \n
     **created** Дата и время создания твита. \n
+    **like_count** Количество лайков (денормализованный счётчик). \n
+    **popularity** Оценка популярности: лайки, затухающие с возрастом твита (app/utils/popularity.py). \n
     **author** Связанный пользователь. \n
     **likes** Связанные лайки твита. \n
     **attachments** Связанные вложения твита. \n
+    **timeline_entries** Записи домашних лент, в которые попал твит. \n
+    **hashtag_entries** Хэштеги и упоминания твита. \n
     """
 
     __tablename__ = "tweets"
+    __table_args__ = (
+        Index("ix_tweets_created_id", "created", "id"),
+        Index("ix_tweets_popularity_id", "popularity", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey(column="users.id"), nullable=False)
     content: Mapped[str] = mapped_column(String(MAX_TWEET_LENGTH), nullable=False)
     created: Mapped[datetime] = mapped_column(
         default=datetime.now, server_default=func.now()
     )
+    like_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    popularity: Mapped[float] = mapped_column(
+        nullable=False, default=0.0, server_default="0"
+    )
 
     author: Mapped["User"] = relationship(back_populates="tweets", lazy="selectin")
     likes: Mapped[List["Like"]] = relationship(
@@ -41,6 +57,12 @@ class Tweet(Base):
     attachments: Mapped[List["Attachment"]] = relationship(
         back_populates="tweet", lazy="selectin", cascade="all, delete-orphan"
     )
+    timeline_entries: Mapped[List["Timeline"]] = relationship(
+        back_populates="tweet", cascade="all, delete-orphan", passive_deletes=True
+    )
+    hashtag_entries: Mapped[List["TweetHashtag"]] = relationship(
+        back_populates="tweet", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     @validates("content")
     def validate_content(self, _: str, value: str) -> str:
@@ -60,3 +82,63 @@ class Tweet(Base):
         :return:  List[Attachment]
         """
         return self.attachments
+
+
+# Индекс для чтения твитов одного автора от новых к старым
+# (подмешивание pull-авторов в ленту).
+Index(
+    "ix_tweets_user_id_created_id",
+    Tweet.user_id,
+    Tweet.created.desc(),
+    Tweet.id.desc(),
+)
+
+# Полнотекстовый поиск по content (app/utils/search.py). Объекты создаются DDL-событиями,
+# а не колонками модели, чтобы не читать tsvector при каждой загрузке твита.
+# PostgreSQL: генерируемая колонка tsvector с GIN-индексом (миграция 9a4c2e7b1f60).
+# SQLite: FTS5-таблица с внешним содержимым, синхронизируемая триггерами.
+SEARCH_TS_CONFIG = "simple"
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_tweets_search_vector"
+SEARCH_FTS_TABLE = "tweets_fts"
+SEARCH_DDL = {
+    "postgresql": [
+        f"ALTER TABLE tweets ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_TS_CONFIG}'::regconfig, content)) STORED",
+        f"CREATE INDEX {SEARCH_VECTOR_INDEX} ON tweets USING gin ({SEARCH_VECTOR_COLUMN})",
+    ],
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5("
+        "content, content='tweets', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER tweets_fts_insert AFTER INSERT ON tweets BEGIN "
+        f"INSERT INTO {SEARCH_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+        f"CREATE TRIGGER tweets_fts_delete AFTER DELETE ON tweets BEGIN "
+        f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, content) "
+        "VALUES ('delete', old.id, old.content); END",
+        f"CREATE TRIGGER tweets_fts_update AFTER UPDATE OF content ON tweets BEGIN "
+        f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        f"INSERT INTO {SEARCH_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+    ],
+}
+SEARCH_DROP_DDL = {"sqlite": [f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}"]}
+
+
+def get_ddl_listener(ddl: Dict[str, List[str]]) -> Callable[..., None]:
+    """
+    Функция вернёт обработчик событий after_create/after_drop таблицы,
+    который выполнит DDL-инструкции для диалекта соединения.
+
+    :param ddl: DDL-инструкции по названиям диалектов.
+    :return: Обработчик события.
+    """
+
+    def listener(_: Table, connection: Connection, **__: Any) -> None:
+        for statement in ddl.get(connection.dialect.name, []):
+            connection.exec_driver_sql(statement)
+
+    return listener
+
+
+event.listen(Tweet.__table__, "after_create", get_ddl_listener(SEARCH_DDL))
+event.listen(Tweet.__table__, "after_drop", get_ddl_listener(SEARCH_DROP_DDL))
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from app.database.models.base import Base
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+if TYPE_CHECKING:
+    from app.database.models.hashtag import Hashtag
+    from app.database.models.tweet import Tweet
+
+
+class TweetHashtag(Base):
+    """
+    Связь твита с хэштегом или упоминанием (обратный индекс по хэштегам).
+    Заполняется при создании твита (app/utils/hashtags.py).
+
+    **id** ID записи. \n
+    **hashtag_id** ID хэштега. \n
+    **tweet_id** ID твита. \n
+    **created** Дата и время создания твита (копия Tweet.created для сортировки по индексу). \n
+    **hashtag** Связанный хэштег. \n
+    **tweet** Связанный твит.
+    """
+
+    __tablename__ = "tweet_hashtags"
+    __table_args__ = (
+        UniqueConstraint(
+            "hashtag_id", "tweet_id", name="tweet_hashtag_hashtag_id_tweet_id"
+        ),
+        Index(
+            "ix_tweet_hashtags_hashtag_id_created_tweet_id",
+            "hashtag_id",
+            "created",
+            "tweet_id",
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    hashtag_id: Mapped[int] = mapped_column(
+        ForeignKey(column="hashtags.id", ondelete="CASCADE"), nullable=False
+    )
+    tweet_id: Mapped[int] = mapped_column(
+        ForeignKey(column="tweets.id", ondelete="CASCADE"), nullable=False
+    )
+    created: Mapped[datetime] = mapped_column(nullable=False)
+
+    hashtag: Mapped["Hashtag"] = relationship(back_populates="tweet_entries")
+    tweet: Mapped["Tweet"] = relationship(back_populates="hashtag_entries")
@@ -2,9 +2,9 @@ from typing import TYPE_CHECKING, List
 
 from app.database.models.base import Base
 from app.database.models.subscriptions import Subscriptions
-from sqlalchemy import String
+from sqlalchemy import String, func, select
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 if TYPE_CHECKING:
     from app.database.models.like import Like
@@ -23,6 +23,8 @@ class User(Base):
     **surname** Фамилия пользователя. \n
     **middle_name** Отчество пользователя. \n
     **api_key** Api-key пользователя. \n
+    **followers_count** Количество подписчиков (денормализованный счётчик). \n
+    **following_count** Количество подписок (отложенная загрузка, считается по индексу подписок). \n
     **tweets** Связанные твиты пользователя. \n
     **likes** Связанные лайки пользователя. \n
     **users_in_my_subscriptions** Подписки пользователя. \n
@@ -38,6 +40,15 @@ class User(Base):
     api_key: Mapped[str] = mapped_column(
         String(MAX_API_KEY_LENGTH), nullable=False, unique=True, index=True
     )
+    followers_count: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    following_count: Mapped[int] = column_property(
+        select(func.count(Subscriptions.id))
+        .where(Subscriptions.user_id == id)
+        .scalar_subquery(),
+        deferred=True,
+    )
 
     tweets: Mapped[List["Tweet"]] = relationship(
         back_populates="author", cascade="all, delete-orphan"
@@ -1,6 +1,11 @@
 from app.database.database import Database
 from app.database.models import User
 from app.manage_utils.classes import Commands
+from app.settings.settings import settings
+from app.utils.counters import reconcile_counters
+from app.utils.hashtags import backfill_hashtags
+from app.utils.popularity import recompute_popularity
+from app.utils.timeline import rebuild_timelines
 from app.utils.utils import get_or_create
 
 command_reg = Commands()
@@ -56,3 +61,73 @@ async def create_user(db: Database) -> None:
                 f"Пользователь: {user.first_name} {user.middle_name} {user.surname}, "
                 f"с api-key: {user.api_key}, уже есть в БД."
             )
+
+
+@command_reg.command(
+    command_name="rebuildtimelines",
+    description="Перестроение домашних лент всех пользователей.",
+)
+async def rebuild_timelines_command(db: Database) -> None:
+    """
+    Функция-команда для manage.py.
+    Перестраивает домашние ленты всех пользователей по твитам и подпискам.
+    Нужна для первичного заполнения ленты после миграции.
+
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        await rebuild_timelines(session)
+    print("Домашние ленты успешно перестроены.")
+
+
+@command_reg.command(
+    command_name="reconcilecounters",
+    description="Пересчёт денормализованных счётчиков по исходным таблицам.",
+)
+async def reconcile_counters_command(db: Database) -> None:
+    """
+    Функция-команда для manage.py.
+    Пересчитывает денормализованные счётчики (количество подписчиков пользователей
+    и количество лайков твитов).
+
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        await reconcile_counters(session)
+    print("Счётчики успешно пересчитаны.")
+
+
+@command_reg.command(
+    command_name="backfillhashtags",
+    description="Заполнение индекса хэштегов и упоминаний по существующим твитам.",
+)
+async def backfill_hashtags_command(db: Database) -> None:
+    """
+    Функция-команда для manage.py.
+    Разбирает тексты всех твитов и записывает их хэштеги и упоминания в обратный индекс.
+    Нужна для первичного заполнения после миграции, повторный запуск безопасен.
+
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        total = await backfill_hashtags(session)
+    print(f"Индекс хэштегов успешно заполнен (связей: {total}).")
+
+
+@command_reg.command(
+    command_name="recomputepopularity",
+    description="Пересчёт оценок популярности всех твитов с лайками.",
+)
+async def recompute_popularity_command(db: Database) -> None:
+    """
+    Функция-команда для manage.py.
+    Пересчитывает оценки популярности всех твитов с лайками (сортировка ленты sort=popular).
+    Нужна для первичного заполнения после миграции, повторный запуск безопасен.
+
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        total = await recompute_popularity(
+            session, settings.POPULAR_HALF_LIFE_S, full=True
+        )
+    print(f"Оценки популярности успешно пересчитаны (твитов: {total}).")
@@ -0,0 +1,46 @@
+from typing import Annotated, Optional
+
+from app.database.database import Database
+from app.database.models.hashtag import MAX_TAG_LENGTH
+from app.routers.app_routers.schemas.tweets import OutResponseTweet
+from app.settings.classes import Settings
+from app.utils.hashtags import load_hashtag_json
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.utils import get_database, get_settings
+from fastapi import APIRouter, Depends, Path, Query, Response
+
+router = APIRouter(tags=["hashtags"])
+
+
+@router.get(
+    "/hashtags/{tag}/tweets",
+    response_model=OutResponseTweet,
+    name="Твиты с хэштегом.",
+    description="Твиты с хэштегом (tag или %23tag) или упоминанием (%40name) "
+    "от новых к старым (с курсорной пагинацией). Регистр не учитывается, followed_by_me не заполняется.",
+)
+async def get_hashtag_tweets(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    tag: Annotated[str, Path(..., min_length=1, max_length=MAX_TAG_LENGTH + 1)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 10,
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_likes: Annotated[bool, Query()] = True,
+) -> Response:
+    """
+    Твиты с хэштегом или упоминанием.
+    Твиты читаются по обратному индексу tweet_hashtags, который заполняется при создании твита.
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param tag: Хэштег ("tag", "#tag") или упоминание ("@name").
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Если False, то таблица likes не читается и список likes будет пустым.
+    :return: Response с JSON-байтами OutResponseTweet.
+    """
+    async with db.get_sessionmaker() as session:
+        body = await load_hashtag_json(
+            session, settings, tag, limit, cursor, include_likes
+        )
+    return Response(content=body, media_type="application/json")
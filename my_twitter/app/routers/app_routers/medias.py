@@ -7,11 +7,13 @@ from app.routers.app_routers.schemas.medias import (
     OutAttachmentSchema,
 )
 from app.settings.classes import Settings
+from app.utils.user_cache import UserCache
 from app.utils.utils import (
     ImageManager,
     get_database,
     get_settings,
-    get_user_or_test_user,
+    get_user_cache,
+    get_user_identity,
 )
 from fastapi import APIRouter, Depends, File, Header, UploadFile
 
@@ -29,6 +31,7 @@ async def create_upload_file(
     file: Annotated[UploadFile, File(..., media_type="image/*")],
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
     api_key: Annotated[str, Header(...)] = "test",
 ) -> OutAttachmentSchema:
     """
@@ -37,12 +40,13 @@ async def create_upload_file(
     :param file: Объект с изображением.
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
     :param api_key: API key пользователя.
     :return: OutAttachmentSchema.
     """
     async with db.get_sessionmaker() as session:
-        user = await get_user_or_test_user(session, settings, api_key)
-        attachment_manager = ImageManager(settings, user, file)
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        attachment_manager = ImageManager(settings, user.id, file)
         await attachment_manager.save()
         attachment = Attachment(image_path=attachment_manager.file_path)
         session.add(attachment)
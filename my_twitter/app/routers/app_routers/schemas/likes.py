@@ -1,3 +1,6 @@
+from typing import List, Optional
+
+from app.routers.app_routers.schemas.base import BaseSchema
 from app.routers.app_routers.schemas.users import BaseUserSchema
 from pydantic import BaseModel, ConfigDict, Field, computed_field
 
@@ -28,3 +31,12 @@ class LikesSchema(BaseModel):
         return str(self.user.name)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OutResponseLikes(BaseSchema):
+    """
+    Out-схема страницы лайков твита.
+    """
+
+    likes: List[LikesSchema]
+    next_cursor: Optional[str] = None
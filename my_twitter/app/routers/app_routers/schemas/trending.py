@@ -0,0 +1,31 @@
+from typing import List
+
+from app.routers.app_routers.schemas.base import BaseSchema
+from pydantic import BaseModel
+
+
+class TrendingHashtagSchema(BaseModel):
+    """
+    Схема хэштега в трендах.
+    """
+
+    tag: str
+    score: float
+
+
+class TrendingTweetSchema(BaseModel):
+    """
+    Схема твита в трендах.
+    """
+
+    id: int
+    score: float
+
+
+class OutTrendingSchema(BaseSchema):
+    """
+    Out-схема трендов.
+    """
+
+    hashtags: List[TrendingHashtagSchema]
+    tweets: List[TrendingTweetSchema]
@@ -9,6 +9,9 @@ from app.settings.classes import Settings
 from app.utils.utils import get_image_url
 from pydantic import BaseModel, ConfigDict, Field, computed_field
 
+# Максимум ID твитов в одном пакетном запросе (/tweets/batch).
+MAX_BATCH_TWEETS = 100
+
 
 class OutBaseTweet(BaseModel):
     """
@@ -30,6 +33,8 @@ class OutTweet(OutBaseTweet):
     content: str
     author: BaseUserSchema
     likes: List[LikesSchema]
+    like_count: int
+    followed_by_me: Optional[bool] = None
 
     def set_settings(self, settings: Settings) -> Self:
         """
@@ -61,6 +66,14 @@ class InTweetSchema(BaseModel):
     tweet_media_ids: List[int]
 
 
+class InTweetIdsSchema(BaseModel):
+    """
+    Класс-схема входящих данных, для загрузки твитов по ID.
+    """
+
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_TWEETS)
+
+
 class OutSimpleResponseTweet(BaseSchema):
     """
     Простая Out-схема твита.
@@ -83,3 +96,30 @@ class OutResponseTweet(BaseSchema):
     """
 
     tweets: List[OutTweet]
+    next_cursor: Optional[str] = None
+
+
+class OutResponseTweetSearch(OutResponseTweet):
+    """
+    Out-схема результатов поиска твитов.
+    """
+
+    truncated: bool
+
+
+class OutResponseTweetDelta(BaseSchema):
+    """
+    Out-схема новых твитов ленты (since_id).
+    """
+
+    tweets: List[OutTweet]
+    has_gap: bool
+
+
+class OutResponseTweetBatch(BaseSchema):
+    """
+    Out-схема твитов, загруженных по ID.
+    """
+
+    tweets: List[OutTweet]
+    missing_ids: List[int]
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Union
 
 from app.routers.app_routers.schemas.base import BaseSchema
 from pydantic import BaseModel, ConfigDict, Field, computed_field
@@ -27,7 +27,16 @@ class BaseUserSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class UserSchema(BaseUserSchema):
+class ProfileUserSchema(BaseUserSchema):
+    """
+    Схема профиля пользователя: количество подписчиков и подписок без самих списков.
+    """
+
+    followers_count: int
+    following_count: int
+
+
+class UserSchema(ProfileUserSchema):
     """
     Полная схема пользователя.
     """
@@ -61,4 +70,56 @@ class OutUserSchema(BaseSchema):
     Out-схема пользователя
     """
 
-    user: UserSchema
+    user: Union[UserSchema, ProfileUserSchema]
+
+
+class SuggestionSchema(BaseUserSchema):
+    """
+    Схема кандидата для подписки.
+    """
+
+    mutual_count: int
+
+
+class OutResponseSuggestions(BaseSchema):
+    """
+    Out-схема кандидатов для подписки.
+    """
+
+    users: List[SuggestionSchema]
+
+
+class RelationshipSchema(BaseModel):
+    """
+    Схема отношений текущего пользователя с другим пользователем.
+    """
+
+    id: int
+    following: bool
+    followed_by: bool
+
+    @computed_field
+    def mutual(self) -> bool:
+        """
+        Возвращает признак взаимной подписки.
+
+        :return: True - если пользователи подписаны друг на друга.
+        """
+        return self.following and self.followed_by
+
+
+class OutResponseRelationships(BaseSchema):
+    """
+    Out-схема отношений текущего пользователя с другими пользователями.
+    """
+
+    relationships: List[RelationshipSchema]
+
+
+class OutResponseUsers(BaseSchema):
+    """
+    Out-схема страницы пользователей (подписчики или подписки).
+    """
+
+    users: List[BaseUserSchema]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,28 @@
+from typing import Annotated
+
+from app.routers.app_routers.schemas.trending import OutTrendingSchema
+from app.utils.trending import TrendingEngine
+from app.utils.utils import get_trending
+from fastapi import APIRouter, Depends, Response
+
+router = APIRouter(tags=["trending"])
+
+
+@router.get(
+    "/trending",
+    response_model=OutTrendingSchema,
+    name="Тренды.",
+    description="Хэштеги, которые чаще всего используют в новых твитах, и твиты, которые чаще всего лайкают, "
+    "за последние settings.TRENDING_WINDOW_S секунд (свежие события весят больше). "
+    "Ответ обновляется не чаще раза в settings.TRENDING_REFRESH_S секунд.",
+)
+async def get_trending_route(
+    trending: Annotated[TrendingEngine, Depends(get_trending)],
+) -> Response:
+    """
+    Тренды из счётчиков в памяти процесса: запрос не обращается к БД.
+
+    :param trending: Тренды.
+    :return: Response с JSON-байтами OutTrendingSchema.
+    """
+    return Response(content=trending.get_json(), media_type="application/json")
@@ -1,32 +1,77 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, AsyncGenerator, Literal, Optional, Union
 
 from app.database.database import Database
-from app.database.models import Attachment, Like, Tweet, User
+from app.database.models import (
+    Attachment,
+    Like,
+    Timeline,
+    Tweet,
+    TweetHashtag,
+    User,
+)
 from app.routers.app_routers.schemas.base import BaseSchema
+from app.routers.app_routers.schemas.likes import LikesSchema, OutResponseLikes
 from app.routers.app_routers.schemas.tweets import (
+    MAX_BATCH_TWEETS,
+    InTweetIdsSchema,
     InTweetSchema,
     OutBaseTweet,
     OutResponseTweet,
+    OutResponseTweetBatch,
+    OutResponseTweetSearch,
     OutSimpleResponseTweet,
-    OutTweet,
 )
 from app.settings.classes import Settings
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.event_hub import EventHub
+from app.utils.feed import (
+    get_feed_response,
+    get_followed_authors,
+    load_feed_json,
+    load_feed_since_json,
+    load_feed_tweets,
+    load_likes_preview,
+    load_popular_json,
+    load_tweets_batch_json,
+)
+from app.utils.feed_cache import FeedCache
+from app.utils.hashtags import extract_tags, save_tweets_tags
+from app.utils.like_buffer import LikeBuffer
+from app.utils.likes import add_like, remove_like
+from app.utils.pagination import MAX_PAGE_LIMIT, decode_cursor, next_cursor
+from app.utils.popularity import PopularityUpdater
+from app.utils.search import search_tweets_json
+from app.utils.single_flight import SingleFlight
+from app.utils.timeline import fan_out_tweet, get_timeline_tweets
+from app.utils.trending import TrendingEngine
+from app.utils.user_cache import UserCache
 from app.utils.utils import (
     delete_img_file,
     get_database,
+    get_event_hub,
+    get_feed_cache,
+    get_like_buffer,
+    get_popularity,
     get_settings,
-    get_user_or_test_user,
+    get_single_flight,
+    get_trending,
+    get_user_cache,
+    get_user_identity,
 )
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Body,
     Depends,
     Header,
     HTTPException,
     Path,
     Query,
+    Response,
 )
-from sqlalchemy import exists, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select
 
 router = APIRouter(tags=["tweets"])
 
@@ -41,29 +86,50 @@ async def create_tweet(
     data: Annotated[InTweetSchema, Body(...)],
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    feed_cache: Annotated[FeedCache, Depends(get_feed_cache)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    event_hub: Annotated[EventHub, Depends(get_event_hub)],
+    trending: Annotated[TrendingEngine, Depends(get_trending)],
+    background_tasks: BackgroundTasks,
     api_key: Annotated[str, Header(...)] = "test",
 ) -> OutSimpleResponseTweet:
     """
     Создание нового твита.
+    Хэштеги и упоминания из текста записываются в обратный индекс в той же транзакции.
+    После ответа твит разносится по домашним лентам подписчиков автора (фоновая задача),
+    а клиенты потока /tweets/stream получают событие tweet.
 
     :param data: Данные, для создания твита.
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param feed_cache: Кэш страниц общей ленты.
+    :param user_cache: Кэш пользователей по api_key.
+    :param event_hub: Рассылка событий ленты.
+    :param trending: Тренды.
+    :param background_tasks: Фоновые задачи.
     :param api_key: API key пользователя.
     :return: OutSimpleResponseTweet.
     """
     async with db.get_sessionmaker() as session:
-        user = await get_user_or_test_user(session, settings, api_key)
+        user = await get_user_identity(session, settings, user_cache, api_key)
 
         attachments_q = await session.execute(
             select(Attachment).filter(Attachment.id.in_(data.tweet_media_ids))
         )
         attachments = attachments_q.scalars().all()
 
-        tweet = Tweet(content=data.tweet_data, author=user)
+        tweet = Tweet(content=data.tweet_data, user_id=user.id)
         tweet.attachments.extend(attachments)
         session.add(tweet)
+        await session.flush()
+        await save_tweets_tags(session, [(tweet.id, tweet.created, tweet.content)])
         await session.commit()
+    feed_cache.invalidate()
+    event_hub.publish_tweet(tweet.id)
+    trending.add_tweet(extract_tags(tweet.content), tweet.created.timestamp())
+    background_tasks.add_task(
+        fan_out_tweet, db, settings, tweet.id, user.id, tweet.created
+    )
     return OutSimpleResponseTweet(tweet=OutBaseTweet.model_validate(tweet))
 
 
@@ -71,35 +137,299 @@ async def create_tweet(
     "/tweets",
     response_model=OutResponseTweet,
     name="Получение всех твитов.",
-    description="Получение всех твитов (с пагинацией).",
+    description="Получение всех твитов (с пагинацией). "
+    "Если передан cursor, то используется курсорная пагинация и offset игнорируется. "
+    "В likes встраиваются только первые лайки твита, полное количество - like_count. "
+    "Если include_likes=false, то вместо списка лайков используется только like_count. "
+    "Если include_followed_by_me=true, то в followed_by_me будет признак подписки текущего пользователя "
+    "(по умолчанию тестовый пользователь) на автора твита. "
+    "Если передан since_id, то вернутся только твиты новее него (без followed_by_me): "
+    "не больше limit и settings.FEED_SINCE_MAX_TWEETS, has_gap=true - новых твитов больше "
+    "и ленту стоит перечитать целиком.",
 )
 async def get_tweets(
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    feed_cache: Annotated[FeedCache, Depends(get_feed_cache)],
+    single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+    popularity: Annotated[PopularityUpdater, Depends(get_popularity)],
     offset: Annotated[int, Query(..., gte=0)] = 1,
     limit: Annotated[int, Query(..., gte=0)] = 10,
-) -> OutResponseTweet:
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_likes: Annotated[bool, Query()] = True,
+    include_followed_by_me: Annotated[bool, Query()] = False,
+    since_id: Annotated[Optional[int], Query(gt=0)] = None,
+    sort: Annotated[Literal["created", "popular"], Query()] = "created",
+    api_key: Annotated[str, Header(...)] = "test",
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Union[OutResponseTweet, Response]:
     """
     Получение всех твитов (с пагинацией).
 
+    Постраничная пагинация (offset) оставлена для фронта.
+    Курсорная пагинация (cursor) идёт по индексу (created, id),
+    поэтому стоимость страницы не зависит от её глубины, а страницы не сдвигаются при появлении новых твитов.
+
+    Страницы по offset (без followed_by_me) кэшируются готовыми JSON-байтами (settings.FEED_CACHE_ENABLED),
+    кэш сбрасывается при создании и удалении твита, лайке и дизлайке.
+    Одинаковые одновременные запросы (без followed_by_me) выполняют один запрос к БД и одну сериализацию.
+    Такие страницы сериализуются напрямую из Core-строк в JSON-байты (load_feed_json), минуя Pydantic,
+    а на PostgreSQL собираются в JSON одним запросом (json_agg).
+    Их ETag - поколение кэша ленты, которое меняется при каждой записи, поэтому на If-None-Match
+    с текущим ETag сразу возвращается 304 без обращения к кэшу, БД и сериализации.
+
+    С since_id возвращаются только твиты новее него (OutResponseTweetDelta, load_feed_since_json) -
+    короткий проход по первичному ключу, поэтому обновление уже загруженной ленты почти ничего не стоит.
+
+    С sort=popular твиты идут по убыванию оценки популярности (load_popular_json) - лайков,
+    затухающих с возрастом твита. Оценка хранится в tweets.popularity с индексом (popularity, id),
+    пересчитывается при каждом лайке и дизлайке и периодически в фоне (PopularityUpdater).
+    ETag таких страниц включает ещё и номер фонового пересчёта.
+
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param feed_cache: Кэш страниц общей ленты.
+    :param single_flight: Объединение одинаковых одновременных запросов.
+    :param popularity: Фоновый пересчёт оценок популярности.
     :param offset: Страница.
     :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Если False, то таблица likes не читается и список likes будет пустым.
+        Иначе в likes будут первые settings.LIKES_PREVIEW_LIMIT лайков.
+        Полное количество лайков всегда в like_count.
+    :param include_followed_by_me: Заполнить followed_by_me (один запрос к subscriptions на страницу).
+    :param since_id: Вернуть только твиты новее этого ID (offset, cursor, include_followed_by_me и sort игнорируются).
+    :param sort: Порядок ленты: created - от новых к старым, popular - по убыванию популярности
+        (cursor и include_followed_by_me игнорируются).
+    :param api_key: API key пользователя.
+    :param if_none_match: ETag предыдущего ответа.
+    :return: OutResponseTweet (или Response с готовыми JSON-байтами, или 304).
+    """
+    popular = sort == "popular" and since_id is None
+    if include_followed_by_me and since_id is None and not popular:
+        async with db.get_sessionmaker() as session:
+            tweets = await load_feed_tweets(
+                session, settings, offset, limit, cursor, include_likes
+            )
+            user = await get_user_identity(session, settings, user_cache, api_key)
+            followed = await get_followed_authors(session, user.id, tweets)
+        return get_feed_response(settings, tweets, limit, followed)
+
+    generation = feed_cache.generation
+    if popular:
+        version = popularity.version
+        etag = make_etag("tweets_popular", generation, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        async def build_popular() -> bytes:
+            async with db.get_sessionmaker() as session:
+                return await load_popular_json(
+                    session, settings, offset, limit, include_likes
+                )
+
+        body = await single_flight.do(
+            ("tweets_popular", generation, version, offset, limit, include_likes),
+            build_popular,
+        )
+        return Response(
+            content=body, media_type="application/json", headers={"ETag": etag}
+        )
+    etag = make_etag("tweets", generation)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag}
+    if since_id is not None:
+
+        async def build_delta() -> bytes:
+            async with db.get_sessionmaker() as session:
+                return await load_feed_since_json(
+                    session, settings, since_id, limit, include_likes
+                )
+
+        body = await single_flight.do(
+            ("tweets_since", generation, since_id, limit, include_likes), build_delta
+        )
+        return Response(content=body, media_type="application/json", headers=headers)
+    use_cache = settings.FEED_CACHE_ENABLED and cursor is None
+    cache_key = (offset, limit, include_likes)
+    if use_cache:
+        cached = feed_cache.get(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached, media_type="application/json", headers=headers
+            )
+
+    async def build_page() -> bytes:
+        async with db.get_sessionmaker() as session:
+            page = await load_feed_json(
+                session, settings, offset, limit, cursor, include_likes
+            )
+        if use_cache:
+            feed_cache.set(cache_key, page, generation)
+        return page
+
+    body = await single_flight.do(
+        ("tweets", generation, offset, limit, cursor, include_likes), build_page
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/tweets/stream",
+    response_class=StreamingResponse,
+    name="Поток событий ленты.",
+    description="Server-sent events: tweet - новый твит (в формате ленты), "
+    "like_count - изменилось количество лайков твита, "
+    "dropped - клиент не успевал читать и часть событий потеряна (стоит перечитать ленту).",
+)
+async def stream_tweets(
+    settings: Annotated[Settings, Depends(get_settings)],
+    event_hub: Annotated[EventHub, Depends(get_event_hub)],
+) -> StreamingResponse:
+    """
+    Поток новых твитов и изменений количества лайков (server-sent events).
+    Каждый клиент получает ограниченную очередь (settings.STREAM_QUEUE_SIZE): если он не успевает читать,
+    то самые старые события отбрасываются. Если событий нет, то раз в settings.STREAM_HEARTBEAT_S секунд
+    отправляется комментарий-пинг, чтобы прокси не закрывали соединение.
+
+    :param settings: Настройки приложения.
+    :param event_hub: Рассылка событий ленты.
+    :return: StreamingResponse.
+    """
+
+    async def events() -> AsyncGenerator[bytes, None]:
+        subscriber = event_hub.subscribe()
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                frames = await subscriber.get(settings.STREAM_HEARTBEAT_S)
+                yield b"".join(frames) if frames else b": ping\n\n"
+        finally:
+            event_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/tweets/timeline",
+    response_model=OutResponseTweet,
+    name="Домашняя лента.",
+    description="Твиты пользователей, на которых подписан текущий пользователь "
+    "(по умолчанию тестовый пользователь), и его собственные твиты (с курсорной пагинацией).",
+)
+async def get_timeline(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 10,
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_followed_by_me: Annotated[bool, Query()] = False,
+    api_key: Annotated[str, Header(...)] = "test",
+) -> OutResponseTweet:
+    """
+    Домашняя лента текущего пользователя.
+    Твиты push-авторов читаются из материализованной ленты (timelines) проходом по индексу
+    (user_id, created, tweet_id), твиты pull-авторов подмешиваются при чтении.
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_followed_by_me: Заполнить followed_by_me (один запрос к subscriptions на страницу).
+    :param api_key: API key пользователя.
     :return: OutResponseTweet.
     """
     async with db.get_sessionmaker() as session:
-        tweets_q = await session.execute(
-            select(Tweet)
-            .order_by(Tweet.created.desc())
-            .offset((offset - 1) * limit)
-            .limit(limit)
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        tweets = await get_timeline_tweets(
+            session,
+            settings,
+            user.id,
+            limit,
+            decode_cursor(cursor, datetime, int) if cursor is not None else None,
+        )
+        await load_likes_preview(session, tweets, settings.LIKES_PREVIEW_LIMIT)
+        followed = None
+        if include_followed_by_me:
+            followed = await get_followed_authors(session, user.id, tweets)
+    return get_feed_response(settings, tweets, limit, followed)
+
+
+@router.get(
+    "/tweets/search",
+    response_model=OutResponseTweetSearch,
+    name="Поиск твитов.",
+    description="Полнотекстовый поиск по тексту твитов: находятся твиты, содержащие все слова запроса, "
+    "от наиболее релевантных к наименее (с курсорной пагинацией). "
+    "По релевантности ранжируются только SEARCH_RANK_WINDOW самых новых совпадений: "
+    "truncated=true означает, что более старые совпадения в выдачу не попали. "
+    "Знаки препинания в запросе игнорируются, followed_by_me не заполняется.",
+)
+async def search_tweets(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    q: Annotated[str, Query(..., min_length=1, max_length=500)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 10,
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_likes: Annotated[bool, Query()] = True,
+) -> Response:
+    """
+    Поиск твитов по словам запроса.
+    На PostgreSQL используется генерируемая колонка tweets.search_vector с GIN-индексом,
+    на SQLite - FTS5-таблица tweets_fts. Страница сериализуется напрямую в JSON-байты (search_tweets_json).
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param q: Поисковый запрос.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Если False, то таблица likes не читается и список likes будет пустым.
+    :return: Response с JSON-байтами OutResponseTweetSearch.
+    """
+    async with db.get_sessionmaker() as session:
+        body = await search_tweets_json(
+            session, settings, q, limit, cursor, include_likes
         )
-        tweets = tweets_q.scalars().all()
-    validated_tweets = [
-        OutTweet.model_validate(tweet).set_settings(settings) for tweet in tweets
-    ]
-    return OutResponseTweet(tweets=validated_tweets)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post(
+    "/tweets/batch",
+    response_model=OutResponseTweetBatch,
+    name="Твиты по ID.",
+    description=f"Загрузка до {MAX_BATCH_TWEETS} твитов по списку ID (например, для уведомлений, результатов поиска "
+    "и событий потока) в формате ленты и в порядке запроса. "
+    "Несуществующие ID перечисляются в missing_ids, followed_by_me не заполняется.",
+)
+async def get_tweets_batch(
+    data: Annotated[InTweetIdsSchema, Body(...)],
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    include_likes: Annotated[bool, Query()] = True,
+) -> Response:
+    """
+    Пакетная загрузка твитов по ID.
+    Твиты с авторами читаются одним запросом IN по первичному ключу, лайки и вложения -
+    ещё не более чем двумя (как у страницы ленты), ответ сериализуется напрямую в JSON-байты
+    (load_tweets_batch_json).
+
+    :param data: ID твитов.
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param include_likes: Если False, то таблица likes не читается и список likes будет пустым.
+    :return: Response с JSON-байтами OutResponseTweetBatch.
+    """
+    async with db.get_sessionmaker() as session:
+        body = await load_tweets_batch_json(session, settings, data.ids, include_likes)
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete(
@@ -111,6 +441,8 @@ async def get_tweets(
 async def delete_tweet(
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    feed_cache: Annotated[FeedCache, Depends(get_feed_cache)],
+    trending: Annotated[TrendingEngine, Depends(get_trending)],
     tweet_id: Annotated[int, Path(..., gt=0)],
     api_key: Annotated[str, Header(...)] = "test",
 ) -> BaseSchema:
@@ -119,6 +451,8 @@ async def delete_tweet(
 
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param feed_cache: Кэш страниц общей ленты.
+    :param trending: Тренды.
     :param tweet_id: ID твита.
     :param api_key: API key пользователя.
     :return: BaseSchema.
@@ -134,12 +468,55 @@ async def delete_tweet(
             raise HTTPException(status_code=400, detail="Не верный запрос.")
         files_path = [att.image_path for att in tweet.attachments]
         await delete_img_file(*files_path, settings=settings)
+        await session.execute(delete(Timeline).where(Timeline.tweet_id == tweet.id))
+        await session.execute(
+            delete(TweetHashtag).where(TweetHashtag.tweet_id == tweet.id)
+        )
         await session.delete(tweet)
         await session.commit()
+    feed_cache.invalidate()
+    trending.delete_tweet(
+        tweet.id, extract_tags(tweet.content), tweet.created.timestamp()
+    )
 
     return BaseSchema()
 
 
+@router.get(
+    "/tweets/{tweet_id}/likes",
+    response_model=OutResponseLikes,
+    name="Лайки твита.",
+    description="Список пользователей, лайкнувших твит (с курсорной пагинацией).",
+)
+async def get_tweet_likes(
+    db: Annotated[Database, Depends(get_database)],
+    tweet_id: Annotated[int, Path(..., gt=0)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 50,
+    cursor: Annotated[Optional[str], Query()] = None,
+) -> OutResponseLikes:
+    """
+    Список пользователей, лайкнувших твит, в порядке лайков.
+    Страница читается проходом по индексу (tweet_id, id) с курсором по likes.id.
+
+    :param db: Инструмент работы с БД.
+    :param tweet_id: ID твита.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :return: OutResponseLikes.
+    """
+    query = select(Like).where(Like.tweet_id == tweet_id).order_by(Like.id).limit(limit)
+    if cursor is not None:
+        (like_id,) = decode_cursor(cursor, int)
+        query = query.where(Like.id > like_id)
+    async with db.get_sessionmaker() as session:
+        likes_q = await session.execute(query)
+        likes = likes_q.scalars().all()
+    return OutResponseLikes(
+        likes=[LikesSchema.model_validate(like) for like in likes],
+        next_cursor=next_cursor(likes, limit, "id"),
+    )
+
+
 @router.post(
     "/tweets/{tweet_id}/likes",
     response_model=BaseSchema,
@@ -149,30 +526,44 @@ async def delete_tweet(
 async def like_tweet(
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    feed_cache: Annotated[FeedCache, Depends(get_feed_cache)],
+    like_buffer: Annotated[LikeBuffer, Depends(get_like_buffer)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    event_hub: Annotated[EventHub, Depends(get_event_hub)],
+    trending: Annotated[TrendingEngine, Depends(get_trending)],
     tweet_id: Annotated[int, Path(..., gt=0)],
     api_key: Annotated[str, Header(...)] = "test",
 ) -> BaseSchema:
     """
     Текущий пользователь (по умолчанию тестовый пользователь) ставит лайк твиту.
+    Выполняется за постоянное число запросов, твит и его лайки не загружаются.
+    Если включён буфер лайков (LIKE_BUFFER_ENABLED), то запрос подтверждается сразу,
+    а запись в БД происходит пачкой (повтор и отсутствие твита при этом не проверяются).
+    Клиенты потока /tweets/stream получают событие like_count, а тренды - лайк
+    (с буфером - после записи пачки и только если лайк действительно записан).
 
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param feed_cache: Кэш страниц общей ленты.
+    :param like_buffer: Буфер лайков с отложенной записью.
+    :param user_cache: Кэш пользователей по api_key.
+    :param event_hub: Рассылка событий ленты.
+    :param trending: Тренды.
     :param tweet_id: ID твита.
     :param api_key: API key пользователя.
     :return: BaseSchema.
     """
     async with db.get_sessionmaker() as session:
-        user = await get_user_or_test_user(session, settings, api_key)
-        tweet_q = await session.execute(select(Tweet).where(Tweet.id == tweet_id))
-        tweet = tweet_q.scalars().one()
-        like_exists_q = await session.execute(
-            select(exists().where(Like.user_id == user.id, Like.tweet_id == tweet_id))
-        )
-        like_exists = like_exists_q.scalar()
-        if like_exists:
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        if settings.LIKE_BUFFER_ENABLED:
+            await like_buffer.add(tweet_id, user.id, liked=True)
+            return BaseSchema()
+        if not await add_like(session, tweet_id, user.id, settings.POPULAR_HALF_LIFE_S):
             raise HTTPException(status_code=400, detail="Не верный запрос.")
-        tweet.likes.append(Like(user=user))
         await session.commit()
+    feed_cache.invalidate()
+    event_hub.publish_likes([tweet_id])
+    trending.add_like(tweet_id)
     return BaseSchema()
 
 
@@ -185,28 +576,44 @@ async def like_tweet(
 async def dislike_tweet(
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    feed_cache: Annotated[FeedCache, Depends(get_feed_cache)],
+    like_buffer: Annotated[LikeBuffer, Depends(get_like_buffer)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    event_hub: Annotated[EventHub, Depends(get_event_hub)],
+    trending: Annotated[TrendingEngine, Depends(get_trending)],
     tweet_id: Annotated[int, Path(..., gt=0)],
     api_key: Annotated[str, Header(...)] = "test",
 ) -> BaseSchema:
     """
     Текущий пользователь (по умолчанию тестовый пользователь) убирает свой лайк у твита.
+    Выполняется за постоянное число запросов, твит и его лайки не загружаются.
+    Если включён буфер лайков (LIKE_BUFFER_ENABLED), то запрос подтверждается сразу,
+    а запись в БД происходит пачкой (повтор и отсутствие твита при этом не проверяются).
+    Клиенты потока /tweets/stream получают событие like_count, а тренды - дизлайк
+    (с буфером - после записи пачки и только если лайк действительно удалён).
 
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param feed_cache: Кэш страниц общей ленты.
+    :param like_buffer: Буфер лайков с отложенной записью.
+    :param user_cache: Кэш пользователей по api_key.
+    :param event_hub: Рассылка событий ленты.
+    :param trending: Тренды.
     :param tweet_id: ID твита.
     :param api_key: API key пользователя.
     :return: BaseSchema.
     """
     async with db.get_sessionmaker() as session:
-        user = await get_user_or_test_user(session, settings, api_key)
-        tweet_q = await session.execute(select(Tweet).where(Tweet.id == tweet_id))
-        tweet = tweet_q.scalars().one()
-        like_q = await session.execute(
-            select(Like).where(Like.user_id == user.id, Like.tweet_id == tweet_id)
-        )
-        like = like_q.scalars().one_or_none()
-        if not like:
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        if settings.LIKE_BUFFER_ENABLED:
+            await like_buffer.add(tweet_id, user.id, liked=False)
+            return BaseSchema()
+        if not await remove_like(
+            session, tweet_id, user.id, settings.POPULAR_HALF_LIFE_S
+        ):
             raise HTTPException(status_code=400, detail="Не верный запрос.")
-        tweet.likes.remove(like)
         await session.commit()
+    feed_cache.invalidate()
+    event_hub.publish_likes([tweet_id])
+    trending.add_like(tweet_id, -1)
     return BaseSchema()
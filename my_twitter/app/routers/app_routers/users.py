@@ -1,20 +1,53 @@
-from typing import Annotated
+from typing import Annotated, List, Optional
 
 from app.database.database import Database
-from app.database.models import User
+from app.database.models import Subscriptions, User
 from app.routers.app_routers.schemas.base import BaseSchema
-from app.routers.app_routers.schemas.users import OutUserSchema, UserSchema
+from app.routers.app_routers.schemas.tweets import OutResponseTweet
+from app.routers.app_routers.schemas.users import (
+    BaseUserSchema,
+    OutResponseRelationships,
+    OutResponseSuggestions,
+    OutResponseUsers,
+    OutUserSchema,
+    RelationshipSchema,
+    SuggestionSchema,
+)
 from app.settings.classes import Settings
+from app.utils.etag import ProfileVersions
+from app.utils.feed import load_user_tweets_json
+from app.utils.follow_graph import FollowGraph
+from app.utils.follows import (
+    MAX_RELATIONSHIP_IDS,
+    add_subscription,
+    get_relationships,
+    remove_subscription,
+)
+from app.utils.pagination import MAX_PAGE_LIMIT, decode_cursor, next_cursor
+from app.utils.single_flight import SingleFlight
+from app.utils.timeline import backfill_followers_timelines
+from app.utils.user_cache import UserCache
+from app.utils.users import get_user_profile_response
 from app.utils.utils import (
     get_database,
+    get_follow_graph,
+    get_profile_versions,
     get_settings,
-    get_user_or_test_user,
-    get_user_with_apikey_and_user_with_id,
+    get_single_flight,
+    get_user_cache,
+    get_user_identity,
+)
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Response,
 )
-from fastapi import APIRouter, Header, HTTPException, Path
 from fastapi.params import Depends
 from sqlalchemy import select
-from sqlalchemy.orm import subqueryload
 
 router = APIRouter(tags=["users"])
 
@@ -22,62 +55,291 @@ router = APIRouter(tags=["users"])
 @router.get(
     "/users/me",
     response_model=OutUserSchema,
-    description="Предоставляет информацию о текущем пользователе (по умолчанию тестовый пользователь), "
-    "а также информацию о пользователях на которых подписан пользователь и пользователях, "
-    "которые подписаны на текущего пользователя.",
+    description="Предоставляет информацию о текущем пользователе (по умолчанию тестовый пользователь): "
+    "количество подписчиков и подписок, а также списки пользователей, на которых подписан пользователь, "
+    "и пользователей, которые подписаны на текущего пользователя. "
+    "С include_lists=false списки не загружаются (их можно получить постранично).",
     name="Информация о текущем пользователе",
 )
 async def me_route(
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+    profile_versions: Annotated[ProfileVersions, Depends(get_profile_versions)],
+    include_lists: Annotated[bool, Query()] = True,
     api_key: Annotated[str, Header(...)] = "test",
-) -> OutUserSchema:
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     Функция вернёт информацию о пользователе.
 
     Если в БД не нашёлся соответствующий пользователь,
     то функция вернёт информацию об тестовом пользователе, который всегда есть.
     Это сделано из-за особенности 'фронта', он ломается, если пользователя нет вообще.
+    Профиль читается через get_user_profile_json, поэтому одновременные запросы одного профиля
+    (в том числе через /users/{user_id}) выполняют один запрос к БД.
+    ETag - версия профиля, которая меняется при подписке и отписке, поэтому на If-None-Match
+    с текущим ETag сразу возвращается 304 без загрузки профиля.
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param single_flight: Объединение одинаковых одновременных запросов.
+    :param profile_versions: Счётчики версий профилей.
+    :param include_lists: Вернуть полные списки подписчиков и подписок (нужно встроенному фронту).
+    :param api_key: API key пользователя.
+    :param if_none_match: ETag предыдущего ответа.
+    :return: Response с OutUserSchema (или 304).
+    """
+    async with db.get_sessionmaker() as session:
+        identity = await get_user_identity(session, settings, user_cache, api_key)
+    return await get_user_profile_response(
+        db, single_flight, profile_versions, identity.id, include_lists, if_none_match
+    )
+
+
+@router.get(
+    "/users/me/suggestions",
+    response_model=OutResponseSuggestions,
+    description="Кандидаты для подписки текущего пользователя (по умолчанию тестовый пользователь): "
+    "пользователи, на которых подписаны его подписки, по убыванию количества общих связей.",
+    name="Кого почитать.",
+)
+async def get_suggestions(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    follow_graph: Annotated[FollowGraph, Depends(get_follow_graph)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 10,
+    api_key: Annotated[str, Header(...)] = "test",
+) -> OutResponseSuggestions:
+    """
+    Кандидаты для подписки (друзья друзей), ранжированные по количеству общих связей.
+    Двухшаговый обход выполняется по графу подписок в памяти, из БД читаются только сами кандидаты.
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param follow_graph: Граф подписок в памяти.
+    :param limit: Количество кандидатов (не больше MAX_PAGE_LIMIT).
+    :param api_key: API key пользователя.
+    :return: OutResponseSuggestions.
+    """
+    await follow_graph.ensure_built(db)
+    async with db.get_sessionmaker() as session:
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        suggestions = follow_graph.suggestions(user.id, limit)
+        users_q = await session.execute(
+            select(User).where(User.id.in_([user_id for user_id, _ in suggestions]))
+        )
+        users = {candidate.id: candidate for candidate in users_q.scalars().all()}
+    return OutResponseSuggestions(
+        users=[
+            SuggestionSchema(
+                id=user_id,
+                first_name=users[user_id].first_name,
+                middle_name=users[user_id].middle_name,
+                surname=users[user_id].surname,
+                mutual_count=mutual_count,
+            )
+            for user_id, mutual_count in suggestions
+            if user_id in users
+        ]
+    )
+
+
+@router.get(
+    "/users/relationships",
+    response_model=OutResponseRelationships,
+    description="Отношения текущего пользователя (по умолчанию тестовый пользователь) "
+    f"с пользователями ids (не более {MAX_RELATIONSHIP_IDS}): "
+    "подписан ли он на них, подписаны ли они на него и взаимна ли подписка.",
+    name="Отношения с пользователями.",
+)
+async def get_user_relationships(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    ids: Annotated[List[int], Query(..., max_length=MAX_RELATIONSHIP_IDS)],
+    api_key: Annotated[str, Header(...)] = "test",
+) -> OutResponseRelationships:
+    """
+    Отношения текущего пользователя с пользователями ids одним запросом к subscriptions.
 
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param ids: ID пользователей.
     :param api_key: API key пользователя.
-    :return: OutUserSchema.
+    :return: OutResponseRelationships.
     """
     async with db.get_sessionmaker() as session:
-        user = await get_user_or_test_user(session, settings, api_key)
-    return OutUserSchema(user=UserSchema.model_validate(user))
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        following, followed_by = await get_relationships(session, user.id, ids)
+    return OutResponseRelationships(
+        relationships=[
+            RelationshipSchema(
+                id=user_id,
+                following=user_id in following,
+                followed_by=user_id in followed_by,
+            )
+            for user_id in dict.fromkeys(ids)
+        ]
+    )
 
 
 @router.get(
     "/users/{user_id}",
     response_model=OutUserSchema,
-    description="Предоставляет информацию о пользователе по id, "
-    "а также информацию о пользователях на которых подписан этот пользователь и пользователях, "
-    "которые подписаны на этого пользователя.",
+    description="Предоставляет информацию о пользователе по id: количество подписчиков и подписок, "
+    "а также списки пользователей, на которых подписан этот пользователь, "
+    "и пользователей, которые подписаны на этого пользователя. "
+    "С include_lists=false списки не загружаются (их можно получить постранично).",
     name="Информация о пользователе по id.",
 )
 async def get_user(
     db: Annotated[Database, Depends(get_database)],
+    single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+    profile_versions: Annotated[ProfileVersions, Depends(get_profile_versions)],
     user_id: Annotated[int, Path(..., gt=0)],
-) -> OutUserSchema:
+    include_lists: Annotated[bool, Query()] = True,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     Функция вернёт информацию о пользователе по id.
+    Одновременные запросы одного профиля выполняют один запрос к БД и одну сериализацию.
+    На If-None-Match с текущим ETag (версия профиля) возвращается 304 без загрузки профиля.
 
     :param db: Инструмент работы с БД.
+    :param single_flight: Объединение одинаковых одновременных запросов.
+    :param profile_versions: Счётчики версий профилей.
     :param user_id: ID пользователя.
-    :return: OutUserSchema.
+    :param include_lists: Вернуть полные списки подписчиков и подписок (нужно встроенному фронту).
+    :param if_none_match: ETag предыдущего ответа.
+    :return: Response с OutUserSchema (или 304).
+    """
+    return await get_user_profile_response(
+        db, single_flight, profile_versions, user_id, include_lists, if_none_match
+    )
+
+
+@router.get(
+    "/users/{user_id}/tweets",
+    response_model=OutResponseTweet,
+    description="Твиты пользователя по id от новых к старым в формате ленты (с курсорной пагинацией). "
+    "followed_by_me не заполняется.",
+    name="Твиты пользователя.",
+)
+async def get_user_tweets(
+    db: Annotated[Database, Depends(get_database)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    user_id: Annotated[int, Path(..., gt=0)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 10,
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_likes: Annotated[bool, Query()] = True,
+) -> Response:
+    """
+    Твиты пользователя по id.
+    Страница читается проходом по индексу (user_id, created desc, id desc) с курсором по (created, id),
+    поэтому её стоимость не зависит ни от глубины, ни от количества подписок и подписчиков автора:
+    граф подписок не загружается. Страница сериализуется напрямую в JSON-байты (load_user_tweets_json).
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param user_id: ID пользователя.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Если False, то таблица likes не читается и список likes будет пустым.
+    :return: Response с JSON-байтами OutResponseTweet.
     """
     async with db.get_sessionmaker() as session:
-        user_q = await session.execute(
-            select(User)
-            .where(User.id == user_id)
-            .options(
-                subqueryload(User.my_subscribers), subqueryload(User.my_subscriptions)
-            )
+        body = await load_user_tweets_json(
+            session, settings, user_id, limit, cursor, include_likes
         )
-        user = user_q.scalars().one()
-    return OutUserSchema(user=UserSchema.model_validate(user))
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/users/{user_id}/followers",
+    response_model=OutResponseUsers,
+    description="Подписчики пользователя по id (с курсорной пагинацией).",
+    name="Подписчики пользователя.",
+)
+async def get_user_followers(
+    db: Annotated[Database, Depends(get_database)],
+    user_id: Annotated[int, Path(..., gt=0)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 50,
+    cursor: Annotated[Optional[str], Query()] = None,
+) -> OutResponseUsers:
+    """
+    Подписчики пользователя по id в порядке их ID.
+    Страница читается проходом по индексу (follower_id, user_id) с курсором по ID подписчика.
+
+    :param db: Инструмент работы с БД.
+    :param user_id: ID пользователя.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :return: OutResponseUsers.
+    """
+    query = (
+        select(User)
+        .join(Subscriptions, Subscriptions.user_id == User.id)
+        .where(Subscriptions.follower_id == user_id)
+        .order_by(Subscriptions.user_id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(Subscriptions.user_id > last_id)
+    async with db.get_sessionmaker() as session:
+        users_q = await session.execute(query)
+        users = users_q.scalars().all()
+    return OutResponseUsers(
+        users=[BaseUserSchema.model_validate(user) for user in users],
+        next_cursor=next_cursor(users, limit, "id"),
+    )
+
+
+@router.get(
+    "/users/{user_id}/following",
+    response_model=OutResponseUsers,
+    description="Подписки пользователя по id (с курсорной пагинацией).",
+    name="Подписки пользователя.",
+)
+async def get_user_following(
+    db: Annotated[Database, Depends(get_database)],
+    user_id: Annotated[int, Path(..., gt=0)],
+    limit: Annotated[int, Query(..., gt=0, le=MAX_PAGE_LIMIT)] = 50,
+    cursor: Annotated[Optional[str], Query()] = None,
+) -> OutResponseUsers:
+    """
+    Пользователи, на которых подписан пользователь по id, в порядке их ID.
+    Страница читается проходом по индексу уникальности (user_id, follower_id) с курсором по ID автора.
+
+    :param db: Инструмент работы с БД.
+    :param user_id: ID пользователя.
+    :param limit: Лимит на страницу (не больше MAX_PAGE_LIMIT).
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :return: OutResponseUsers.
+    """
+    query = (
+        select(User)
+        .join(Subscriptions, Subscriptions.follower_id == User.id)
+        .where(Subscriptions.user_id == user_id)
+        .order_by(Subscriptions.follower_id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(Subscriptions.follower_id > last_id)
+    async with db.get_sessionmaker() as session:
+        users_q = await session.execute(query)
+        users = users_q.scalars().all()
+    return OutResponseUsers(
+        users=[BaseUserSchema.model_validate(user) for user in users],
+        next_cursor=next_cursor(users, limit, "id"),
+    )
 
 
 @router.post(
@@ -90,31 +352,34 @@ async def follow_another_user(
     user_id: Annotated[int, Path(..., gt=0)],
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    follow_graph: Annotated[FollowGraph, Depends(get_follow_graph)],
+    profile_versions: Annotated[ProfileVersions, Depends(get_profile_versions)],
     api_key: Annotated[str, Header(...)] = "test",
 ) -> BaseSchema:
     """
     Функция оформит подписку текущего пользователя на пользователя с переданным id.
+    Подписка вставляется одним идемпотентным запросом, пользователи и их подписки не загружаются.
 
     :param user_id: ID пользователя.
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param follow_graph: Граф подписок в памяти.
+    :param profile_versions: Счётчики версий профилей.
     :param api_key: API key пользователя.
     :return: BaseSchema.
     """
     async with db.get_sessionmaker() as session:
-        user_api, another_user = await get_user_with_apikey_and_user_with_id(
-            session=session,
-            api_key=api_key,
-            user_id=user_id,
-            settings=settings,
-        )
-        if (
-            user_api.id == another_user.id
-            or another_user in user_api.users_in_my_subscriptions
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        if not await add_subscription(
+            session, user.id, user_id, settings.FAN_OUT_PULL_THRESHOLD
         ):
             raise HTTPException(status_code=400, detail="Не верный запрос.")
-        user_api.users_in_my_subscriptions.append(another_user)
         await session.commit()
+    profile_versions.bump(user.id)
+    profile_versions.bump(user_id)
+    follow_graph.follow(user.id, user_id)
 
     return BaseSchema()
 
@@ -129,30 +394,38 @@ async def unsubscribe_from_another_user(
     user_id: Annotated[int, Path(..., gt=0)],
     db: Annotated[Database, Depends(get_database)],
     settings: Annotated[Settings, Depends(get_settings)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    follow_graph: Annotated[FollowGraph, Depends(get_follow_graph)],
+    profile_versions: Annotated[ProfileVersions, Depends(get_profile_versions)],
+    background_tasks: BackgroundTasks,
     api_key: Annotated[str, Header(...)] = "test",
 ) -> BaseSchema:
     """
     Функция отпишет текущего пользователя от пользователя с переданным id.
+    Подписка удаляется одним запросом, пользователи и их подписки не загружаются.
+    Если автор при этом перешёл из pull-режима в push-режим, его последние твиты
+    разносятся по лентам подписчиков фоновой задачей.
 
     :param user_id: ID пользователя.
     :param db: Инструмент работы с БД.
     :param settings: Настройки приложения.
+    :param user_cache: Кэш пользователей по api_key.
+    :param follow_graph: Граф подписок в памяти.
+    :param profile_versions: Счётчики версий профилей.
+    :param background_tasks: Фоновые задачи.
     :param api_key: API key пользователя.
     :return: BaseSchema.
     """
     async with db.get_sessionmaker() as session:
-        user_api, another_user = await get_user_with_apikey_and_user_with_id(
-            session=session,
-            api_key=api_key,
-            user_id=user_id,
-            settings=settings,
-        )
-        if (
-            user_api.id == another_user.id
-            or another_user not in user_api.users_in_my_subscriptions
-        ):
+        user = await get_user_identity(session, settings, user_cache, api_key)
+        followers_count = await remove_subscription(session, user.id, user_id)
+        if followers_count is None:
             raise HTTPException(status_code=400, detail="Не верный запрос.")
-        user_api.users_in_my_subscriptions.remove(another_user)
         await session.commit()
+    if followers_count == settings.FAN_OUT_PULL_THRESHOLD:
+        background_tasks.add_task(backfill_followers_timelines, db, user_id)
+    profile_versions.bump(user.id)
+    profile_versions.bump(user_id)
+    follow_graph.unfollow(user.id, user_id)
 
     return BaseSchema()
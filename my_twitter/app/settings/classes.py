@@ -1,7 +1,7 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 @dataclass(frozen=True)
@@ -41,6 +41,51 @@ class Settings:
     DEBUG: bool
     LOG_SETTINGS: "LogerSettings"
     TEST_USER: TestUserData = TestUserData()
+    # Авторы, у которых подписчиков больше порога, не разносят твиты по лентам (pull),
+    # их твиты подмешиваются в ленту при чтении.
+    FAN_OUT_PULL_THRESHOLD: int = 10000
+    # Сколько первых лайков каждого твита встраивается в ленту (полное количество - like_count).
+    # None - все лайки: встроенный фронтенд считает лайки и ищет свой лайк по списку likes.
+    LIKES_PREVIEW_LIMIT: Optional[int] = None
+    # Буфер лайков с отложенной записью: лайки подтверждаются сразу и пишутся в БД пачками.
+    LIKE_BUFFER_ENABLED: bool = False
+    LIKE_BUFFER_FLUSH_INTERVAL_MS: int = 50
+    LIKE_BUFFER_MAX_OPS: int = 500
+    # Кэш пользователей по api_key: время жизни записи (сек.) и максимальное количество записей.
+    USER_CACHE_TTL_S: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    # Граф подписок в памяти: после скольких подписок/отписок слой изменений сливается в CSR.
+    FOLLOW_GRAPH_COMPACT_THRESHOLD: int = 10000
+    # Кэш страниц общей ленты (готовые JSON-байты), сбрасывается при любом изменении твитов и лайков.
+    FEED_CACHE_ENABLED: bool = True
+    FEED_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # На PostgreSQL страница общей ленты собирается в JSON одним запросом (json_agg).
+    FEED_JSON_AGG_ENABLED: bool = True
+    # Количество счётчиков версий профилей для ETag (по user_id % PROFILE_VERSION_SLOTS).
+    PROFILE_VERSION_SLOTS: int = 65536
+    # Максимум твитов в ответе ленты с since_id (если новых больше - has_gap).
+    FEED_SINCE_MAX_TWEETS: int = 100
+    # Поток событий ленты (SSE): размер очереди клиента (старые кадры отбрасываются),
+    # интервал пакетной рассылки (мс), интервал пинга (сек.) и рассылка между воркерами
+    # через PostgreSQL LISTEN/NOTIFY.
+    STREAM_QUEUE_SIZE: int = 100
+    STREAM_FLUSH_INTERVAL_MS: int = 50
+    STREAM_HEARTBEAT_S: float = 15.0
+    STREAM_PG_NOTIFY: bool = False
+    # Поиск твитов: по релевантности ранжируются только столько самых новых совпадений
+    # (если совпадений больше, то ответ помечается truncated=true).
+    SEARCH_RANK_WINDOW: int = 2000
+    # Тренды: окно (сек.), размер корзины счётчиков (сек.), период полураспада веса события (сек.),
+    # размер топа и минимальный интервал пересчёта ответа (сек.).
+    TRENDING_WINDOW_S: int = 21600
+    TRENDING_BUCKET_S: int = 60
+    TRENDING_HALF_LIFE_S: float = 3600.0
+    TRENDING_TOP: int = 10
+    TRENDING_REFRESH_S: float = 1.0
+    # Популярная лента (sort=popular): период полураспада оценки популярности (сек.)
+    # и интервал фонового пересчёта оценок (сек.).
+    POPULAR_HALF_LIFE_S: float = 21600.0
+    POPULAR_RECOMPUTE_S: float = 60.0
 
     def makedirs_MEDIA_FOLDER_ROOT(self) -> None:
         """
@@ -0,0 +1,72 @@
+from app.database.models import Like, Subscriptions, Tweet, User
+from app.utils.popularity import set_popularity
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def change_followers_count(
+    session: AsyncSession, user_id: int, delta: int
+) -> int:
+    """
+    Функция атомарно изменит счётчик подписчиков пользователя на delta.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param user_id: ID пользователя.
+    :param delta: Изменение счётчика.
+    :return: Новое значение счётчика.
+    """
+    followers_count_q = await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(followers_count=User.followers_count + delta)
+        .returning(User.followers_count)
+    )
+    return followers_count_q.scalar_one()
+
+
+async def change_like_count(
+    session: AsyncSession, tweet_id: int, delta: int, half_life_s: float
+) -> None:
+    """
+    Функция атомарно изменит счётчик лайков твита на delta и пересчитает оценку популярности
+    по новому значению счётчика (UPDATE ... RETURNING и UPDATE оценки).
+    Коммит остаётся за вызывающим кодом, поэтому счётчик меняется в одной транзакции с лайком.
+
+    :param session: AsyncSession.
+    :param tweet_id: ID твита.
+    :param delta: Изменение счётчика.
+    :param half_life_s: Период полураспада оценки популярности (сек.).
+    :return: None.
+    """
+    tweet_q = await session.execute(
+        update(Tweet)
+        .where(Tweet.id == tweet_id)
+        .values(like_count=Tweet.like_count + delta)
+        .returning(Tweet.id, Tweet.like_count, Tweet.created)
+    )
+    await set_popularity(session, tweet_q.all(), half_life_s)
+
+
+async def reconcile_counters(session: AsyncSession) -> None:
+    """
+    Функция пересчитает все денормализованные счётчики по исходным таблицам.
+
+    :param session: AsyncSession.
+    :return: None.
+    """
+    await session.execute(
+        update(User).values(
+            followers_count=select(func.count(Subscriptions.id))
+            .where(Subscriptions.follower_id == User.id)
+            .scalar_subquery()
+        )
+    )
+    await session.execute(
+        update(Tweet).values(
+            like_count=select(func.count(Like.id))
+            .where(Like.tweet_id == Tweet.id)
+            .scalar_subquery()
+        )
+    )
+    await session.commit()
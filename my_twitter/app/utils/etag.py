@@ -0,0 +1,75 @@
+import secrets
+from array import array
+from typing import Any, Optional
+
+from fastapi import Response
+
+# Случайный токен процесса: счётчики версий живут в памяти процесса и начинаются с нуля,
+# поэтому ETag другого воркера или до перезапуска никогда не совпадёт с текущим.
+ETAG_TOKEN = secrets.token_hex(4)
+
+
+class ProfileVersions:
+    """
+    Счётчики версий профилей пользователей для ETag.
+
+    Версия увеличивается при каждой подписке и отписке, меняющей профиль (количество и списки
+    подписчиков и подписок). Счётчики хранятся в массиве фиксированного размера по user_id % slots,
+    поэтому память не растёт с числом пользователей, а коллизия приводит лишь к лишнему ответу 200.
+    """
+
+    def __init__(self, slots: int) -> None:
+        self.__versions = array("q", bytes(8 * slots))
+
+    def get(self, user_id: int) -> int:
+        """
+        Вернёт версию профиля.
+
+        :param user_id: ID пользователя.
+        :return: Версия.
+        """
+        return self.__versions[user_id % len(self.__versions)]
+
+    def bump(self, user_id: int) -> None:
+        """
+        Увеличит версию профиля.
+
+        :param user_id: ID пользователя.
+        :return: None.
+        """
+        self.__versions[user_id % len(self.__versions)] += 1
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Функция соберёт ETag из токена процесса и частей версии.
+
+    :param parts: Части версии (название ресурса, параметры, счётчики).
+    :return: ETag (в кавычках).
+    """
+    return '"{}"'.format("-".join(str(part) for part in (ETAG_TOKEN, *parts)))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Функция проверит, совпадает ли If-None-Match с ETag (слабое сравнение, RFC 9110).
+
+    :param if_none_match: Значение заголовка If-None-Match.
+    :param etag: Текущий ETag.
+    :return: True - если ресурс не изменился.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Функция вернёт ответ 304 без тела.
+
+    :param etag: Текущий ETag.
+    :return: Response.
+    """
+    return Response(status_code=304, headers={"ETag": etag})
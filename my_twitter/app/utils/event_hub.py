@@ -0,0 +1,503 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from app.database.database import Database
+from app.database.models import Tweet
+from app.settings.classes import Settings
+from app.utils.feed import load_tweets_rows
+from app.utils.feed_serializer import dumps, get_tweet_dicts
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Канал PostgreSQL LISTEN/NOTIFY для событий ленты.
+NOTIFY_CHANNEL = "tweet_events"
+# Максимальный размер полезной нагрузки одного NOTIFY (ограничение PostgreSQL - 8000 байт).
+NOTIFY_MAX_PAYLOAD = 7000
+# Пауза между попытками восстановить потерянное соединение LISTEN (сек.).
+NOTIFY_RECONNECT_INTERVAL = 1.0
+
+
+def sse_frame(event: str, data: Any) -> bytes:
+    """
+    Функция соберёт кадр server-sent events.
+
+    :param event: Тип события.
+    :param data: Данные события (сериализуются в JSON).
+    :return: Кадр SSE.
+    """
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class StreamSubscriber:
+    """
+    Подписчик потока событий с ограниченной очередью кадров.
+
+    Если клиент не успевает читать и очередь заполнена, то самые старые кадры отбрасываются,
+    а перед следующими кадрами клиент получит событие dropped с количеством потерянных кадров,
+    чтобы перечитать ленту.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.__frames: Deque[bytes] = deque()
+        self.__max_size = max_size
+        self.__ready = asyncio.Event()
+        self.__dropped = 0
+        self.dropped_total = 0
+
+    def put(self, frame: bytes) -> None:
+        """
+        Добавит кадр в очередь, при переполнении отбросит самый старый.
+
+        :param frame: Кадр SSE.
+        :return: None.
+        """
+        if len(self.__frames) >= self.__max_size:
+            self.__frames.popleft()
+            self.__dropped += 1
+            self.dropped_total += 1
+        self.__frames.append(frame)
+        self.__ready.set()
+
+    async def get(self, timeout: float) -> List[bytes]:
+        """
+        Дождётся кадров и заберёт все накопленные.
+
+        :param timeout: Сколько ждать кадров (сек.).
+        :return: Кадры (пустой список, если за timeout кадров не было).
+        """
+        try:
+            await asyncio.wait_for(self.__ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.__ready.clear()
+        frames = list(self.__frames)
+        self.__frames.clear()
+        if self.__dropped:
+            frames.insert(0, sse_frame("dropped", {"count": self.__dropped}))
+            self.__dropped = 0
+        return frames
+
+
+class EventHub:
+    """
+    Рассылка событий ленты подключённым клиентам (server-sent events).
+
+    События - это ID новых твитов и ID твитов, у которых изменилось количество лайков.
+    Они накапливаются и раз в flush_interval секунд загружаются из БД одной пачкой
+    (не более четырёх запросов на пачку независимо от числа клиентов и событий),
+    после чего каждый кадр сериализуется один раз и раздаётся в очереди подписчиков.
+    Несколько изменений лайков одного твита в пачке схлопываются в одно событие.
+
+    Если подключён PgNotifyBackend, то события публикуются через PostgreSQL NOTIFY
+    и принимаются через LISTEN, поэтому клиенты любого воркера видят события всех воркеров.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        settings: Settings,
+        logger: logging.Logger,
+    ) -> None:
+        self.__db = db
+        self.__settings = settings
+        self.__logger = logger
+        self.__flush_interval = settings.STREAM_FLUSH_INTERVAL_MS / 1000
+        self.__subscribers: Set[StreamSubscriber] = set()
+        self.__tweets: Dict[int, None] = {}
+        self.__likes: Set[int] = set()
+        self.__wakeup = asyncio.Event()
+        self.__task: Optional[asyncio.Task[None]] = None
+        self.__backend: Optional[PgNotifyBackend] = None
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Количество подключённых клиентов.
+
+        :return: Количество клиентов.
+        """
+        return len(self.__subscribers)
+
+    def subscribe(self) -> StreamSubscriber:
+        """
+        Подключит клиента.
+
+        :return: StreamSubscriber.
+        """
+        subscriber = StreamSubscriber(self.__settings.STREAM_QUEUE_SIZE)
+        self.__subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        """
+        Отключит клиента.
+
+        :param subscriber: StreamSubscriber.
+        :return: None.
+        """
+        self.__subscribers.discard(subscriber)
+
+    def publish_tweet(self, tweet_id: int) -> None:
+        """
+        Опубликует событие нового твита.
+
+        :param tweet_id: ID твита.
+        :return: None.
+        """
+        if self.__backend is not None:
+            self.__backend.send("t", [tweet_id])
+        else:
+            self.receive([tweet_id], [])
+
+    def publish_likes(self, tweet_ids: Iterable[int]) -> None:
+        """
+        Опубликует события изменения количества лайков.
+
+        :param tweet_ids: ID твитов.
+        :return: None.
+        """
+        if self.__backend is not None:
+            self.__backend.send("l", tweet_ids)
+        else:
+            self.receive([], tweet_ids)
+
+    def receive(self, tweet_ids: Iterable[int], like_ids: Iterable[int]) -> None:
+        """
+        Примет события (локальные или из NOTIFY) и запланирует их рассылку.
+        Пока нет подключённых клиентов, события отбрасываются.
+
+        :param tweet_ids: ID новых твитов.
+        :param like_ids: ID твитов с изменённым количеством лайков.
+        :return: None.
+        """
+        if not self.__subscribers:
+            return
+        self.__tweets.update(dict.fromkeys(tweet_ids))
+        self.__likes.update(like_ids)
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+        self.__wakeup.set()
+
+    async def start(self) -> None:
+        """
+        Подключит PostgreSQL LISTEN/NOTIFY, если он включён (settings.STREAM_PG_NOTIFY).
+
+        :return: None.
+        """
+        if self.__settings.STREAM_PG_NOTIFY and self.__backend is None:
+            backend = PgNotifyBackend(self, self.__logger)
+            await backend.start(self.__db)
+            self.__backend = backend
+
+    async def close(self) -> None:
+        """
+        Остановит рассылку и отключит LISTEN/NOTIFY.
+
+        :return: None.
+        """
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        if self.__backend is not None:
+            await self.__backend.close()
+            self.__backend = None
+
+    async def flush(self) -> None:
+        """
+        Загрузит накопленные события из БД и разошлёт кадры подписчикам.
+
+        :return: None.
+        """
+        tweet_ids, self.__tweets = list(self.__tweets), {}
+        like_ids, self.__likes = self.__likes - set(tweet_ids), set()
+        if not self.__subscribers or not (tweet_ids or like_ids):
+            return
+        frames: List[bytes] = []
+        async with self.__db.get_sessionmaker() as session:
+            if tweet_ids:
+                rows = await load_tweets_rows(session, self.__settings, tweet_ids)
+                tweets = get_tweet_dicts(self.__settings, rows)
+                # В потоке твиты идут в порядке создания.
+                frames.extend(sse_frame("tweet", tweet) for tweet in reversed(tweets))
+            if like_ids:
+                counts_q = await session.execute(
+                    select(Tweet.id, Tweet.like_count)
+                    .where(Tweet.id.in_(like_ids))
+                    .order_by(Tweet.id)
+                )
+                frames.extend(
+                    sse_frame("like_count", {"id": tweet_id, "like_count": like_count})
+                    for tweet_id, like_count in counts_q.all()
+                )
+        for subscriber in self.__subscribers:
+            for frame in frames:
+                subscriber.put(frame)
+
+    async def __run(self) -> None:
+        """
+        Фоновая рассылка: события, пришедшие за flush_interval, рассылаются одной пачкой.
+
+        :return: None.
+        """
+        while True:
+            await self.__wakeup.wait()
+            await asyncio.sleep(self.__flush_interval)
+            self.__wakeup.clear()
+            try:
+                await self.flush()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.exception(exc)
+
+
+class PgNotifyBackend:
+    """
+    Транспорт событий EventHub через PostgreSQL LISTEN/NOTIFY (asyncpg).
+
+    Отдельное соединение (в режиме AUTOCOMMIT) слушает канал NOTIFY_CHANNEL. Исходящие события копятся
+    и отправляются пачкой через это же соединение: полезная нагрузка вида "t:1,2;l:3",
+    разбитая на части не больше NOTIFY_MAX_PAYLOAD байт. Свои уведомления соединение
+    тоже получает, поэтому локальные события доходят до клиентов тем же путём, что и чужие.
+
+    Если соединение потеряно, то оно восстанавливается фоновой задачей (попытки раз в
+    NOTIFY_RECONNECT_INTERVAL секунд), а исходящие события ждут в очереди. События, которые
+    не удалось отправить, возвращаются в очередь и уходят со следующей пачкой.
+    """
+
+    def __init__(self, hub: EventHub, logger: logging.Logger) -> None:
+        self.__hub = hub
+        self.__logger = logger
+        self.__db: Optional[Database] = None
+        self.__connection: Optional[AsyncConnection] = None
+        self.__driver: Any = None
+        self.__outbox: Dict[str, Dict[int, None]] = {"t": {}, "l": {}}
+        self.__wakeup = asyncio.Event()
+        self.__task: Optional[asyncio.Task[None]] = None
+        self.__reconnect_task: Optional[asyncio.Task[None]] = None
+
+    async def start(self, db: Database) -> None:
+        """
+        Откроет соединение и подпишется на канал.
+
+        :param db: Database.
+        :return: None.
+        """
+        self.__db = db
+        await self.__connect()
+        self.__task = asyncio.create_task(self.__run())
+
+    async def close(self) -> None:
+        """
+        Отправит оставшиеся события, отпишется от канала и закроет соединение.
+
+        :return: None.
+        """
+        for task in (self.__reconnect_task, self.__task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.__reconnect_task = self.__task = None
+        if self.__connection is not None:
+            try:
+                await self.__flush()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.exception(exc)
+            await self.__disconnect()
+
+    def send(self, kind: str, tweet_ids: Iterable[int]) -> None:
+        """
+        Поставит события в очередь на отправку.
+
+        :param kind: Тип события ("t" - новый твит, "l" - изменение лайков).
+        :param tweet_ids: ID твитов.
+        :return: None.
+        """
+        self.__outbox[kind].update(dict.fromkeys(tweet_ids))
+        self.__wakeup.set()
+
+    async def __run(self) -> None:
+        """
+        Фоновая отправка накопленных событий.
+
+        :return: None.
+        """
+        while True:
+            await self.__wakeup.wait()
+            self.__wakeup.clear()
+            try:
+                await self.__flush()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.exception(exc)
+
+    async def __flush(self) -> None:
+        """
+        Отправит накопленные события через NOTIFY.
+        Пока соединение восстанавливается, события остаются в очереди.
+        Если отправка прервалась, то неотправленные события возвращаются в очередь перед новыми.
+
+        :return: None.
+        """
+        connection = self.__connection
+        if connection is None:
+            return
+        outbox, self.__outbox = self.__outbox, {"t": {}, "l": {}}
+        payloads = encode_notify_payloads(outbox)
+        for index, payload in enumerate(payloads):
+            try:
+                await connection.execute(
+                    select(func.pg_notify(NOTIFY_CHANNEL, payload))
+                )
+            except BaseException:
+                for unsent in payloads[index:]:
+                    for kind, tweet_ids in decode_notify_payload(unsent).items():
+                        self.__outbox[kind] = {
+                            **dict.fromkeys(tweet_ids),
+                            **self.__outbox[kind],
+                        }
+                raise
+
+    async def __connect(self) -> None:
+        """
+        Откроет соединение в режиме AUTOCOMMIT, подпишется на канал
+        и на закрытие соединения (add_termination_listener).
+
+        :return: None.
+        """
+        if self.__db is None:
+            raise RuntimeError("PgNotifyBackend не запущен.")
+        connection = await self.__db.get_engine().connect()
+        try:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            raw = await connection.get_raw_connection()
+            driver: Any = raw.driver_connection
+            await driver.add_listener(NOTIFY_CHANNEL, self.__on_notify)
+            driver.add_termination_listener(self.__on_terminate)
+        except BaseException:
+            await connection.invalidate()
+            raise
+        self.__connection, self.__driver = connection, driver
+
+    async def __disconnect(self) -> None:
+        """
+        Отпишется от канала и закроет соединение.
+
+        :return: None.
+        """
+        connection, driver = self.__connection, self.__driver
+        self.__connection = self.__driver = None
+        if connection is None:
+            return
+        driver.remove_termination_listener(self.__on_terminate)
+        await driver.remove_listener(NOTIFY_CHANNEL, self.__on_notify)
+        await connection.close()
+
+    def __on_terminate(self, _: Any) -> None:
+        """
+        Обработчик закрытия соединения asyncpg: запустит его восстановление.
+
+        :return: None.
+        """
+        self.__logger.warning("Соединение LISTEN/NOTIFY потеряно, переподключаюсь.")
+        if self.__reconnect_task is None or self.__reconnect_task.done():
+            self.__reconnect_task = asyncio.create_task(self.__reconnect())
+
+    async def __reconnect(self) -> None:
+        """
+        Восстановит соединение: попытки раз в NOTIFY_RECONNECT_INTERVAL секунд до успеха.
+        После восстановления отправит события, накопившиеся за время разрыва.
+
+        :return: None.
+        """
+        connection, self.__connection, self.__driver = self.__connection, None, None
+        if connection is not None:
+            try:
+                await connection.invalidate()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.warning("Не удалось закрыть соединение LISTEN: %r", exc)
+        while True:
+            try:
+                await self.__connect()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.warning(
+                    "Не удалось восстановить соединение LISTEN/NOTIFY: %r. "
+                    "Повторная попытка через %s сек.",
+                    exc,
+                    NOTIFY_RECONNECT_INTERVAL,
+                )
+                await asyncio.sleep(NOTIFY_RECONNECT_INTERVAL)
+            else:
+                self.__logger.info("Соединение LISTEN/NOTIFY восстановлено.")
+                self.__wakeup.set()
+                return
+
+    def __on_notify(self, _: Any, __: int, ___: str, payload: str) -> None:
+        """
+        Обработчик уведомления asyncpg.
+
+        :param payload: Полезная нагрузка NOTIFY.
+        :return: None.
+        """
+        try:
+            events = decode_notify_payload(payload)
+        except ValueError:
+            self.__logger.warning("Не верное уведомление: %r", payload)
+            return
+        self.__hub.receive(events["t"], events["l"])
+
+
+def encode_notify_payloads(events: Dict[str, Dict[int, None]]) -> List[str]:
+    """
+    Функция упакует события в полезные нагрузки NOTIFY не длиннее NOTIFY_MAX_PAYLOAD.
+
+    :param events: События {тип: ID твитов}.
+    :return: Полезные нагрузки вида "t:1,2;l:3".
+    """
+    payloads: List[str] = []
+    parts: Dict[str, List[str]] = {}
+    size = 0
+    for kind, tweet_ids in events.items():
+        for tweet_id in tweet_ids:
+            value = str(tweet_id)
+            if size + len(value) + 3 > NOTIFY_MAX_PAYLOAD:
+                payloads.append(_join_notify_parts(parts))
+                parts, size = {}, 0
+            parts.setdefault(kind, []).append(value)
+            size += len(value) + 3
+    if parts:
+        payloads.append(_join_notify_parts(parts))
+    return payloads
+
+
+def _join_notify_parts(parts: Dict[str, List[str]]) -> str:
+    """
+    Соберёт полезную нагрузку NOTIFY из частей.
+
+    :param parts: {тип: ID твитов строками}.
+    :return: Полезная нагрузка.
+    """
+    return ";".join(f"{kind}:{','.join(values)}" for kind, values in parts.items())
+
+
+def decode_notify_payload(payload: str) -> Dict[str, List[int]]:
+    """
+    Функция разберёт полезную нагрузку NOTIFY.
+
+    :param payload: Полезная нагрузка вида "t:1,2;l:3".
+    :return: События {тип: ID твитов}.
+    """
+    events: Dict[str, List[int]] = {"t": [], "l": []}
+    for part in payload.split(";"):
+        kind, _, values = part.partition(":")
+        if kind not in events:
+            raise ValueError(f"Неизвестный тип события: {kind}")
+        events[kind].extend(int(value) for value in values.split(","))
+    return events
@@ -0,0 +1,621 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type, Unpack
+
+from app.database.models import Attachment, Like, Tweet, User
+from app.routers.app_routers.schemas.tweets import OutResponseTweet, OutTweet
+from app.settings.classes import Settings
+from app.utils.feed_serializer import (
+    FeedRows,
+    dumps,
+    get_tweet_dicts,
+    serialize_feed_delta,
+    serialize_feed_page,
+)
+from app.utils.follows import get_relationships
+from app.utils.pagination import decode_cursor, encode_cursor, next_cursor
+from app.utils.utils import get_media_url
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    Row,
+    Select,
+    Text,
+    func,
+    literal,
+    null,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import AliasedClass
+
+
+async def load_feed_tweets(
+    session: AsyncSession,
+    settings: Settings,
+    offset: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> Sequence[Tweet]:
+    """
+    Функция загрузит страницу общей ленты с первыми лайками твитов.
+    Если передан cursor, то используется курсорная пагинация по индексу (created, id) и offset игнорируется.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: Твиты страницы.
+    """
+    query = paginate_feed(
+        select(Tweet).options(raiseload(Tweet.likes)), offset, limit, cursor
+    )
+    tweets_q = await session.execute(query)
+    tweets = tweets_q.scalars().all()
+    await load_likes_preview(
+        session, tweets, settings.LIKES_PREVIEW_LIMIT if include_likes else 0
+    )
+    return tweets
+
+
+async def load_feed_json(
+    session: AsyncSession,
+    settings: Settings,
+    offset: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция загрузит страницу общей ленты Core-запросами и вернёт её в виде готовых JSON-байт,
+    минуя ORM-объекты и схемы Pydantic. Ответ совпадает с
+    get_feed_response(...).model_dump_json() для тех же параметров.
+    На PostgreSQL (settings.FEED_JSON_AGG_ENABLED) страница собирается одним запросом (load_feed_json_agg).
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    if (
+        settings.FEED_JSON_AGG_ENABLED
+        and session.get_bind().dialect.name == "postgresql"
+    ):
+        return await load_feed_json_agg(
+            session, settings, offset, limit, cursor, include_likes
+        )
+    rows = await load_feed_rows(session, settings, offset, limit, cursor, include_likes)
+    return serialize_feed_page(settings, rows, limit)
+
+
+async def load_feed_rows(
+    session: AsyncSession,
+    settings: Settings,
+    offset: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> FeedRows:
+    """
+    Функция загрузит Core-строки страницы общей ленты для serialize_feed_page.
+    Выполняется не более трёх запросов: твиты с авторами, первые лайки и вложения (complete_feed_rows).
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: FeedRows.
+    """
+    query = paginate_feed(select_feed_rows(), offset, limit, cursor)
+    tweets_q = await session.execute(query)
+    return await complete_feed_rows(session, settings, tweets_q.all(), include_likes)
+
+
+async def load_feed_since_json(
+    session: AsyncSession,
+    settings: Settings,
+    since_id: int,
+    limit: int,
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция вернёт JSON-байты твитов новее since_id (от новых к старым), не больше
+    min(limit, settings.FEED_SINCE_MAX_TWEETS). Твиты читаются проходом по первичному ключу
+    tweets.id от конца до since_id, поэтому стоимость зависит только от количества новых твитов.
+    Если новых твитов больше, то возвращаются самые новые и has_gap=True:
+    клиенту следует перечитать ленту целиком.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param since_id: ID последнего твита, который уже есть у клиента.
+    :param limit: Лимит твитов.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты OutResponseTweetDelta.
+    """
+    limit = min(limit, settings.FEED_SINCE_MAX_TWEETS)
+    tweets_q = await session.execute(
+        select_feed_rows()
+        .where(Tweet.id > since_id)
+        .order_by(Tweet.id.desc())
+        .limit(limit + 1)
+    )
+    tweets = tweets_q.all()
+    rows = await complete_feed_rows(session, settings, tweets[:limit], include_likes)
+    return serialize_feed_delta(settings, rows, has_gap=len(tweets) > limit)
+
+
+async def load_user_tweets_json(
+    session: AsyncSession,
+    settings: Settings,
+    user_id: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция вернёт страницу твитов одного автора (от новых к старым) в формате ленты
+    (OutResponseTweet) в виде JSON-байт. Страница читается проходом по индексу
+    ix_tweets_user_id_created_id (user_id, created desc, id desc) с курсорной пагинацией по (created, id),
+    подписки и подписчики автора не загружаются.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param user_id: ID автора.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    query = paginate_feed(
+        select_feed_rows().where(Tweet.user_id == user_id), 1, limit, cursor
+    )
+    tweets_q = await session.execute(query)
+    rows = await complete_feed_rows(session, settings, tweets_q.all(), include_likes)
+    return serialize_feed_page(settings, rows, limit)
+
+
+async def load_popular_json(
+    session: AsyncSession,
+    settings: Settings,
+    offset: int,
+    limit: int,
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция вернёт страницу общей ленты по убыванию оценки популярности (popularity, id)
+    в виде JSON-байт (OutResponseTweet). Страница читается по индексу (popularity, id),
+    поэтому лайки не агрегируются. Пагинация только постраничная (next_cursor всегда null):
+    оценки меняются при лайках и фоновом пересчёте, и курсор по ним быстро устаревал бы.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    tweets_q = await session.execute(
+        select_feed_rows()
+        .order_by(Tweet.popularity.desc(), Tweet.id.desc())
+        .offset((offset - 1) * limit)
+        .limit(limit)
+    )
+    rows = await complete_feed_rows(session, settings, tweets_q.all(), include_likes)
+    return dumps(
+        {
+            "result": True,
+            "tweets": get_tweet_dicts(settings, rows),
+            "next_cursor": None,
+        }
+    )
+
+
+async def load_tweets_batch_json(
+    session: AsyncSession,
+    settings: Settings,
+    tweet_ids: Sequence[int],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция загрузит твиты по ID одним запросом IN с авторами (плюс лайки и вложения - complete_feed_rows)
+    и вернёт их в виде JSON-байт (OutResponseTweetBatch) в порядке запроса.
+    Повторные ID отбрасываются, несуществующие перечисляются в missing_ids.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param tweet_ids: ID твитов.
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты OutResponseTweetBatch.
+    """
+    tweet_ids = list(dict.fromkeys(tweet_ids))
+    tweets_q = await session.execute(select_feed_rows().where(Tweet.id.in_(tweet_ids)))
+    by_id: Dict[int, Row[Unpack[Tuple[Any, ...]]]] = {
+        tweet[0]: tweet for tweet in tweets_q.all()
+    }
+    tweets = [by_id[tweet_id] for tweet_id in tweet_ids if tweet_id in by_id]
+    rows = await complete_feed_rows(session, settings, tweets, include_likes)
+    return dumps(
+        {
+            "result": True,
+            "tweets": get_tweet_dicts(settings, rows),
+            "missing_ids": [
+                tweet_id for tweet_id in tweet_ids if tweet_id not in by_id
+            ],
+        }
+    )
+
+
+async def load_tweets_rows(
+    session: AsyncSession, settings: Settings, tweet_ids: Sequence[int]
+) -> FeedRows:
+    """
+    Функция загрузит Core-строки твитов по ID (в порядке ленты, несуществующие ID пропускаются)
+    с первыми settings.LIKES_PREVIEW_LIMIT лайками.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param tweet_ids: ID твитов.
+    :return: FeedRows.
+    """
+    tweets_q = await session.execute(
+        select_feed_rows()
+        .where(Tweet.id.in_(tweet_ids))
+        .order_by(Tweet.created.desc(), Tweet.id.desc())
+    )
+    return await complete_feed_rows(session, settings, tweets_q.all(), True)
+
+
+def select_feed_rows() -> (
+    Select[Unpack[Tuple[int, str, int, datetime, int, str, str, str]]]
+):
+    """
+    Функция вернёт запрос Core-строк твитов с авторами в формате FeedRows.tweets.
+
+    :return: Запрос.
+    """
+    return select(
+        Tweet.id,
+        Tweet.content,
+        Tweet.like_count,
+        Tweet.created,
+        User.id.label("author_id"),
+        User.first_name,
+        User.middle_name,
+        User.surname,
+    ).join(User, User.id == Tweet.user_id)
+
+
+async def complete_feed_rows(
+    session: AsyncSession,
+    settings: Settings,
+    tweets: Sequence[Row[Unpack[Tuple[Any, ...]]]],
+    include_likes: bool,
+) -> FeedRows:
+    """
+    Функция догрузит к строкам твитов первые лайки с именами их авторов
+    (тот же UNION ALL, что и в load_likes_preview) и вложения - не более двух запросов.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param tweets: Строки твитов (select_feed_rows).
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: FeedRows.
+    """
+    tweet_ids = [tweet.id for tweet in tweets]
+    likes: Sequence[Sequence[Any]] = []
+    attachments: Sequence[Sequence[Any]] = []
+    if tweet_ids and include_likes and settings.LIKES_PREVIEW_LIMIT != 0:
+        per_tweet = [
+            select(Like.id, Like.tweet_id, Like.user_id)
+            .where(Like.tweet_id == tweet_id)
+            .order_by(Like.id)
+            .limit(settings.LIKES_PREVIEW_LIMIT)
+            .subquery()
+            .select()
+            for tweet_id in tweet_ids
+        ]
+        preview = union_all(*per_tweet).subquery()
+        likes_q = await session.execute(
+            select(
+                preview.c.tweet_id,
+                preview.c.user_id,
+                User.first_name,
+                User.middle_name,
+                User.surname,
+            )
+            .join(User, User.id == preview.c.user_id)
+            .order_by(preview.c.id)
+        )
+        likes = likes_q.all()
+    if tweet_ids:
+        attachments_q = await session.execute(
+            select(Attachment.tweet_id, Attachment.image_path)
+            .where(Attachment.tweet_id.in_(tweet_ids))
+            .order_by(Attachment.id)
+        )
+        attachments = attachments_q.all()
+    return FeedRows(tweets, likes, attachments)
+
+
+async def load_feed_json_agg(
+    session: AsyncSession,
+    settings: Settings,
+    offset: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция соберёт страницу общей ленты в JSON одним запросом к PostgreSQL (см. get_feed_json_agg_query).
+    Данные и порядок ключей совпадают с get_feed_response(...).model_dump_json(),
+    но PostgreSQL форматирует json с пробелами после ":" и ",".
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param include_likes: Встроить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    page_q = await session.execute(
+        get_feed_json_agg_query(settings, offset, limit, cursor, include_likes)
+    )
+    tweets, count, last_created, last_id = page_q.one()
+    page_cursor = (
+        encode_cursor(last_created, last_id) if count and count >= limit else None
+    )
+    return b"".join(
+        [
+            b'{"result":true,"tweets":',
+            tweets.encode(),
+            b',"next_cursor":',
+            dumps(page_cursor),
+            b"}",
+        ]
+    )
+
+
+def get_feed_json_agg_query(
+    settings: Settings,
+    offset: int,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> Select[Unpack[Tuple[str, int, datetime, int]]]:
+    """
+    Функция вернёт запрос PostgreSQL, который строит массив твитов страницы в JSON
+    (json_agg/json_build_object) вместе с авторами, первыми лайками и url вложений,
+    а также количество твитов и ключ (created, id) последнего твита для курсора.
+
+    Страница выбирается в CTE по индексу (created, id), лайки и вложения каждого твита
+    агрегируются в LATERAL-подзапросах по индексам (tweet_id, id) и tweet_id.
+
+    :param settings: Settings.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param include_likes: Встроить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: Запрос (массив твитов в JSON, количество твитов, created и id последнего твита).
+    """
+    page = paginate_feed(
+        select(Tweet.id, Tweet.content, Tweet.like_count, Tweet.created, Tweet.user_id),
+        offset,
+        limit,
+        cursor,
+    ).cte("page")
+    empty = literal("[]").cast(JSON)
+    attachments = (
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    literal(get_media_url(settings))
+                    + func.btrim(func.replace(Attachment.image_path, "\\", "/"), "/"),
+                    Attachment.id,
+                )
+            ).label("urls")
+        )
+        .where(Attachment.tweet_id == page.c.id)
+        .lateral("attachments_json")
+    )
+    query_from = page.join(User, User.id == page.c.user_id).outerjoin(
+        attachments, true()
+    )
+    likes: ColumnElement[Any] = empty
+    if include_likes and settings.LIKES_PREVIEW_LIMIT != 0:
+        liker = aliased(User, name="liker")
+        preview = (
+            select(Like.id, Like.user_id)
+            .where(Like.tweet_id == page.c.id)
+            .order_by(Like.id)
+            .limit(settings.LIKES_PREVIEW_LIMIT)
+            .correlate(page)
+            .lateral("preview")
+        )
+        likes_json = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "user_id", preview.c.user_id, "name", full_name_sql(liker)
+                        ),
+                        preview.c.id,
+                    )
+                ).label("likes")
+            )
+            .select_from(preview.join(liker, liker.id == preview.c.user_id))
+            .lateral("likes_json")
+        )
+        query_from = query_from.outerjoin(likes_json, true())
+        likes = func.coalesce(likes_json.c.likes, empty)
+    tweet = func.json_build_object(
+        "id",
+        page.c.id,
+        "content",
+        page.c.content,
+        "author",
+        func.json_build_object("id", User.id, "name", full_name_sql(User)),
+        "likes",
+        likes,
+        "like_count",
+        page.c.like_count,
+        "followed_by_me",
+        null(),
+        "attachments",
+        func.coalesce(attachments.c.urls, empty),
+    )
+    last = (page.c.created, page.c.id)
+    return select(
+        func.coalesce(
+            func.json_agg(
+                aggregate_order_by(tweet, page.c.created.desc(), page.c.id.desc())
+            ),
+            empty,
+        ).cast(Text),
+        func.count(),
+        func.array_agg(aggregate_order_by(page.c.created, *last))[1],
+        func.array_agg(aggregate_order_by(page.c.id, *last))[1],
+    ).select_from(query_from)
+
+
+def full_name_sql(user: Type[User] | AliasedClass[User]) -> ColumnElement[str]:
+    """
+    SQL-выражение полного имени пользователя, как BaseUserSchema.name
+    (непустые имя, отчество и фамилия через пробел).
+
+    :param user: Модель User или её алиас.
+    :return: Выражение.
+    """
+    return func.concat_ws(
+        " ",
+        func.nullif(user.first_name, ""),
+        func.nullif(user.middle_name, ""),
+        func.nullif(user.surname, ""),
+    )
+
+
+def paginate_feed[Q: Select[Unpack[Tuple[Any, ...]]]](
+    query: Q, offset: int, limit: int, cursor: Optional[str]
+) -> Q:
+    """
+    Функция добавит к запросу твитов порядок ленты (created, id) по убыванию и страницу.
+    Если передан cursor, то используется курсорная пагинация по индексу (created, id) и offset игнорируется.
+
+    :param query: Запрос твитов.
+    :param offset: Страница.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :return: Запрос страницы.
+    """
+    query = query.order_by(Tweet.created.desc(), Tweet.id.desc()).limit(limit)
+    if cursor is not None:
+        created, tweet_id = decode_cursor(cursor, datetime, int)
+        return query.where(tuple_(Tweet.created, Tweet.id) < tuple_(created, tweet_id))
+    return query.offset((offset - 1) * limit)
+
+
+def get_feed_response(
+    settings: Settings,
+    tweets: Sequence[Tweet],
+    limit: int,
+    followed: Optional[Set[int]] = None,
+) -> OutResponseTweet:
+    """
+    Функция соберёт ответ ленты из загруженных твитов.
+
+    :param settings: Settings.
+    :param tweets: Твиты страницы (с подгруженными лайками).
+    :param limit: Лимит на страницу.
+    :param followed: ID авторов, на которых подписан пользователь (None - followed_by_me не заполняется).
+    :return: OutResponseTweet.
+    """
+    validated_tweets = [
+        OutTweet.model_validate(tweet).set_settings(settings) for tweet in tweets
+    ]
+    set_followed_by_me(validated_tweets, followed)
+    return OutResponseTweet(
+        tweets=validated_tweets,
+        next_cursor=next_cursor(tweets, limit, "created", "id"),
+    )
+
+
+async def load_likes_preview(
+    session: AsyncSession, tweets: Sequence[Tweet], limit: Optional[int]
+) -> None:
+    """
+    Функция подгрузит в tweet.likes первые limit лайков каждого твита.
+    Твиты должны быть загружены с raiseload(Tweet.likes).
+
+    Лайки читаются одним запросом: UNION ALL ограниченных проходов по индексу (tweet_id, id)
+    для каждого твита страницы, поэтому размер выборки не зависит от популярности твитов.
+    Полное количество лайков хранится в tweet.like_count.
+
+    :param session: AsyncSession.
+    :param tweets: Твиты страницы.
+    :param limit: Сколько первых лайков подгрузить (None - все, 0 - не читать таблицу likes).
+    :return: None.
+    """
+    likes: Dict[int, List[Like]] = defaultdict(list)
+    if tweets and limit != 0:
+        per_tweet = []
+        for tweet in tweets:
+            subquery = (
+                select(Like)
+                .where(Like.tweet_id == tweet.id)
+                .order_by(Like.id)
+                .limit(limit)
+                .subquery()
+            )
+            per_tweet.append(select(subquery))
+        like_alias = aliased(Like, union_all(*per_tweet).subquery())
+        likes_q = await session.execute(select(like_alias).order_by(like_alias.id))
+        for like in likes_q.scalars().all():
+            likes[like.tweet_id].append(like)
+    for tweet in tweets:
+        set_committed_value(tweet, "likes", likes[tweet.id])
+
+
+async def get_followed_authors(
+    session: AsyncSession, user_id: int, tweets: Sequence[Tweet]
+) -> Set[int]:
+    """
+    Функция вернёт ID авторов твитов страницы, на которых подписан пользователь.
+    Выполняется одним запросом к subscriptions по авторам страницы.
+
+    :param session: AsyncSession.
+    :param user_id: ID пользователя.
+    :param tweets: Твиты страницы.
+    :return: ID авторов, на которых подписан пользователь.
+    """
+    following, _ = await get_relationships(
+        session, user_id, {tweet.user_id for tweet in tweets}
+    )
+    return following
+
+
+def set_followed_by_me(tweets: List[OutTweet], followed: Optional[Set[int]]) -> None:
+    """
+    Функция заполнит followed_by_me у твитов страницы.
+
+    :param tweets: Твиты страницы.
+    :param followed: ID авторов, на которых подписан пользователь (None - не заполнять).
+    :return: None.
+    """
+    if followed is None:
+        return
+    for tweet in tweets:
+        tweet.followed_by_me = tweet.author.id in followed
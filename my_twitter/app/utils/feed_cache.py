@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class FeedCache:
+    """
+    Кэш страниц ленты в виде готовых JSON-байт с вытеснением давно не использованных страниц (LRU)
+    при превышении max_bytes.
+
+    Любая запись, меняющая ленту (новый твит, удаление, лайк, дизлайк), вызывает invalidate(),
+    которая очищает кэш и увеличивает поколение (generation). Страница, которую начали строить
+    до invalidate(), в кэш уже не попадёт, поэтому устаревший ответ не переживёт запись.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.__max_bytes = max_bytes
+        self.__entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self.__size = 0
+        self.__generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Текущее поколение кэша.
+
+        :return: Номер поколения.
+        """
+        return self.__generation
+
+    @property
+    def size(self) -> int:
+        """
+        Суммарный размер страниц в кэше в байтах.
+
+        :return: Размер в байтах.
+        """
+        return self.__size
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Вернёт страницу по ключу.
+
+        :param key: Ключ страницы.
+        :return: JSON-байты страницы или None.
+        """
+        body = self.__entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Hashable, body: bytes, generation: int) -> None:
+        """
+        Сохранит страницу, если с начала её построения кэш не инвалидировался.
+
+        :param key: Ключ страницы.
+        :param body: JSON-байты страницы.
+        :param generation: Поколение кэша на момент начала построения страницы.
+        :return: None.
+        """
+        if generation != self.__generation or len(body) > self.__max_bytes:
+            return
+        old = self.__entries.pop(key, None)
+        if old is not None:
+            self.__size -= len(old)
+        self.__entries[key] = body
+        self.__size += len(body)
+        while self.__size > self.__max_bytes:
+            _, evicted = self.__entries.popitem(last=False)
+            self.__size -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """
+        Очистит кэш и начнёт новое поколение.
+
+        :return: None.
+        """
+        self.__generation += 1
+        self.__entries.clear()
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,140 @@
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from app.settings.classes import Settings
+from app.utils.pagination import next_cursor
+from app.utils.utils import get_image_url
+
+# orjson - необязательная зависимость (см. README), без него используется стандартный json.
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+
+class FeedRows(NamedTuple):
+    """
+    Core-строки страницы ленты.
+
+    **tweets** Твиты (id, content, like_count, created, author_id, first_name, middle_name, surname)
+    в порядке ленты. \n
+    **likes** Лайки (tweet_id, user_id, first_name, middle_name, surname) в порядке id. \n
+    **attachments** Вложения (tweet_id, image_path) в порядке id. \n
+    """
+
+    tweets: Sequence[Sequence[Any]]
+    likes: Sequence[Sequence[Any]]
+    attachments: Sequence[Sequence[Any]]
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Функция сериализует значение в компактный JSON (UTF-8, без экранирования не-ASCII символов),
+    так же как Pydantic model_dump_json. Если установлен orjson, то используется он.
+
+    :param value: Значение (dict, list, str, int, bool, None).
+    :return: JSON-байты.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def get_full_name(first_name: str, middle_name: Optional[str], surname: str) -> str:
+    """
+    Функция вернёт полное имя пользователя, как BaseUserSchema.name.
+
+    :param first_name: Имя.
+    :param middle_name: Отчество.
+    :param surname: Фамилия.
+    :return: Полное имя.
+    """
+    return " ".join([name for name in [first_name, middle_name, surname] if name])
+
+
+def serialize_feed_page(settings: Settings, rows: FeedRows, limit: int) -> bytes:
+    """
+    Функция соберёт JSON-байты страницы ленты напрямую из строк Core-запросов,
+    минуя валидацию Pydantic. Формат ответа совпадает с OutResponseTweet.model_dump_json()
+    побайтно (включая порядок ключей), поле followed_by_me всегда null.
+
+    :param settings: Settings.
+    :param rows: Core-строки страницы.
+    :param limit: Лимит на страницу.
+    :return: JSON-байты страницы.
+    """
+    return dumps(
+        {
+            "result": True,
+            "tweets": get_tweet_dicts(settings, rows),
+            "next_cursor": next_cursor(rows.tweets, limit, "created", "id"),
+        }
+    )
+
+
+def serialize_feed_delta(settings: Settings, rows: FeedRows, has_gap: bool) -> bytes:
+    """
+    Функция соберёт JSON-байты новых твитов ленты (since_id) из строк Core-запросов.
+    Формат ответа совпадает с OutResponseTweetDelta.model_dump_json() побайтно.
+
+    :param settings: Settings.
+    :param rows: Core-строки новых твитов.
+    :param has_gap: Новых твитов больше, чем вернулось.
+    :return: JSON-байты ответа.
+    """
+    return dumps(
+        {
+            "result": True,
+            "tweets": get_tweet_dicts(settings, rows),
+            "has_gap": has_gap,
+        }
+    )
+
+
+def get_tweet_dicts(settings: Settings, rows: FeedRows) -> List[Dict[str, Any]]:
+    """
+    Функция соберёт твиты из строк Core-запросов в словари в формате OutTweet (с тем же порядком ключей).
+
+    :param settings: Settings.
+    :param rows: Core-строки твитов.
+    :return: Список твитов.
+    """
+    # Строки распаковываются по позиции: доступ к Row по имени колонки заметно медленнее.
+    tweet_likes: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for tweet_id, user_id, first_name, middle_name, surname in rows.likes:
+        tweet_likes[tweet_id].append(
+            {
+                "user_id": user_id,
+                "name": get_full_name(first_name, middle_name, surname),
+            }
+        )
+    tweet_attachments: Dict[int, List[str]] = defaultdict(list)
+    for tweet_id, image_path in rows.attachments:
+        tweet_attachments[tweet_id].append(get_image_url(image_path, settings))
+    return [
+        {
+            "id": tweet_id,
+            "content": content,
+            "author": {
+                "id": author_id,
+                "name": get_full_name(first_name, middle_name, surname),
+            },
+            "likes": tweet_likes[tweet_id],
+            "like_count": like_count,
+            "followed_by_me": None,
+            "attachments": tweet_attachments[tweet_id],
+        }
+        for (
+            tweet_id,
+            content,
+            like_count,
+            _,
+            author_id,
+            first_name,
+            middle_name,
+            surname,
+        ) in rows.tweets
+    ]
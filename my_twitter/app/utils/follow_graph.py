@@ -0,0 +1,282 @@
+import asyncio
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from app.database.database import Database
+from app.database.models import Subscriptions, User
+from sqlalchemy import func, select
+
+# Сколько строк подписок читается из БД за раз при построении графа.
+FOLLOW_GRAPH_BUILD_CHUNK = 10000
+
+
+class FollowGraph:
+    """
+    In-memory индекс графа подписок в формате CSR (compressed sparse row).
+
+    Подписки пользователя u - это отсортированный срез targets[offsets[u]:offsets[u + 1]],
+    где offsets и targets - массивы array, поэтому ребро занимает 4 байта, а пользователь - 8 байт.
+    Граф строится из subscriptions при старте приложения (или при первом обращении),
+    а подписки и отписки применяются к нему инкрементально через небольшой слой изменений,
+    который сливается в CSR фоновой задачей, как только в нём накопится compact_threshold рёбер.
+    """
+
+    def __init__(self, compact_threshold: int) -> None:
+        self.__compact_threshold = compact_threshold
+        self.__offsets = array("q", [0])
+        self.__targets = array("i")
+        self.__added: Dict[int, Set[int]] = {}
+        self.__removed: Dict[int, Set[int]] = {}
+        self.__changes = 0
+        self.__built = False
+        self.__build_lock = asyncio.Lock()
+        self.__compact_lock = asyncio.Lock()
+        self.__compact_task: Optional[asyncio.Task[None]] = None
+        # Изменения, пришедшие во время построения графа, применяются после него.
+        self.__pending: Optional[List[Tuple[int, int, bool]]] = None
+
+    @property
+    def edges(self) -> int:
+        """
+        Количество рёбер в CSR (без слоя изменений).
+
+        :return: Количество рёбер.
+        """
+        return len(self.__targets)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Размер массивов CSR в байтах.
+
+        :return: Размер в байтах.
+        """
+        return (
+            len(self.__offsets) * self.__offsets.itemsize
+            + len(self.__targets) * self.__targets.itemsize
+        )
+
+    async def ensure_built(self, db: Database) -> None:
+        """
+        Построит граф из таблицы subscriptions, если он ещё не построен.
+
+        :param db: Database.
+        :return: None.
+        """
+        if self.__built:
+            return
+        async with self.__build_lock:
+            if not self.__built:
+                await self.__build(db)
+
+    def follow(self, user_id: int, author_id: int) -> None:
+        """
+        Добавит ребро user_id -> author_id (подписка).
+
+        :param user_id: ID подписчика.
+        :param author_id: ID автора.
+        :return: None.
+        """
+        self.__change(user_id, author_id, True)
+
+    def unfollow(self, user_id: int, author_id: int) -> None:
+        """
+        Удалит ребро user_id -> author_id (отписка).
+
+        :param user_id: ID подписчика.
+        :param author_id: ID автора.
+        :return: None.
+        """
+        self.__change(user_id, author_id, False)
+
+    def is_following(self, user_id: int, author_id: int) -> bool:
+        """
+        Проверит, подписан ли пользователь на автора.
+
+        :param user_id: ID подписчика.
+        :param author_id: ID автора.
+        :return: True - если подписан.
+        """
+        if author_id in self.__added.get(user_id, ()):
+            return True
+        if author_id in self.__removed.get(user_id, ()):
+            return False
+        start, end = self.__bounds(user_id)
+        index = bisect_left(self.__targets, author_id, start, end)
+        return index < end and self.__targets[index] == author_id
+
+    def following(self, user_id: int) -> Iterator[int]:
+        """
+        Подписки пользователя.
+
+        :param user_id: ID пользователя.
+        :return: Итератор ID авторов.
+        """
+        start, end = self.__bounds(user_id)
+        removed = self.__removed.get(user_id, ())
+        for index in range(start, end):
+            author_id = self.__targets[index]
+            if author_id not in removed:
+                yield author_id
+        yield from self.__added.get(user_id, ())
+
+    def suggestions(self, user_id: int, limit: int) -> List[Tuple[int, int]]:
+        """
+        Кандидаты для подписки: авторы, на которых подписаны авторы пользователя (друзья друзей).
+        Ранжируются по количеству общих связей (сколько подписок пользователя подписаны на кандидата),
+        при равенстве - по ID.
+
+        :param user_id: ID пользователя.
+        :param limit: Количество кандидатов.
+        :return: Список (ID кандидата, количество общих связей).
+        """
+        following = set(self.following(user_id))
+        mutual: Counter[int] = Counter()
+        for author_id in following:
+            mutual.update(self.following(author_id))
+        for author_id in following | {user_id}:
+            mutual.pop(author_id, None)
+        return sorted(mutual.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def __bounds(self, user_id: int) -> Tuple[int, int]:
+        """
+        Границы среза подписок пользователя в targets.
+
+        :param user_id: ID пользователя.
+        :return: (начало, конец).
+        """
+        if user_id + 1 >= len(self.__offsets):
+            return 0, 0
+        return self.__offsets[user_id], self.__offsets[user_id + 1]
+
+    def __change(self, user_id: int, author_id: int, followed: bool) -> None:
+        """
+        Применит подписку или отписку к слою изменений.
+        До построения графа изменения не нужны: они уже будут в subscriptions.
+
+        :param user_id: ID подписчика.
+        :param author_id: ID автора.
+        :param followed: True - подписка, False - отписка.
+        :return: None.
+        """
+        if self.__pending is not None:
+            self.__pending.append((user_id, author_id, followed))
+            return
+        if not self.__built or self.is_following(user_id, author_id) == followed:
+            return
+        to_add, to_remove = (
+            (self.__added, self.__removed)
+            if followed
+            else (self.__removed, self.__added)
+        )
+        if author_id in to_remove.get(user_id, ()):
+            to_remove[user_id].discard(author_id)
+        else:
+            to_add.setdefault(user_id, set()).add(author_id)
+        self.__changes += 1
+        if self.__changes >= self.__compact_threshold and (
+            self.__compact_task is None or self.__compact_task.done()
+        ):
+            self.__compact_task = asyncio.create_task(self.compact())
+
+    async def compact(self) -> None:
+        """
+        Сольёт слой изменений в массивы CSR.
+        Новые массивы строятся в отдельном потоке по снимку слоя изменений, поэтому event loop не блокируется,
+        а подписки и отписки, пришедшие во время слияния, остаются в слое изменений относительно новых массивов.
+
+        :return: None.
+        """
+        async with self.__compact_lock:
+            added = {user_id: set(authors) for user_id, authors in self.__added.items()}
+            removed = {
+                user_id: set(authors) for user_id, authors in self.__removed.items()
+            }
+            offsets, targets = await asyncio.to_thread(
+                _merge_csr, self.__offsets, self.__targets, added, removed
+            )
+            users = set(added) | set(removed) | set(self.__added) | set(self.__removed)
+            following = {user_id: set(self.following(user_id)) for user_id in users}
+            self.__offsets, self.__targets = offsets, targets
+            self.__added, self.__removed = {}, {}
+            for user_id, authors in following.items():
+                start, end = self.__bounds(user_id)
+                stored = set(self.__targets[start:end])
+                if authors - stored:
+                    self.__added[user_id] = authors - stored
+                if stored - authors:
+                    self.__removed[user_id] = stored - authors
+            self.__changes = sum(map(len, self.__added.values())) + sum(
+                map(len, self.__removed.values())
+            )
+
+    async def __build(self, db: Database) -> None:
+        """
+        Построение CSR из таблицы subscriptions потоковым чтением,
+        отсортированным по (user_id, follower_id) - это порядок уникального индекса.
+
+        :param db: Database.
+        :return: None.
+        """
+        self.__pending = []
+        try:
+            async with db.get_sessionmaker() as session:
+                max_id_q = await session.execute(select(func.max(User.id)))
+                users = (max_id_q.scalar() or 0) + 1
+                counts = array("q", bytes(8 * (users + 1)))
+                targets = array("i")
+                rows = await session.stream(
+                    select(Subscriptions.user_id, Subscriptions.follower_id)
+                    .order_by(Subscriptions.user_id, Subscriptions.follower_id)
+                    .execution_options(yield_per=FOLLOW_GRAPH_BUILD_CHUNK)
+                )
+                async for partition in rows.partitions():
+                    for user_id, author_id in partition:
+                        counts[user_id + 1] += 1
+                        targets.append(author_id)
+            for user_id in range(users):
+                counts[user_id + 1] += counts[user_id]
+            self.__offsets, self.__targets = counts, targets
+            self.__added, self.__removed = {}, {}
+            self.__changes = 0
+            self.__built = True
+        finally:
+            pending, self.__pending = self.__pending, None
+        for user_id, author_id, followed in pending:
+            self.__change(user_id, author_id, followed)
+
+
+def _merge_csr(
+    offsets: "array[int]",
+    targets: "array[int]",
+    added: Dict[int, Set[int]],
+    removed: Dict[int, Set[int]],
+) -> Tuple["array[int]", "array[int]"]:
+    """
+    Построит новые массивы CSR, применив слой изменений к исходным.
+    Исходные массивы и слой изменений не меняются.
+
+    :param offsets: Смещения подписок пользователей.
+    :param targets: Подписки пользователей.
+    :param added: Добавленные рёбра {ID подписчика: ID авторов}.
+    :param removed: Удалённые рёбра {ID подписчика: ID авторов}.
+    :return: (offsets, targets).
+    """
+    users = max([len(offsets) - 1, *(user_id + 1 for user_id in added)])
+    new_offsets = array("q", [0])
+    new_targets = array("i")
+    for user_id in range(users):
+        start, end = (
+            (offsets[user_id], offsets[user_id + 1])
+            if user_id + 1 < len(offsets)
+            else (0, 0)
+        )
+        if user_id in added or user_id in removed:
+            following = set(targets[start:end]) - removed.get(user_id, set())
+            new_targets.extend(sorted(following | added.get(user_id, set())))
+        else:
+            new_targets.extend(targets[start:end])
+        new_offsets.append(len(new_targets))
+    return new_offsets, new_targets
@@ -0,0 +1,129 @@
+from typing import Collection, Optional, Set, Tuple
+
+from app.database.models import Subscriptions, User
+from app.utils.counters import change_followers_count
+from app.utils.timeline import backfill_timeline, remove_author_from_timeline
+from sqlalchemy import and_, delete, literal, or_, select
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Сколько пользователей можно запросить за раз в пакетной проверке отношений.
+MAX_RELATIONSHIP_IDS = 100
+
+
+def insert_subscriptions_ignore_duplicates(
+    session: AsyncSession,
+) -> PostgresqlInsert | SqliteInsert:
+    """
+    Функция вернёт INSERT в таблицу subscriptions с ON CONFLICT DO NOTHING
+    по уникальному ограничению user_id_follower_id для диалекта БД сессии.
+    Для SQLite используется sqlite_insert, для остальных (PostgreSQL) - postgresql_insert.
+
+    :param session: AsyncSession.
+    :return: Insert.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Subscriptions).on_conflict_do_nothing(
+            index_elements=[Subscriptions.user_id, Subscriptions.follower_id]
+        )
+    return postgresql_insert(Subscriptions).on_conflict_do_nothing(
+        constraint="user_id_follower_id"
+    )
+
+
+async def add_subscription(
+    session: AsyncSession, user_id: int, author_id: int, pull_threshold: int
+) -> bool:
+    """
+    Функция подпишет пользователя на автора одним запросом INSERT ... ON CONFLICT DO NOTHING RETURNING
+    по уникальному ограничению user_id_follower_id, увеличит счётчик подписчиков автора
+    и, если автор остался в push-режиме, добавит его последние твиты в ленту пользователя.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param user_id: ID подписчика.
+    :param author_id: ID автора.
+    :param pull_threshold: Порог подписчиков, выше которого автор в pull-режиме (settings.FAN_OUT_PULL_THRESHOLD).
+    :return: True - если подписка оформлена,
+        False - если она уже была, автора нет или пользователь подписывается на себя.
+    """
+    rows = select(literal(user_id), User.id).where(
+        User.id == author_id, User.id != user_id
+    )
+    subscription_q = await session.execute(
+        insert_subscriptions_ignore_duplicates(session)
+        .from_select(["user_id", "follower_id"], rows)
+        .returning(Subscriptions.id)
+    )
+    if subscription_q.scalar_one_or_none() is None:
+        return False
+    if await change_followers_count(session, author_id, 1) <= pull_threshold:
+        await backfill_timeline(session, user_id, author_id)
+    return True
+
+
+async def remove_subscription(
+    session: AsyncSession, user_id: int, author_id: int
+) -> Optional[int]:
+    """
+    Функция отпишет пользователя от автора одним запросом DELETE ... RETURNING,
+    уменьшит счётчик подписчиков автора и уберёт его твиты из ленты пользователя.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param user_id: ID подписчика.
+    :param author_id: ID автора.
+    :return: Новое число подписчиков автора или None, если подписки не было.
+    """
+    subscription_q = await session.execute(
+        delete(Subscriptions)
+        .where(Subscriptions.user_id == user_id, Subscriptions.follower_id == author_id)
+        .returning(Subscriptions.id)
+    )
+    if subscription_q.scalar_one_or_none() is None:
+        return None
+    followers_count = await change_followers_count(session, author_id, -1)
+    await remove_author_from_timeline(session, user_id, author_id)
+    return followers_count
+
+
+async def get_relationships(
+    session: AsyncSession, user_id: int, ids: Collection[int]
+) -> Tuple[Set[int], Set[int]]:
+    """
+    Функция вернёт отношения пользователя с пользователями ids одним запросом к subscriptions.
+    Обе ветви условия читаются по индексам: (user_id, follower_id) - подписки пользователя,
+    (follower_id, user_id) - его подписчики.
+
+    :param session: AsyncSession.
+    :param user_id: ID пользователя.
+    :param ids: ID других пользователей.
+    :return: (ID тех, на кого подписан пользователь; ID тех, кто подписан на пользователя).
+    """
+    following: Set[int] = set()
+    followed_by: Set[int] = set()
+    if not ids:
+        return following, followed_by
+    subscriptions_q = await session.execute(
+        select(Subscriptions.user_id, Subscriptions.follower_id).where(
+            or_(
+                and_(
+                    Subscriptions.user_id == user_id,
+                    Subscriptions.follower_id.in_(ids),
+                ),
+                and_(
+                    Subscriptions.follower_id == user_id,
+                    Subscriptions.user_id.in_(ids),
+                ),
+            )
+        )
+    )
+    for subscriber_id, author_id in subscriptions_q:
+        if subscriber_id == user_id:
+            following.add(author_id)
+        else:
+            followed_by.add(subscriber_id)
+    return following, followed_by
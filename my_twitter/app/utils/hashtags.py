@@ -0,0 +1,200 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.database.models import Hashtag, Tweet, TweetHashtag
+from app.database.models.hashtag import MAX_TAG_LENGTH
+from app.settings.classes import Settings
+from app.utils.feed import complete_feed_rows, select_feed_rows
+from app.utils.feed_serializer import serialize_feed_page
+from app.utils.pagination import decode_cursor
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Сколько хэштегов и упоминаний одного твита индексируется (остальные отбрасываются).
+MAX_TWEET_TAGS = 50
+# Сколько твитов обрабатывается за раз при заполнении индекса по существующим твитам.
+BACKFILL_BATCH = 1000
+
+# Один проход по тексту: знак # или @ не после буквы, цифры, _, # или @ (не e-mail и не ##),
+# за ним слово. Регистр приводится к нижнему после разбора.
+TAG_RE = re.compile(r"(?<![\w#@])([#@])(\w+)")
+
+
+def extract_tags(content: str) -> List[Tuple[str, str]]:
+    """
+    Функция найдёт в тексте твита хэштеги (#tag) и упоминания (@name) за один проход
+    скомпилированным выражением. Повторы отбрасываются, порядок первого появления сохраняется.
+
+    :param content: Текст твита.
+    :return: Список (вид, тег): вид "#" или "@", тег в нижнем регистре без знака.
+    """
+    tags: Dict[Tuple[str, str], None] = {}
+    for kind, tag in TAG_RE.findall(content):
+        if len(tag) <= MAX_TAG_LENGTH:
+            tags[(kind, tag.lower())] = None
+            if len(tags) == MAX_TWEET_TAGS:
+                break
+    return list(tags)
+
+
+def parse_tag(value: str) -> Tuple[str, str]:
+    """
+    Функция разберёт тег из адреса: "@name" - упоминание, "#tag" или "tag" - хэштег.
+
+    :param value: Тег.
+    :return: (вид, тег в нижнем регистре).
+    """
+    if value.startswith("@"):
+        return "@", value[1:].lower()
+    return "#", value.removeprefix("#").lower()
+
+
+def insert_hashtags_ignore_duplicates(
+    session: AsyncSession,
+) -> PostgresqlInsert | SqliteInsert:
+    """
+    Функция вернёт INSERT в таблицу hashtags с ON CONFLICT DO NOTHING
+    по уникальному ограничению hashtag_kind_tag для диалекта БД сессии.
+
+    :param session: AsyncSession.
+    :return: Insert.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Hashtag).on_conflict_do_nothing(
+            index_elements=[Hashtag.kind, Hashtag.tag]
+        )
+    return postgresql_insert(Hashtag).on_conflict_do_nothing(
+        constraint="hashtag_kind_tag"
+    )
+
+
+def insert_tweet_hashtags_ignore_duplicates(
+    session: AsyncSession,
+) -> PostgresqlInsert | SqliteInsert:
+    """
+    Функция вернёт INSERT в таблицу tweet_hashtags с ON CONFLICT DO NOTHING
+    по уникальному ограничению tweet_hashtag_hashtag_id_tweet_id для диалекта БД сессии.
+
+    :param session: AsyncSession.
+    :return: Insert.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(TweetHashtag).on_conflict_do_nothing(
+            index_elements=[TweetHashtag.hashtag_id, TweetHashtag.tweet_id]
+        )
+    return postgresql_insert(TweetHashtag).on_conflict_do_nothing(
+        constraint="tweet_hashtag_hashtag_id_tweet_id"
+    )
+
+
+async def save_tweets_tags(
+    session: AsyncSession, tweets: Sequence[Tuple[int, datetime, str]]
+) -> int:
+    """
+    Функция разберёт тексты твитов и запишет их хэштеги и упоминания в обратный индекс:
+    новые теги - в hashtags, связи - в tweet_hashtags (повторная запись ничего не меняет).
+    Если тегов нет, то запросов к БД нет, иначе их три. Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param tweets: Твиты (id, created, content).
+    :return: Количество найденных связей твит-тег.
+    """
+    entries = [
+        (tweet_id, created, tag)
+        for tweet_id, created, content in tweets
+        for tag in extract_tags(content)
+    ]
+    if not entries:
+        return 0
+    tags = list(dict.fromkeys(tag for _, _, tag in entries))
+    await session.execute(
+        insert_hashtags_ignore_duplicates(session),
+        [dict(kind=kind, tag=tag) for kind, tag in tags],
+    )
+    hashtags_q = await session.execute(
+        select(Hashtag.kind, Hashtag.tag, Hashtag.id).where(
+            tuple_(Hashtag.kind, Hashtag.tag).in_(tags)
+        )
+    )
+    hashtag_ids = {(kind, tag): hashtag_id for kind, tag, hashtag_id in hashtags_q}
+    await session.execute(
+        insert_tweet_hashtags_ignore_duplicates(session),
+        [
+            dict(hashtag_id=hashtag_ids[tag], tweet_id=tweet_id, created=created)
+            for tweet_id, created, tag in entries
+        ],
+    )
+    return len(entries)
+
+
+async def backfill_hashtags(session: AsyncSession) -> int:
+    """
+    Функция заполнит обратный индекс хэштегов и упоминаний по всем существующим твитам
+    пачками по BACKFILL_BATCH твитов (проход по первичному ключу, коммит после каждой пачки).
+    Повторный запуск безопасен. Используется для первичного заполнения после миграции.
+
+    :param session: AsyncSession.
+    :return: Количество найденных связей твит-тег.
+    """
+    total = 0
+    last_id = 0
+    while True:
+        tweets_q = await session.execute(
+            select(Tweet.id, Tweet.created, Tweet.content)
+            .where(Tweet.id > last_id)
+            .order_by(Tweet.id)
+            .limit(BACKFILL_BATCH)
+        )
+        tweets: Sequence[Any] = tweets_q.all()
+        if not tweets:
+            return total
+        total += await save_tweets_tags(session, tweets)
+        await session.commit()
+        last_id = tweets[-1][0]
+
+
+async def load_hashtag_json(
+    session: AsyncSession,
+    settings: Settings,
+    tag: str,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция вернёт страницу твитов с хэштегом или упоминанием (от новых к старым) в формате ленты
+    (OutResponseTweet) в виде JSON-байт. Твиты читаются проходом по индексу
+    (hashtag_id, created, tweet_id) с курсорной пагинацией, текст твитов не сканируется.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param tag: Тег ("#tag", "tag" или "@name").
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    kind, tag = parse_tag(tag)
+    query = (
+        select_feed_rows()
+        .join(TweetHashtag, TweetHashtag.tweet_id == Tweet.id)
+        .join(Hashtag, Hashtag.id == TweetHashtag.hashtag_id)
+        .where(Hashtag.kind == kind, Hashtag.tag == tag)
+    )
+    if cursor is not None:
+        created, tweet_id = decode_cursor(cursor, datetime, int)
+        query = query.where(
+            tuple_(TweetHashtag.created, TweetHashtag.tweet_id) < (created, tweet_id)
+        )
+    tweets_q = await session.execute(
+        query.order_by(TweetHashtag.created.desc(), TweetHashtag.tweet_id.desc()).limit(
+            limit
+        )
+    )
+    rows = await complete_feed_rows(session, settings, tweets_q.all(), include_likes)
+    return serialize_feed_page(settings, rows, limit)
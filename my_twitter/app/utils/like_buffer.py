@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple, cast
+
+from app.database.database import Database
+from app.database.models import Like, Tweet
+from app.utils.likes import insert_likes_ignore_duplicates
+from app.utils.popularity import update_popularity
+from sqlalchemy import Table, bindparam, delete, select, tuple_, update
+from sqlalchemy.exc import (
+    IntegrityError,
+    InterfaceError,
+    OperationalError,
+    SQLAlchemyError,
+)
+
+# Сколько раз подряд пачка возвращается в буфер после временной ошибки записи, прежде чем будет отброшена.
+MAX_FLUSH_RETRIES = 5
+# Максимум строк в одном запросе записи пачки (asyncpg допускает не больше 32767 параметров запроса).
+MAX_WRITE_ROWS = 1000
+
+
+class LikeBuffer:
+    """
+    Буфер лайков с отложенной записью (write-behind).
+
+    Лайки и дизлайки подтверждаются сразу, а в БД записываются пачками:
+    каждые flush_interval секунд или как только накопится max_ops операций.
+    Внутри пачки для каждой пары (твит, пользователь) остаётся только последняя операция,
+    поэтому повторы схлопываются, а лайк с последующим дизлайком превращается в один DELETE,
+    который ничего не удалит, если лайка в БД не было.
+    Если запись не удалась из-за временной ошибки (соединение с БД), пачка возвращается в буфер
+    под более новые операции и записывается повторно, но не больше MAX_FLUSH_RETRIES раз подряд.
+    Пачка пишется одной транзакцией запросами не больше чем по min(max_ops, MAX_WRITE_ROWS) строк.
+    Если пачка нарушает ограничение целостности (например, пользователь удалён), то она делится пополам,
+    пока не останется одна неверная операция, которая отбрасывается, а остальные записываются.
+    После каждой успешной записи вызывается on_write с изменением количества лайков по ID твитов
+    (только по фактически вставленным и удалённым строкам: например, для инвалидации кэша ленты,
+    рассылки событий и трендов).
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        flush_interval: float,
+        max_ops: int,
+        popularity_half_life_s: float,
+        logger: logging.Logger,
+        on_write: Optional[Callable[[Counter[int]], None]] = None,
+    ) -> None:
+        self.__db = db
+        self.__flush_interval = flush_interval
+        self.__max_ops = max_ops
+        self.__popularity_half_life_s = popularity_half_life_s
+        self.__logger = logger
+        self.__on_write = on_write
+        self.__pending: Dict[Tuple[int, int], bool] = {}
+        self.__flush_lock = asyncio.Lock()
+        self.__wakeup = asyncio.Event()
+        self.__closed = False
+        self.__failures = 0
+        self.__task: Optional[asyncio.Task[None]] = None
+
+    async def add(self, tweet_id: int, user_id: int, liked: bool) -> None:
+        """
+        Добавит операцию в буфер и при необходимости запустит фоновую запись.
+
+        :param tweet_id: ID твита.
+        :param user_id: ID пользователя.
+        :param liked: True - лайк, False - дизлайк.
+        :return: None.
+        """
+        self.__pending[(tweet_id, user_id)] = liked
+        if not self.__closed and (self.__task is None or self.__task.done()):
+            self.__task = asyncio.create_task(self.__run())
+        if len(self.__pending) >= self.__max_ops:
+            self.__wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        """
+        Количество операций, ожидающих записи.
+
+        :return: Количество операций.
+        """
+        return len(self.__pending)
+
+    async def flush(self) -> None:
+        """
+        Запишет накопленные операции в БД одной транзакцией:
+        многострочные INSERT ... ON CONFLICT DO NOTHING для лайков,
+        DELETE ... WHERE (tweet_id, user_id) IN (...) для дизлайков
+        и пакетное изменение счётчиков like_count по фактически изменённым строкам
+        с пересчётом оценок популярности этих твитов.
+
+        :return: None.
+        """
+        async with self.__flush_lock:
+            batch, self.__pending = self.__pending, {}
+            if not batch:
+                return
+            try:
+                deltas = await self.__write_isolated(batch)
+            except (OperationalError, InterfaceError, OSError) as exc:
+                self.__logger.exception(exc)
+                self.__failures += 1
+                if self.__failures > MAX_FLUSH_RETRIES:
+                    self.__logger.error(
+                        "Пачка из %d операций отброшена после %d попыток записи.",
+                        len(batch),
+                        self.__failures,
+                    )
+                    self.__failures = 0
+                else:
+                    # Более новые операции с теми же парами (твит, пользователь) важнее.
+                    self.__pending = {**batch, **self.__pending}
+            except SQLAlchemyError as exc:
+                # Пачку не возвращаем в буфер: повтор той же ошибки заблокировал бы все следующие записи.
+                self.__logger.exception(exc)
+                self.__failures = 0
+            else:
+                self.__failures = 0
+                if self.__on_write is not None:
+                    self.__on_write(
+                        Counter(
+                            {
+                                tweet_id: delta
+                                for tweet_id, delta in deltas.items()
+                                if delta
+                            }
+                        )
+                    )
+
+    async def close(self) -> None:
+        """
+        Остановит фоновую запись, дождавшись начатой записи (задача не отменяется,
+        чтобы не потерять уже забранную из буфера пачку), и запишет всё, что осталось в буфере.
+
+        :return: None.
+        """
+        self.__closed = True
+        self.__wakeup.set()
+        if self.__task is not None:
+            await self.__task
+            self.__task = None
+        await self.flush()
+        while self.__pending:
+            # Запись не удалась из-за временной ошибки: повторяем, пока пачка не будет записана или отброшена.
+            await asyncio.sleep(self.__flush_interval)
+            await self.flush()
+
+    async def __run(self) -> None:
+        """
+        Фоновая запись буфера по таймеру или по количеству операций до вызова close.
+
+        :return: None.
+        """
+        while not self.__closed:
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), self.__flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.__wakeup.clear()
+            await self.flush()
+
+    async def __write_isolated(
+        self, batch: Dict[Tuple[int, int], bool]
+    ) -> Counter[int]:
+        """
+        Запись пачки операций в БД с изоляцией операций, нарушающих ограничения целостности:
+        такая пачка делится пополам и половины записываются отдельно (повторная запись
+        уже записанной половины ничего не меняет), а единственная неверная операция отбрасывается.
+
+        :param batch: Операции {(tweet_id, user_id): liked}.
+        :return: Изменение количества лайков по ID твитов.
+        """
+        try:
+            return await self.__write(batch)
+        except IntegrityError as exc:
+            if len(batch) == 1:
+                self.__logger.warning(
+                    "Операция %r отброшена: %r", next(iter(batch.items())), exc
+                )
+                return Counter()
+        operations = list(batch.items())
+        half = len(operations) // 2
+        deltas = await self.__write_isolated(dict(operations[:half]))
+        deltas.update(await self.__write_isolated(dict(operations[half:])))
+        return deltas
+
+    async def __write(self, batch: Dict[Tuple[int, int], bool]) -> Counter[int]:
+        """
+        Запись пачки операций в БД одной транзакцией, запросами не больше
+        чем по min(max_ops, MAX_WRITE_ROWS) строк.
+
+        :param batch: Операции {(tweet_id, user_id): liked}.
+        :return: Изменение количества лайков по ID твитов.
+        """
+        size = min(self.__max_ops, MAX_WRITE_ROWS)
+        likes = [pair for pair, liked in batch.items() if liked]
+        dislikes = [pair for pair, liked in batch.items() if not liked]
+        deltas: Counter[int] = Counter()
+        async with self.__db.get_sessionmaker() as session:
+            for chunk in get_chunks(likes, size):
+                tweets_q = await session.execute(
+                    select(Tweet.id).where(
+                        Tweet.id.in_({tweet_id for tweet_id, _ in chunk})
+                    )
+                )
+                tweet_ids = set(tweets_q.scalars().all())
+                rows = [
+                    dict(tweet_id=tweet_id, user_id=user_id)
+                    for tweet_id, user_id in chunk
+                    if tweet_id in tweet_ids
+                ]
+                if rows:
+                    inserted_q = await session.execute(
+                        insert_likes_ignore_duplicates(session)
+                        .values(rows)
+                        .returning(Like.tweet_id)
+                    )
+                    deltas.update(inserted_q.scalars().all())
+            for chunk in get_chunks(dislikes, size):
+                deleted_q = await session.execute(
+                    delete(Like)
+                    .where(tuple_(Like.tweet_id, Like.user_id).in_(chunk))
+                    .returning(Like.tweet_id)
+                )
+                deltas.subtract(deleted_q.scalars().all())
+            changes = [
+                dict(b_id=tweet_id, b_delta=delta)
+                for tweet_id, delta in deltas.items()
+                if delta
+            ]
+            tweets = cast(Table, Tweet.__table__)
+            for changes_chunk in get_chunks(changes, size):
+                await session.execute(
+                    update(tweets)
+                    .where(tweets.c.id == bindparam("b_id"))
+                    .values(like_count=tweets.c.like_count + bindparam("b_delta")),
+                    changes_chunk,
+                )
+                await update_popularity(
+                    session,
+                    [change["b_id"] for change in changes_chunk],
+                    self.__popularity_half_life_s,
+                )
+            await session.commit()
+        return deltas
+
+
+def get_chunks[T](items: List[T], size: int) -> List[List[T]]:
+    """
+    Функция разобьёт список на части не длиннее size.
+
+    :param items: Список.
+    :param size: Размер части.
+    :return: Части списка.
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,78 @@
+from app.database.models import Like, Tweet
+from app.utils.counters import change_like_count
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_likes_ignore_duplicates(
+    session: AsyncSession,
+) -> PostgresqlInsert | SqliteInsert:
+    """
+    Функция вернёт INSERT в таблицу likes с ON CONFLICT DO NOTHING
+    по уникальному ограничению tweet_id_user_id для диалекта БД сессии.
+    Для SQLite используется sqlite_insert, для остальных (PostgreSQL) - postgresql_insert.
+
+    :param session: AsyncSession.
+    :return: Insert.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Like).on_conflict_do_nothing(
+            index_elements=[Like.tweet_id, Like.user_id]
+        )
+    return postgresql_insert(Like).on_conflict_do_nothing(constraint="tweet_id_user_id")
+
+
+async def add_like(
+    session: AsyncSession, tweet_id: int, user_id: int, half_life_s: float
+) -> bool:
+    """
+    Функция поставит лайк твиту одним запросом INSERT ... ON CONFLICT DO NOTHING RETURNING
+    по уникальному ограничению tweet_id_user_id и увеличит счётчик лайков твита
+    (с пересчётом оценки популярности).
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param tweet_id: ID твита.
+    :param user_id: ID пользователя.
+    :param half_life_s: Период полураспада оценки популярности (сек.).
+    :return: True - если лайк поставлен, False - если лайк уже был или твита нет.
+    """
+    rows = select(Tweet.id, literal(user_id)).where(Tweet.id == tweet_id)
+    like_q = await session.execute(
+        insert_likes_ignore_duplicates(session)
+        .from_select(["tweet_id", "user_id"], rows)
+        .returning(Like.id)
+    )
+    if like_q.scalar_one_or_none() is None:
+        return False
+    await change_like_count(session, tweet_id, 1, half_life_s)
+    return True
+
+
+async def remove_like(
+    session: AsyncSession, tweet_id: int, user_id: int, half_life_s: float
+) -> bool:
+    """
+    Функция уберёт лайк твита одним запросом DELETE ... RETURNING и уменьшит счётчик лайков твита
+    (с пересчётом оценки популярности).
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param tweet_id: ID твита.
+    :param user_id: ID пользователя.
+    :param half_life_s: Период полураспада оценки популярности (сек.).
+    :return: True - если лайк убран, False - если лайка не было.
+    """
+    like_q = await session.execute(
+        delete(Like)
+        .where(Like.tweet_id == tweet_id, Like.user_id == user_id)
+        .returning(Like.id)
+    )
+    if like_q.scalar_one_or_none() is None:
+        return False
+    await change_like_count(session, tweet_id, -1, half_life_s)
+    return True
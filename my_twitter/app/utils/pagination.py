@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Type
+
+from fastapi import HTTPException
+
+# Максимальный лимит на страницу курсорной пагинации.
+MAX_PAGE_LIMIT = 100
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Функция кодирует значения ключа сортировки в непрозрачный курсор.
+    Дата и время сохраняются в ISO-формате.
+
+    :param values: Значения ключа сортировки (например, created и id твита).
+    :return: Курсор (base64url строка).
+    """
+    raw = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: Type[Any]) -> List[Any]:
+    """
+    Функция декодирует курсор, созданный encode_cursor, и приводит значения к заданным типам.
+    Если курсор повреждён, то будет вызвано HTTPException 400.
+
+    :param cursor: Курсор.
+    :param types: Типы значений ключа сортировки (datetime, int, float, str).
+    :return: Список значений ключа сортировки.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Не верная длина курсора.")
+        return [_cast(value, value_type) for value, value_type in zip(values, types)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Не верный курсор.")
+
+
+def _cast(value: Any, value_type: Type[Any]) -> Any:
+    """
+    Приводит значение из курсора к заданному типу.
+
+    :param value: Значение.
+    :param value_type: Тип.
+    :return: Значение заданного типа.
+    """
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type in (int, float) and isinstance(value, bool):
+        raise TypeError("Не верный тип значения курсора.")
+    if not isinstance(value, (int, float, str)):
+        raise TypeError("Не верный тип значения курсора.")
+    return value_type(value)
+
+
+def next_cursor(rows: Sequence[Any], limit: int, *attrs: str) -> str | None:
+    """
+    Функция вернёт курсор следующей страницы по последней строке текущей страницы.
+    Если страница неполная, то следующей страницы нет и функция вернёт None.
+
+    :param rows: Строки текущей страницы.
+    :param limit: Лимит на страницу.
+    :param attrs: Имена атрибутов строки, из которых состоит ключ сортировки.
+    :return: Курсор или None.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, attr) for attr in attrs))
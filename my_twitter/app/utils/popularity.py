@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple, Unpack, cast
+
+from app.database.database import Database
+from app.database.models import Tweet
+from sqlalchemy import Select, Table, bindparam, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Оценка ниже этого значения обнуляется: твит выпадает из фонового пересчёта.
+MIN_POPULARITY = 1e-3
+# Сколько твитов пересчитывается за раз.
+RECOMPUTE_BATCH = 1000
+
+
+def get_popularity(
+    like_count: int, created: datetime, now: datetime, half_life_s: float
+) -> float:
+    """
+    Функция вычислит оценку популярности твита: количество лайков,
+    которое уменьшается вдвое за каждые half_life_s секунд возраста твита.
+
+    :param like_count: Количество лайков.
+    :param created: Дата и время создания твита.
+    :param now: Момент, на который считается оценка.
+    :param half_life_s: Период полураспада оценки (сек.).
+    :return: Оценка (0, если она меньше MIN_POPULARITY).
+    """
+    age = max((now - created).total_seconds(), 0.0)
+    popularity = like_count * 0.5 ** (age / half_life_s)
+    return popularity if popularity >= MIN_POPULARITY else 0.0
+
+
+async def set_popularity(
+    session: AsyncSession,
+    tweets: Sequence[Tuple[int, int, datetime]],
+    half_life_s: float,
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Функция запишет оценки популярности твитов на момент now одним пакетным UPDATE.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param tweets: Твиты (id, like_count, created).
+    :param half_life_s: Период полураспада оценки (сек.).
+    :param now: Момент, на который считаются оценки (по умолчанию - текущий).
+    :return: None.
+    """
+    if not tweets:
+        return
+    now = now or datetime.now()
+    tweets_table = cast(Table, Tweet.__table__)
+    await session.execute(
+        update(tweets_table)
+        .where(tweets_table.c.id == bindparam("b_id"))
+        .values(popularity=bindparam("b_popularity")),
+        [
+            dict(
+                b_id=tweet_id,
+                b_popularity=get_popularity(like_count, created, now, half_life_s),
+            )
+            for tweet_id, like_count, created in tweets
+        ],
+    )
+
+
+async def update_popularity(
+    session: AsyncSession, tweet_ids: Sequence[int], half_life_s: float
+) -> None:
+    """
+    Функция пересчитает оценки популярности твитов по их текущему количеству лайков
+    (два запроса независимо от количества твитов). Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param tweet_ids: ID твитов.
+    :param half_life_s: Период полураспада оценки (сек.).
+    :return: None.
+    """
+    if not tweet_ids:
+        return
+    tweets_q = await session.execute(
+        select(Tweet.id, Tweet.like_count, Tweet.created).where(Tweet.id.in_(tweet_ids))
+    )
+    await set_popularity(session, tweets_q.all(), half_life_s)
+
+
+async def recompute_popularity(
+    session: AsyncSession, half_life_s: float, full: bool = False
+) -> int:
+    """
+    Функция пересчитает оценки популярности на текущий момент пачками по RECOMPUTE_BATCH твитов
+    (коммит после каждой пачки). Обходятся только твиты с ненулевой оценкой - по индексу
+    (popularity, id) по возрастанию: пересчёт только уменьшает оценки, поэтому обход ничего не пропускает,
+    а твиты, оценка которых опустилась ниже MIN_POPULARITY, обнуляются и выпадают из следующих пересчётов.
+    С full=True обходятся все твиты с лайками (первичное заполнение после миграции).
+
+    :param session: AsyncSession.
+    :param half_life_s: Период полураспада оценки (сек.).
+    :param full: Пересчитать все твиты с лайками.
+    :return: Количество пересчитанных твитов.
+    """
+    total = 0
+    now = datetime.now()
+    query: Select[Unpack[Tuple[Any, ...]]]
+    if full:
+        key: Any = (Tweet.id,)
+        query = select(Tweet.id, Tweet.like_count, Tweet.created).where(
+            Tweet.like_count > 0
+        )
+    else:
+        key = (Tweet.popularity, Tweet.id)
+        query = select(
+            Tweet.id, Tweet.like_count, Tweet.created, Tweet.popularity
+        ).where(Tweet.popularity > 0)
+    last: Optional[Tuple[Any, ...]] = None
+    while True:
+        batch_query = query.order_by(*key).limit(RECOMPUTE_BATCH)
+        if last is not None:
+            batch_query = batch_query.where(tuple_(*key) > last)
+        tweets_q = await session.execute(batch_query)
+        tweets: Sequence[Any] = tweets_q.all()
+        if not tweets:
+            return total
+        await set_popularity(session, [tweet[:3] for tweet in tweets], half_life_s, now)
+        await session.commit()
+        total += len(tweets)
+        last = (tweets[-1][0],) if full else (tweets[-1][3], tweets[-1][0])
+
+
+class PopularityUpdater:
+    """
+    Фоновый пересчёт оценок популярности твитов (сортировка ленты sort=popular).
+
+    Лайки и дизлайки сразу пересчитывают оценку своего твита, а оценки остальных твитов
+    со временем устаревают: раз в interval секунд они пересчитываются на текущий момент (recompute_popularity).
+    Поскольку все оценки убывают с одинаковой скоростью, пересчёт не меняет их порядок,
+    а только убирает расхождение между недавно и давно пересчитанными твитами.
+    После каждого пересчёта увеличивается version (часть ключа и ETag популярных страниц).
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        half_life_s: float,
+        interval: float,
+        logger: logging.Logger,
+    ) -> None:
+        self.__db = db
+        self.__half_life_s = half_life_s
+        self.__interval = interval
+        self.__logger = logger
+        self.__version = 0
+        self.__task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def version(self) -> int:
+        """
+        Номер последнего пересчёта оценок.
+
+        :return: Номер пересчёта.
+        """
+        return self.__version
+
+    def start(self) -> None:
+        """
+        Запустит фоновый пересчёт, если он ещё не запущен.
+
+        :return: None.
+        """
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+
+    async def close(self) -> None:
+        """
+        Остановит фоновый пересчёт.
+
+        :return: None.
+        """
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    async def recompute(self) -> int:
+        """
+        Пересчитает оценки всех твитов с ненулевой оценкой на текущий момент.
+
+        :return: Количество пересчитанных твитов.
+        """
+        async with self.__db.get_sessionmaker() as session:
+            total = await recompute_popularity(session, self.__half_life_s)
+        self.__version += 1
+        return total
+
+    async def __run(self) -> None:
+        """
+        Фоновый пересчёт по таймеру.
+
+        :return: None.
+        """
+        while True:
+            await asyncio.sleep(self.__interval)
+            try:
+                await self.recompute()
+            except (SQLAlchemyError, OSError) as exc:
+                self.__logger.exception(exc)
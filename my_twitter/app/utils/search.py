@@ -0,0 +1,198 @@
+import re
+from typing import Any, List, Optional, Tuple, Unpack
+
+from app.database.models.tweet import (
+    SEARCH_FTS_TABLE,
+    SEARCH_TS_CONFIG,
+    SEARCH_VECTOR_COLUMN,
+    Tweet,
+)
+from app.settings.classes import Settings
+from app.utils.feed import complete_feed_rows, select_feed_rows
+from app.utils.feed_serializer import dumps, get_tweet_dicts
+from app.utils.pagination import decode_cursor, encode_cursor
+from fastapi import HTTPException
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Максимум слов поискового запроса (остальные отбрасываются).
+MAX_SEARCH_TERMS = 16
+
+WORD_RE = re.compile(r"\w+")
+
+
+def get_search_terms(q: str) -> List[str]:
+    """
+    Функция разобьёт поисковый запрос на слова (в нижнем регистре).
+    Знаки препинания и операторы отбрасываются, поэтому слова безопасно подставлять
+    в синтаксис запросов tsquery и FTS5.
+    Если слов нет, то будет вызвано HTTPException 400.
+
+    :param q: Поисковый запрос.
+    :return: Слова запроса (не больше MAX_SEARCH_TERMS).
+    """
+    terms = WORD_RE.findall(q.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise HTTPException(status_code=400, detail="Не верный запрос.")
+    return terms
+
+
+def get_ts_query(terms: List[str]) -> ColumnElement[Any]:
+    """
+    Функция вернёт tsquery PostgreSQL, требующий все слова запроса.
+
+    :param terms: Слова запроса (get_search_terms).
+    :return: Выражение to_tsquery.
+    """
+    return func.to_tsquery(
+        cast(literal(SEARCH_TS_CONFIG), REGCONFIG), " & ".join(terms)
+    )
+
+
+def select_search_matches(
+    dialect: str, terms: List[str]
+) -> Select[Unpack[Tuple[Any, ...]]]:
+    """
+    Функция вернёт запрос твитов, содержащих все слова запроса, от новых к старым:
+    колонка id и данные для ранжирования (search_vector на PostgreSQL, score на SQLite).
+
+    :param dialect: Название диалекта БД.
+    :param terms: Слова запроса (get_search_terms).
+    :return: Запрос совпадений.
+    """
+    if dialect == "postgresql":
+        search_vector = column(SEARCH_VECTOR_COLUMN, TSVECTOR)
+        return (
+            select(Tweet.id, search_vector)
+            .where(search_vector.bool_op("@@")(get_ts_query(terms)))
+            .order_by(Tweet.id.desc())
+        )
+    # Скрытая колонка FTS5-таблицы с её же именем используется для MATCH и bm25.
+    # bm25 вычисляется только для отобранных строк: FTS5 отдаёт совпадения в порядке rowid.
+    fts = table(SEARCH_FTS_TABLE, column("rowid"), column(SEARCH_FTS_TABLE))
+    return (
+        select(
+            fts.c.rowid.label("id"),
+            (-func.bm25(fts.c[SEARCH_FTS_TABLE])).label("score"),
+        )
+        .where(fts.c[SEARCH_FTS_TABLE].match(" ".join(f'"{term}"' for term in terms)))
+        .order_by(fts.c.rowid.desc())
+    )
+
+
+def select_search_truncated(
+    dialect: str, terms: List[str], window: int
+) -> Select[Unpack[Tuple[int]]]:
+    """
+    Функция вернёт запрос, который найдёт совпадение старше window самых новых
+    (то есть не попавшее в ранжирование select_search_ids). Читается не больше window + 1 совпадений.
+
+    :param dialect: Название диалекта БД.
+    :param terms: Слова запроса (get_search_terms).
+    :param window: Количество самых новых совпадений, среди которых выбираются наиболее релевантные.
+    :return: Запрос (id) - пустой, если все совпадения ранжируются.
+    """
+    matches = select_search_matches(dialect, terms).offset(window).limit(1).subquery()
+    return select(matches.c.id)
+
+
+def select_search_ids(
+    dialect: str, terms: List[str], limit: int, cursor: Optional[str], window: int
+) -> Select[Unpack[Tuple[int, float]]]:
+    """
+    Функция вернёт запрос ID найденных твитов и их релевантности (все слова запроса должны встретиться),
+    отсортированных по убыванию (релевантность, id), с курсорной пагинацией по этому же ключу.
+    Ранжируются только window самых новых совпадений: стоимость ранжирования частого слова
+    иначе росла бы с размером таблицы (более старые совпадения находит select_search_truncated).
+    PostgreSQL: GIN-индекс по tweets.search_vector и ts_rank_cd.
+    SQLite: FTS5-таблица tweets_fts и bm25 (со знаком минус, чтобы больше было лучше).
+
+    :param dialect: Название диалекта БД.
+    :param terms: Слова запроса (get_search_terms).
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы.
+    :param window: Количество самых новых совпадений, среди которых выбираются наиболее релевантные.
+    :return: Запрос (id, score).
+    """
+    matches = select_search_matches(dialect, terms).limit(window).subquery("matches")
+    if dialect == "postgresql":
+        score: Any = cast(
+            func.ts_rank_cd(matches.c.search_vector, get_ts_query(terms)), Float
+        )
+    else:
+        score = matches.c.score
+    query = select(matches.c.id, score.label("score"))
+    if cursor is not None:
+        cursor_score, cursor_id = decode_cursor(cursor, float, int)
+        query = query.where(tuple_(score, matches.c.id) < (cursor_score, cursor_id))
+    return query.order_by(score.desc(), matches.c.id.desc()).limit(limit)
+
+
+async def search_tweets_json(
+    session: AsyncSession,
+    settings: Settings,
+    q: str,
+    limit: int,
+    cursor: Optional[str],
+    include_likes: bool,
+) -> bytes:
+    """
+    Функция найдёт твиты по словам запроса и вернёт страницу в формате ленты (OutResponseTweet)
+    в виде JSON-байт, от наиболее релевантных к наименее
+    (среди settings.SEARCH_RANK_WINDOW самых новых совпадений; truncated=true, если есть более старые).
+    Сначала по полнотекстовому индексу выбираются только ID и релевантность страницы, затем твиты страницы
+    догружаются по первичному ключу (complete_feed_rows) - не более пяти запросов.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param q: Поисковый запрос.
+    :param limit: Лимит на страницу.
+    :param cursor: Курсор следующей страницы (next_cursor из предыдущего ответа).
+    :param include_likes: Подгрузить первые settings.LIKES_PREVIEW_LIMIT лайков (иначе likes пустой).
+    :return: JSON-байты страницы.
+    """
+    terms = get_search_terms(q)
+    dialect = session.get_bind().dialect.name
+    ids_q = await session.execute(
+        select_search_ids(
+            dialect,
+            terms,
+            limit,
+            cursor,
+            settings.SEARCH_RANK_WINDOW,
+        )
+    )
+    hits = ids_q.all()
+    tweets: List[Any] = []
+    if hits:
+        tweets_q = await session.execute(
+            select_feed_rows().where(Tweet.id.in_([tweet_id for tweet_id, _ in hits]))
+        )
+        by_id = {tweet[0]: tweet for tweet in tweets_q.all()}
+        tweets = [by_id[tweet_id] for tweet_id, _ in hits if tweet_id in by_id]
+    rows = await complete_feed_rows(session, settings, tweets, include_likes)
+    truncated_q = await session.execute(
+        select_search_truncated(dialect, terms, settings.SEARCH_RANK_WINDOW)
+    )
+    return dumps(
+        {
+            "result": True,
+            "tweets": get_tweet_dicts(settings, rows),
+            "next_cursor": (
+                encode_cursor(hits[-1][1], hits[-1][0]) if len(hits) == limit else None
+            ),
+            "truncated": truncated_q.first() is not None,
+        }
+    )
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """
+    Выполняемый запрос и количество ожидающих его результата.
+    """
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных запросов (single-flight).
+
+    Первый запрос с ключом запускает работу в отдельной задаче, все следующие с тем же ключом
+    ждут её результата, пока она не завершится. Ошибка работы пробрасывается всем ожидающим.
+    Отмена одного ожидающего (например, клиент разорвал соединение) не отменяет работу для остальных,
+    работа отменяется, только когда её перестали ждать все.
+    """
+
+    def __init__(self) -> None:
+        self.__calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do[T](self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнит func или присоединится к уже выполняемому запросу с тем же ключом.
+
+        :param key: Ключ запроса.
+        :param func: Фабрика корутины, выполняющей запрос.
+        :return: Результат func.
+        """
+        call = self.__calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self.__calls[key] = call
+            call.task.add_done_callback(lambda _: self.__forget(key, call))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                call.task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Количество выполняемых запросов.
+
+        :return: Количество запросов.
+        """
+        return len(self.__calls)
+
+    def __forget(self, key: Hashable, call: _Call) -> None:
+        """
+        Уберёт завершённый запрос, чтобы следующий запрос с тем же ключом выполнился заново.
+
+        :param key: Ключ запроса.
+        :param call: Завершённый запрос.
+        :return: None.
+        """
+        if self.__calls.get(key) is call:
+            del self.__calls[key]
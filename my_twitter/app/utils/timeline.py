@@ -0,0 +1,296 @@
+import heapq
+from datetime import datetime
+from itertools import groupby, islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from app.database.database import Database
+from app.database.models import Subscriptions, Timeline, Tweet, User
+from app.settings.classes import Settings
+from sqlalchemy import (
+    CompoundSelect,
+    Select,
+    delete,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+# Сколько последних твитов автора попадёт в ленту при подписке на него.
+TIMELINE_BACKFILL_LIMIT = 100
+
+TIMELINE_COLUMNS = ["user_id", "tweet_id", "author_id", "created"]
+
+
+def insert_timelines_ignore_duplicates(
+    session: AsyncSession,
+) -> PostgresqlInsert | SqliteInsert:
+    """
+    Функция вернёт INSERT в таблицу timelines с ON CONFLICT DO NOTHING
+    по уникальному ограничению timeline_user_id_tweet_id для диалекта БД сессии.
+    Для SQLite используется sqlite_insert, для остальных (PostgreSQL) - postgresql_insert.
+
+    :param session: AsyncSession.
+    :return: Insert.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Timeline).on_conflict_do_nothing(
+            index_elements=[Timeline.user_id, Timeline.tweet_id]
+        )
+    return postgresql_insert(Timeline).on_conflict_do_nothing(
+        constraint="timeline_user_id_tweet_id"
+    )
+
+
+async def fan_out_tweet(
+    db: Database, settings: Settings, tweet_id: int, author_id: int, created: datetime
+) -> None:
+    """
+    Функция разносит твит по домашним лентам подписчиков автора и самого автора (fan-out on write).
+    Выполняется одним запросом INSERT ... SELECT, поэтому подписчики не загружаются в память.
+    Запускается фоновой задачей после ответа на создание твита.
+
+    Если у автора подписчиков больше settings.FAN_OUT_PULL_THRESHOLD, то твит попадёт только в ленту автора,
+    а подписчики получат его при чтении ленты (см. get_timeline_tweets).
+
+    :param db: Инструмент работы с БД.
+    :param settings: Настройки приложения.
+    :param tweet_id: ID твита.
+    :param author_id: ID автора твита.
+    :param created: Дата и время создания твита.
+    :return: None.
+    """
+    author = select(
+        literal(author_id), literal(tweet_id), literal(author_id), literal(created)
+    )
+    async with db.get_sessionmaker() as session:
+        followers_count_q = await session.execute(
+            select(User.followers_count).where(User.id == author_id)
+        )
+        rows: Select[int, int, int, datetime] | CompoundSelect[int, int, int, datetime]
+        if followers_count_q.scalar_one() > settings.FAN_OUT_PULL_THRESHOLD:
+            rows = author
+        else:
+            followers = select(
+                Subscriptions.user_id,
+                literal(tweet_id),
+                literal(author_id),
+                literal(created),
+            ).where(Subscriptions.follower_id == author_id)
+            rows = union_all(followers, author)
+        await session.execute(
+            insert_timelines_ignore_duplicates(session).from_select(
+                TIMELINE_COLUMNS, rows
+            )
+        )
+        await session.commit()
+
+
+async def get_timeline_tweets(
+    session: AsyncSession,
+    settings: Settings,
+    user_id: int,
+    limit: int,
+    cursor: Optional[Sequence[Any]] = None,
+) -> List[Tweet]:
+    """
+    Функция вернёт страницу домашней ленты пользователя.
+
+    Страница собирается k-way слиянием (heapq.merge) отсортированных по (created, id) потоков:
+    материализованной ленты (push-авторы) и последних твитов каждого pull-автора,
+    на которого подписан пользователь. Каждый поток читается ограниченным проходом по индексу.
+
+    :param session: AsyncSession.
+    :param settings: Настройки приложения.
+    :param user_id: ID владельца ленты.
+    :param limit: Лимит на страницу.
+    :param cursor: Значения (created, id) последнего твита предыдущей страницы.
+    :return: Список твитов в порядке ленты (лайки не загружены, см. load_likes_preview).
+    """
+    pushed_query = (
+        select(Timeline.created, Timeline.tweet_id)
+        .where(Timeline.user_id == user_id)
+        .order_by(Timeline.created.desc(), Timeline.tweet_id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        pushed_query = pushed_query.where(
+            tuple_(Timeline.created, Timeline.tweet_id) < tuple_(*cursor)
+        )
+    pushed_q = await session.execute(pushed_query)
+    streams: List[Iterable[Any]] = [pushed_q.all()]
+
+    pull_authors_q = await session.execute(
+        select(User.id)
+        .join(Subscriptions, Subscriptions.follower_id == User.id)
+        .where(
+            Subscriptions.user_id == user_id,
+            User.followers_count > settings.FAN_OUT_PULL_THRESHOLD,
+        )
+    )
+    pull_authors = pull_authors_q.scalars().all()
+    if pull_authors:
+        pulled_q = await session.execute(
+            union_all(
+                *(
+                    _author_tweets(author_id, limit, cursor)
+                    for author_id in pull_authors
+                )
+            )
+        )
+        streams.extend(
+            list(rows)
+            for _, rows in groupby(pulled_q.all(), key=lambda row: row.user_id)
+        )
+
+    tweet_ids = list(islice(_merge(streams), limit))
+    if not tweet_ids:
+        return []
+    tweets_q = await session.execute(
+        select(Tweet).where(Tweet.id.in_(tweet_ids)).options(raiseload(Tweet.likes))
+    )
+    tweets = {tweet.id: tweet for tweet in tweets_q.scalars().all()}
+    return [tweets[tweet_id] for tweet_id in tweet_ids if tweet_id in tweets]
+
+
+def _author_tweets(author_id: int, limit: int, cursor: Optional[Sequence[Any]]) -> Any:
+    """
+    Запрос последних твитов автора (проход по индексу ix_tweets_user_id_created_id).
+
+    :param author_id: ID автора.
+    :param limit: Лимит.
+    :param cursor: Значения (created, id), с которых начинается страница.
+    :return: Select.
+    """
+    query = (
+        select(Tweet.created, Tweet.id.label("tweet_id"), Tweet.user_id)
+        .where(Tweet.user_id == author_id)
+        .order_by(Tweet.created.desc(), Tweet.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(tuple_(Tweet.created, Tweet.id) < tuple_(*cursor))
+    subquery = query.subquery()
+    return select(subquery.c.created, subquery.c.tweet_id, subquery.c.user_id)
+
+
+def _merge(streams: Iterable[Iterable[Any]]) -> Iterator[int]:
+    """
+    K-way слияние потоков строк (created, tweet_id), отсортированных по убыванию.
+    Твит, попавший в несколько потоков, вернётся один раз.
+
+    :param streams: Потоки строк.
+    :return: Итератор ID твитов.
+    """
+    seen = set()
+    for row in heapq.merge(
+        *streams, key=lambda row: (row.created, row.tweet_id), reverse=True
+    ):
+        if row.tweet_id not in seen:
+            seen.add(row.tweet_id)
+            yield row.tweet_id
+
+
+async def backfill_timeline(
+    session: AsyncSession, user_id: int, author_id: int
+) -> None:
+    """
+    Функция добавит в ленту пользователя последние твиты автора, на которого он подписался.
+    Вызывается только для push-авторов: твиты pull-авторов подмешиваются при чтении ленты.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param user_id: ID владельца ленты.
+    :param author_id: ID автора.
+    :return: None.
+    """
+    last_tweets = (
+        select(literal(user_id), Tweet.id, Tweet.user_id, Tweet.created)
+        .where(Tweet.user_id == author_id)
+        .order_by(Tweet.created.desc(), Tweet.id.desc())
+        .limit(TIMELINE_BACKFILL_LIMIT)
+    )
+    await session.execute(
+        insert_timelines_ignore_duplicates(session).from_select(
+            TIMELINE_COLUMNS, last_tweets
+        )
+    )
+
+
+async def backfill_followers_timelines(db: Database, author_id: int) -> None:
+    """
+    Функция добавит последние твиты автора в ленты всех его подписчиков.
+    Запускается фоновой задачей, когда число подписчиков автора опустилось до
+    settings.FAN_OUT_PULL_THRESHOLD и он перешёл из pull-режима в push-режим:
+    твиты, опубликованные в pull-режиме, не были разнесены по лентам и иначе пропали бы из них.
+    Уже разнесённые твиты пропускаются (ON CONFLICT DO NOTHING).
+
+    :param db: Инструмент работы с БД.
+    :param author_id: ID автора.
+    :return: None.
+    """
+    last_tweets = (
+        select(Tweet.id, Tweet.user_id, Tweet.created)
+        .where(Tweet.user_id == author_id)
+        .order_by(Tweet.created.desc(), Tweet.id.desc())
+        .limit(TIMELINE_BACKFILL_LIMIT)
+        .subquery()
+    )
+    rows = select(
+        Subscriptions.user_id,
+        last_tweets.c.id,
+        last_tweets.c.user_id,
+        last_tweets.c.created,
+    ).join(last_tweets, Subscriptions.follower_id == last_tweets.c.user_id)
+    async with db.get_sessionmaker() as session:
+        await session.execute(
+            insert_timelines_ignore_duplicates(session).from_select(
+                TIMELINE_COLUMNS, rows
+            )
+        )
+        await session.commit()
+
+
+async def remove_author_from_timeline(
+    session: AsyncSession, user_id: int, author_id: int
+) -> None:
+    """
+    Функция удалит из ленты пользователя твиты автора, от которого он отписался.
+    Коммит остаётся за вызывающим кодом.
+
+    :param session: AsyncSession.
+    :param user_id: ID владельца ленты.
+    :param author_id: ID автора.
+    :return: None.
+    """
+    await session.execute(
+        delete(Timeline).where(
+            Timeline.user_id == user_id, Timeline.author_id == author_id
+        )
+    )
+
+
+async def rebuild_timelines(session: AsyncSession) -> None:
+    """
+    Функция полностью перестраивает домашние ленты всех пользователей по таблицам tweets и subscriptions.
+    Используется для первичного заполнения после миграции.
+
+    :param session: AsyncSession.
+    :return: None.
+    """
+    await session.execute(delete(Timeline))
+    followers = select(
+        Subscriptions.user_id, Tweet.id, Tweet.user_id, Tweet.created
+    ).join(Subscriptions, Subscriptions.follower_id == Tweet.user_id)
+    authors = select(Tweet.user_id, Tweet.id, Tweet.user_id, Tweet.created)
+    await session.execute(
+        insert(Timeline).from_select(TIMELINE_COLUMNS, union_all(followers, authors))
+    )
+    await session.commit()
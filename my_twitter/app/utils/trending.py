@@ -0,0 +1,221 @@
+import heapq
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.database.database import Database
+from app.database.models import Hashtag, Tweet, TweetHashtag
+from app.routers.app_routers.schemas.trending import (
+    OutTrendingSchema,
+    TrendingHashtagSchema,
+    TrendingTweetSchema,
+)
+from app.settings.classes import Settings
+from sqlalchemy import select
+
+
+class SlidingCounter[K: Hashable]:
+    """
+    Счётчик событий в скользящем окне с экспоненциальным затуханием.
+
+    События складываются в корзины по bucket_s секунд, корзины старше окна (buckets корзин) отбрасываются.
+    Вес корзины при подсчёте - 0.5 ** (возраст / half_life_s), поэтому свежие события важнее старых,
+    а стоимость добавления события не зависит от их количества.
+    """
+
+    def __init__(self, bucket_s: int, buckets: int, half_life_s: float) -> None:
+        self.__bucket_s = bucket_s
+        self.__buckets_count = buckets
+        self.__half_life_s = half_life_s
+        self.__buckets: Dict[int, Counter[K]] = defaultdict(Counter)
+
+    def clear(self) -> None:
+        """
+        Удалит все события.
+
+        :return: None.
+        """
+        self.__buckets.clear()
+
+    def add(self, key: K, ts: float, weight: int = 1) -> None:
+        """
+        Добавит событие.
+
+        :param key: Ключ (хэштег, ID твита).
+        :param ts: Время события (unix time).
+        :param weight: Вес события (отрицательный - отмена).
+        :return: None.
+        """
+        self.__buckets[int(ts // self.__bucket_s)][key] += weight
+
+    def discard(self, key: K) -> None:
+        """
+        Удалит все события ключа.
+
+        :param key: Ключ (хэштег, ID твита).
+        :return: None.
+        """
+        for counter in self.__buckets.values():
+            counter.pop(key, None)
+
+    def top(self, k: int, now: float) -> List[Tuple[K, float]]:
+        """
+        Вернёт k ключей с наибольшим затухающим счётом в окне (ключи со счётом <= 0 пропускаются).
+
+        :param k: Количество ключей.
+        :param now: Текущее время (unix time).
+        :return: Список (ключ, счёт) по убыванию счёта.
+        """
+        current = int(now // self.__bucket_s)
+        for index in [i for i in self.__buckets if i <= current - self.__buckets_count]:
+            del self.__buckets[index]
+        scores: Dict[K, float] = defaultdict(float)
+        for index, counter in self.__buckets.items():
+            age = max(current - index, 0) * self.__bucket_s
+            decay = 0.5 ** (age / self.__half_life_s)
+            for key, count in counter.items():
+                scores[key] += count * decay
+        return heapq.nlargest(
+            k,
+            ((key, score) for key, score in scores.items() if score > 0),
+            key=itemgetter(1),
+        )
+
+
+class TrendingEngine:
+    """
+    Тренды: хэштеги, которые чаще всего используют в новых твитах, и твиты, которые чаще всего лайкают,
+    за последние settings.TRENDING_WINDOW_S секунд (SlidingCounter).
+
+    Счётчики живут в памяти процесса и пополняются событиями создания твита и лайка
+    (удаление твита убирает его лайки и хэштеги), при запуске приложения восстанавливаются из БД (rebuild). Ответ /trending - готовые JSON-байты,
+    которые пересчитываются не чаще раза в settings.TRENDING_REFRESH_S секунд,
+    поэтому запрос не обращается к БД и не сортирует счётчики.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.__top = settings.TRENDING_TOP
+        self.__refresh_s = settings.TRENDING_REFRESH_S
+        self.__window_s = settings.TRENDING_WINDOW_S
+        buckets = -(-settings.TRENDING_WINDOW_S // settings.TRENDING_BUCKET_S)
+        self.__hashtags: SlidingCounter[str] = SlidingCounter(
+            settings.TRENDING_BUCKET_S, buckets, settings.TRENDING_HALF_LIFE_S
+        )
+        self.__tweets: SlidingCounter[int] = SlidingCounter(
+            settings.TRENDING_BUCKET_S, buckets, settings.TRENDING_HALF_LIFE_S
+        )
+        self.__snapshot: Optional[bytes] = None
+        self.__snapshot_at = 0.0
+
+    def add_tweet(
+        self, tags: Iterable[Tuple[str, str]], ts: Optional[float] = None
+    ) -> None:
+        """
+        Учтёт новый твит: каждый его хэштег (упоминания не учитываются) получает +1.
+
+        :param tags: Теги твита (extract_tags).
+        :param ts: Время события (по умолчанию сейчас).
+        :return: None.
+        """
+        ts = time.time() if ts is None else ts
+        for kind, tag in tags:
+            if kind == "#":
+                self.__hashtags.add(tag, ts)
+
+    def add_like(
+        self, tweet_id: int, weight: int = 1, ts: Optional[float] = None
+    ) -> None:
+        """
+        Учтёт лайк (weight=1) или дизлайк (weight=-1) твита.
+
+        :param tweet_id: ID твита.
+        :param weight: Вес события.
+        :param ts: Время события (по умолчанию сейчас).
+        :return: None.
+        """
+        self.__tweets.add(tweet_id, time.time() if ts is None else ts, weight)
+
+    def delete_tweet(
+        self, tweet_id: int, tags: Iterable[Tuple[str, str]], ts: float
+    ) -> None:
+        """
+        Уберёт удалённый твит: его лайки и хэштеги (событие создания с временем ts) больше не учитываются.
+        Снимок сбрасывается, чтобы твит сразу пропал из ответа.
+
+        :param tweet_id: ID твита.
+        :param tags: Теги твита (extract_tags).
+        :param ts: Время создания твита (unix time).
+        :return: None.
+        """
+        self.__tweets.discard(tweet_id)
+        for kind, tag in tags:
+            if kind == "#":
+                self.__hashtags.add(tag, ts, -1)
+        self.__snapshot = None
+
+    def get_json(self, now: Optional[float] = None) -> bytes:
+        """
+        Вернёт тренды в формате OutTrendingSchema (JSON-байты).
+        Снимок пересчитывается, если он старше settings.TRENDING_REFRESH_S секунд.
+
+        :param now: Текущее время (по умолчанию сейчас).
+        :return: JSON-байты.
+        """
+        now = time.time() if now is None else now
+        if self.__snapshot is None or now - self.__snapshot_at >= self.__refresh_s:
+            self.__snapshot = self.__build(now)
+            self.__snapshot_at = now
+        return self.__snapshot
+
+    def __build(self, now: float) -> bytes:
+        """
+        Соберёт снимок трендов.
+
+        :param now: Текущее время.
+        :return: JSON-байты.
+        """
+        return (
+            OutTrendingSchema(
+                hashtags=[
+                    TrendingHashtagSchema(tag=tag, score=round(score, 3))
+                    for tag, score in self.__hashtags.top(self.__top, now)
+                ],
+                tweets=[
+                    TrendingTweetSchema(id=tweet_id, score=round(score, 3))
+                    for tweet_id, score in self.__tweets.top(self.__top, now)
+                ],
+            )
+            .model_dump_json()
+            .encode()
+        )
+
+    async def rebuild(self, db: Database) -> None:
+        """
+        Заново заполнит счётчики по твитам из окна: хэштеги - по обратному индексу tweet_hashtags,
+        лайки - по like_count твитов. У лайков нет времени, поэтому они учитываются на момент
+        создания твита.
+
+        :param db: Database.
+        :return: None.
+        """
+        since = datetime.now() - timedelta(seconds=self.__window_s)
+        self.__hashtags.clear()
+        self.__tweets.clear()
+        async with db.get_sessionmaker() as session:
+            hashtags_q = await session.execute(
+                select(Hashtag.tag, TweetHashtag.created)
+                .join(Hashtag, Hashtag.id == TweetHashtag.hashtag_id)
+                .where(TweetHashtag.created >= since, Hashtag.kind == "#")
+            )
+            for tag, created in hashtags_q:
+                self.__hashtags.add(tag, created.timestamp())
+            tweets_q = await session.execute(
+                select(Tweet.id, Tweet.created, Tweet.like_count).where(
+                    Tweet.created >= since, Tweet.like_count > 0
+                )
+            )
+            for tweet_id, created, like_count in tweets_q:
+                self.__tweets.add(tweet_id, created.timestamp(), like_count)
+        self.__snapshot = None
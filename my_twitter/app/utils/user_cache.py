@@ -0,0 +1,110 @@
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from app.database.models import User
+from sqlalchemy import event
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """
+    Облегчённая запись о пользователе для идентификации по api_key (без связей).
+    """
+
+    id: int
+    api_key: str
+
+
+class UserCache:
+    """
+    In-process кэш пользователей по api_key с ограничением по времени жизни (TTL) и размеру (LRU).
+
+    Для неизвестного api_key хранится отрицательная запись (None),
+    поэтому повторные запросы с таким ключом не идут в БД до истечения TTL.
+    Запись содержит только id и api_key, которые не меняются при подписке/отписке,
+    поэтому она сбрасывается только при удалении пользователя через ORM.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__entries: OrderedDict[str, Tuple[float, Optional[UserIdentity]]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def get(self, api_key: str) -> Tuple[bool, Optional[UserIdentity]]:
+        """
+        Вернёт запись по api_key.
+
+        :param api_key: API key пользователя.
+        :return: (True, запись) - если запись есть в кэше (None - ключ неизвестен), иначе (False, None).
+        """
+        entry = self.__entries.get(api_key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.__entries[api_key]
+            self.misses += 1
+            return False, None
+        self.__entries.move_to_end(api_key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, api_key: str, identity: Optional[UserIdentity]) -> None:
+        """
+        Сохранит запись по api_key, вытеснив самую давно использованную при переполнении.
+
+        :param api_key: API key пользователя.
+        :param identity: Запись о пользователе или None, если такого api_key нет.
+        :return: None.
+        """
+        if self.__max_size <= 0:
+            return
+        self.__entries[api_key] = (time.monotonic() + self.__ttl, identity)
+        self.__entries.move_to_end(api_key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self, api_key: str) -> None:
+        """
+        Удалит запись по api_key.
+
+        :param api_key: API key пользователя.
+        :return: None.
+        """
+        self.__entries.pop(api_key, None)
+
+    def clear(self) -> None:
+        """
+        Очистит кэш.
+
+        :return: None.
+        """
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+# Все кэши процесса, чтобы сбросить запись удалённого пользователя в каждом из них.
+_caches: "weakref.WeakSet[UserCache]" = weakref.WeakSet()
+
+
+@event.listens_for(User, "after_delete")
+def invalidate_deleted_user(mapper: Any, connection: Any, target: User) -> None:
+    """
+    Сбросит записи удалённого пользователя во всех кэшах процесса.
+    Массовое удаление (delete(User)) события не вызывает, такие записи живут до истечения TTL.
+
+    :param mapper: Mapper.
+    :param connection: Connection.
+    :param target: Удалённый пользователь.
+    :return: None.
+    """
+    for cache in _caches:
+        cache.invalidate(target.api_key)
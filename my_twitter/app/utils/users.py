@@ -0,0 +1,104 @@
+from typing import Optional, Union
+
+from app.database.database import Database
+from app.database.models import User
+from app.routers.app_routers.schemas.users import (
+    OutUserSchema,
+    ProfileUserSchema,
+    UserSchema,
+)
+from app.utils.etag import ProfileVersions, etag_matches, make_etag, not_modified
+from app.utils.single_flight import SingleFlight
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import subqueryload, undefer
+
+
+async def get_user_profile(
+    session: AsyncSession, user_id: int, include_lists: bool
+) -> Union[UserSchema, ProfileUserSchema]:
+    """
+    Функция вернёт профиль пользователя по id.
+
+    По умолчанию профиль читается одним запросом: followers_count хранится в users,
+    following_count считается подзапросом по индексу подписок, списки не загружаются.
+    Полные списки подписчиков и подписок загружаются только при include_lists.
+
+    :param session: AsyncSession.
+    :param user_id: ID пользователя.
+    :param include_lists: Загрузить полные списки подписчиков и подписок.
+    :return: UserSchema, если include_lists, иначе ProfileUserSchema.
+    """
+    query = (
+        select(User).where(User.id == user_id).options(undefer(User.following_count))
+    )
+    if include_lists:
+        query = query.options(
+            subqueryload(User.my_subscribers), subqueryload(User.my_subscriptions)
+        )
+    user_q = await session.execute(query)
+    user = user_q.scalars().one()
+    if include_lists:
+        return UserSchema.model_validate(user)
+    return ProfileUserSchema.model_validate(user)
+
+
+async def get_user_profile_response(
+    db: Database,
+    single_flight: SingleFlight,
+    profile_versions: ProfileVersions,
+    user_id: int,
+    include_lists: bool,
+    if_none_match: Optional[str],
+) -> Response:
+    """
+    Функция вернёт ответ с профилем пользователя и ETag по версии профиля.
+    Если If-None-Match совпадает с текущим ETag, то вернётся 304 без загрузки профиля.
+
+    :param db: Database.
+    :param single_flight: Объединение одинаковых одновременных запросов.
+    :param profile_versions: Счётчики версий профилей.
+    :param user_id: ID пользователя.
+    :param include_lists: Загрузить полные списки подписчиков и подписок.
+    :param if_none_match: ETag предыдущего ответа.
+    :return: Response с OutUserSchema (или 304).
+    """
+    version = profile_versions.get(user_id)
+    etag = make_etag("user", user_id, int(include_lists), version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    body = await get_user_profile_json(
+        db, single_flight, user_id, include_lists, version
+    )
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+async def get_user_profile_json(
+    db: Database,
+    single_flight: SingleFlight,
+    user_id: int,
+    include_lists: bool,
+    version: int = 0,
+) -> bytes:
+    """
+    Функция вернёт JSON-байты OutUserSchema с профилем пользователя.
+    Одновременные запросы одного профиля объединяются: выполняется один запрос к БД и одна сериализация.
+
+    :param db: Database.
+    :param single_flight: Объединение одинаковых одновременных запросов.
+    :param user_id: ID пользователя.
+    :param include_lists: Загрузить полные списки подписчиков и подписок.
+    :param version: Версия профиля (ProfileVersions): запрос, начатый до изменения профиля,
+        не объединяется с запросами после него.
+    :return: JSON-байты OutUserSchema.
+    """
+
+    async def build_profile() -> bytes:
+        async with db.get_sessionmaker() as session:
+            user = await get_user_profile(session, user_id, include_lists)
+        return OutUserSchema(user=user).model_dump_json().encode()
+
+    return await single_flight.do(
+        ("user", user_id, include_lists, version), build_profile
+    )
@@ -2,19 +2,31 @@ import asyncio
 import os
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Type
+from typing import TYPE_CHECKING, Any, Dict, Type
 from urllib.parse import urljoin
 
 import aiofiles
-from app.application.classes import CustomFastApi
 from app.database.database import Database
 from app.database.models import User
 from app.settings.classes import Settings
+from app.utils.etag import ProfileVersions
+from app.utils.feed_cache import FeedCache
+from app.utils.follow_graph import FollowGraph
+from app.utils.like_buffer import LikeBuffer
+from app.utils.popularity import PopularityUpdater
+from app.utils.single_flight import SingleFlight
+from app.utils.user_cache import UserCache, UserIdentity
 from fastapi import HTTPException, Request, UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import subqueryload
 
+if TYPE_CHECKING:
+    # Только для аннотаций: приложение и рассылка событий сами импортируют модули, зависящие от utils.
+    from app.application.classes import CustomFastApi
+    from app.utils.event_hub import EventHub
+    from app.utils.trending import TrendingEngine
+
 
 class ImageManager:
     """
@@ -26,7 +38,7 @@ class ImageManager:
     def __init__(
         self,
         settings: Settings,
-        user: User,
+        user_id: int,
         image: UploadFile,
     ):
         if image.content_type not in self.__ALLOWED_MIME_TYPES:
@@ -43,7 +55,7 @@ class ImageManager:
         extension = filename_list[-1]
         filename = ".".join([str(uuid.uuid4()), extension])
         self.__file_path = os.path.join(
-            settings.IMAGES_FOLDER_NAME, str(user.id), filename
+            settings.IMAGES_FOLDER_NAME, str(user_id), filename
         )
         self.__abs_file_path = settings.MEDIA_FOLDER_ROOT / self.__file_path
 
@@ -93,12 +105,21 @@ def get_image_url(file_path: str, settings: Settings) -> str:
     """
 
     normalized_path = os.path.normpath(file_path).replace("\\", "/").strip("/")
-    media_url = (
+    return urljoin(get_media_url(settings), normalized_path)
+
+
+def get_media_url(settings: Settings) -> str:
+    """
+    Функция возвращает url папки медиа-файлов (всегда со слэшем в конце).
+
+    :param settings: Settings.
+    :return: str
+    """
+    return (
         settings.MEDIA_URL
         if settings.MEDIA_URL.endswith("/")
         else settings.MEDIA_URL + "/"
     )
-    return urljoin(media_url, normalized_path)
 
 
 async def save_file(file_path: Path, file: UploadFile) -> None:
@@ -189,6 +210,42 @@ async def get_user_or_test_user(
     return user
 
 
+async def get_user_identity(
+    session: AsyncSession, settings: Settings, user_cache: UserCache, api_key: str
+) -> UserIdentity:
+    """
+    Вернёт облегчённую запись о пользователе с заданным api_key (без загрузки связей).
+    Если такого пользователя нет, то вернёт запись тестового пользователя.
+
+    Сначала проверяется кэш, при промахе выполняется один запрос сразу по api_key и ключу тестового пользователя.
+    Неизвестный api_key кэшируется как отрицательная запись.
+
+    :param session: AsyncSession.
+    :param settings: Settings.
+    :param user_cache: Кэш пользователей по api_key.
+    :param api_key: Api_key пользователя.
+    :return: UserIdentity.
+    """
+    test_api_key = settings.TEST_USER.api_key
+    found, identity = user_cache.get(api_key)
+    if found and identity is not None:
+        return identity
+    if found:
+        found, identity = user_cache.get(test_api_key)
+        if found and identity is not None:
+            return identity
+    users_q = await session.execute(
+        select(User.id, User.api_key).where(User.api_key.in_([api_key, test_api_key]))
+    )
+    identities = {
+        row.api_key: UserIdentity(id=row.id, api_key=row.api_key) for row in users_q
+    }
+    user_cache.set(api_key, identities.get(api_key))
+    if test_api_key in identities:
+        user_cache.set(test_api_key, identities[test_api_key])
+    return identities.get(api_key) or identities[test_api_key]
+
+
 async def delete_img_file(*file_path: str, settings: Settings) -> None:
     """
     Функция удаляет файлы по переданным путям с учётом настроек.
@@ -214,30 +271,6 @@ async def delete_file_async(file_path: Path) -> None:
         pass
 
 
-async def get_user_with_apikey_and_user_with_id(
-    session: AsyncSession, api_key: str, user_id: int, settings: Settings
-) -> tuple[User, User]:
-    """
-    Функция вернёт 2 пользователей, одного текущего,
-    по api-key (если такого нет, вернёт тестового пользователя из-за особенности фронта),
-    второго по его id.
-
-    :param session: AsyncSession.
-    :param api_key: API key пользователя.
-    :param user_id: ID пользователя.
-    :param settings: Settings.
-    :return: (API key пользователь, ID пользователь)
-    """
-    user_api = await get_user_or_test_user(session, settings, api_key)
-    another_user_q = await session.execute(
-        select(User)
-        .where(User.id == user_id)
-        .options(subqueryload(User.my_subscribers), subqueryload(User.my_subscriptions))
-    )
-    another_user = another_user_q.scalars().one()
-    return user_api, another_user
-
-
 def get_database(request: Request) -> Database:
     """
     Возвращает инструмент работы с ДБ.
@@ -258,3 +291,102 @@ def get_settings(request: Request) -> Settings:
     """
     app: CustomFastApi = request.app
     return app.get_settings()
+
+
+def get_like_buffer(request: Request) -> LikeBuffer:
+    """
+    Возвращает буфер лайков с отложенной записью.
+
+    :param request: Request.
+    :return: LikeBuffer.
+    """
+    app: CustomFastApi = request.app
+    return app.get_like_buffer()
+
+
+def get_user_cache(request: Request) -> UserCache:
+    """
+    Возвращает кэш пользователей по api_key.
+
+    :param request: Request.
+    :return: UserCache.
+    """
+    app: CustomFastApi = request.app
+    return app.get_user_cache()
+
+
+def get_follow_graph(request: Request) -> FollowGraph:
+    """
+    Возвращает граф подписок в памяти.
+
+    :param request: Request.
+    :return: FollowGraph.
+    """
+    app: CustomFastApi = request.app
+    return app.get_follow_graph()
+
+
+def get_feed_cache(request: Request) -> FeedCache:
+    """
+    Возвращает кэш страниц общей ленты.
+
+    :param request: Request.
+    :return: FeedCache.
+    """
+    app: CustomFastApi = request.app
+    return app.get_feed_cache()
+
+
+def get_single_flight(request: Request) -> SingleFlight:
+    """
+    Возвращает объединение одинаковых одновременных запросов.
+
+    :param request: Request.
+    :return: SingleFlight.
+    """
+    app: CustomFastApi = request.app
+    return app.get_single_flight()
+
+
+def get_event_hub(request: Request) -> "EventHub":
+    """
+    Возвращает рассылку событий ленты (SSE).
+
+    :param request: Request.
+    :return: EventHub.
+    """
+    app: CustomFastApi = request.app
+    return app.get_event_hub()
+
+
+def get_profile_versions(request: Request) -> ProfileVersions:
+    """
+    Возвращает счётчики версий профилей пользователей (для ETag).
+
+    :param request: Request.
+    :return: ProfileVersions.
+    """
+    app: CustomFastApi = request.app
+    return app.get_profile_versions()
+
+
+def get_trending(request: Request) -> "TrendingEngine":
+    """
+    Возвращает тренды (хэштеги и твиты).
+
+    :param request: Request.
+    :return: TrendingEngine.
+    """
+    app: CustomFastApi = request.app
+    return app.get_trending()
+
+
+def get_popularity(request: Request) -> PopularityUpdater:
+    """
+    Возвращает фоновый пересчёт оценок популярности твитов.
+
+    :param request: Request.
+    :return: PopularityUpdater.
+    """
+    app: CustomFastApi = request.app
+    return app.get_popularity()
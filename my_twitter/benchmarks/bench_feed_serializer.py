@@ -0,0 +1,130 @@
+"""
+Микробенчмарк сериализации страницы общей ленты.
+
+Для каждого размера страницы уже загруженные данные сериализуются двумя способами:
+- pydantic: OutTweet.model_validate + set_settings + model_dump_json (ORM-объекты);
+- fast: serialize_feed_page из Core-строк (orjson, если установлен).
+Запросы к БД в замер не входят, отдельно замеряется полный путь load + serialize.
+
+Запуск (из папки my_twitter):
+    python -m benchmarks.bench_feed_serializer
+    python -m benchmarks.bench_feed_serializer --sizes 10 50 100 500 --repeat 200
+"""
+
+import argparse
+import asyncio
+from typing import List, Sequence
+
+from app.database.models import Attachment, Like, Tweet, User
+from app.utils import feed_serializer
+from app.utils.feed import (
+    get_feed_response,
+    load_feed_json,
+    load_feed_rows,
+    load_feed_tweets,
+)
+from app.utils.feed_serializer import FeedRows, serialize_feed_page
+from benchmarks.utils import create_bench_app, get_bench_settings, measure, print_table
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Количество пользователей (авторов и лайкающих).
+USERS = 100
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--likes", type=int, default=10, help="Лайков на твит.")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    settings = get_bench_settings(args.db_url)
+    _, db = await create_bench_app(settings)
+    tweets = max(args.sizes)
+    async with db.get_sessionmaker() as session:
+        await session.execute(
+            insert(User),
+            [
+                dict(
+                    first_name="Имя", middle_name=None, surname=str(i), api_key=f"k{i}"
+                )
+                for i in range(1, USERS + 1)
+            ],
+        )
+        await session.execute(
+            insert(Tweet),
+            [
+                dict(user_id=i % USERS + 1, content=f"Твит №{i}", like_count=args.likes)
+                for i in range(1, tweets + 1)
+            ],
+        )
+        await session.execute(
+            insert(Like),
+            [
+                dict(tweet_id=tweet_id, user_id=user_id)
+                for tweet_id in range(1, tweets + 1)
+                for user_id in range(1, args.likes + 1)
+            ],
+        )
+        await session.execute(
+            insert(Attachment),
+            [
+                dict(tweet_id=tweet_id, image_path=f"images/{tweet_id}.png")
+                for tweet_id in range(1, tweets + 1)
+            ],
+        )
+        await session.commit()
+
+    results: List[List[object]] = []
+    for size in args.sizes:
+        async with db.get_sessionmaker() as session:
+            orm_tweets = await load_feed_tweets(session, settings, 1, size, None, True)
+            rows = await load_feed_rows(session, settings, 1, size, None, True)
+
+            # Значения текущей итерации привязываются через аргументы по умолчанию.
+            async def pydantic(
+                orm_tweets: Sequence[Tweet] = orm_tweets, size: int = size
+            ) -> None:
+                get_feed_response(settings, orm_tweets, size).model_dump_json().encode()
+
+            async def fast(rows: FeedRows = rows, size: int = size) -> None:
+                serialize_feed_page(settings, rows, size)
+
+            async def pydantic_full(
+                session: AsyncSession = session, size: int = size
+            ) -> None:
+                page = await load_feed_tweets(session, settings, 1, size, None, True)
+                get_feed_response(settings, page, size).model_dump_json().encode()
+
+            async def fast_full(
+                session: AsyncSession = session, size: int = size
+            ) -> None:
+                await load_feed_json(session, settings, 1, size, None, True)
+
+            pydantic_stats = await measure(pydantic, args.repeat)
+            fast_stats = await measure(fast, args.repeat)
+            pydantic_full_stats = await measure(pydantic_full, args.repeat)
+            fast_full_stats = await measure(fast_full, args.repeat)
+        results.append(
+            [
+                size,
+                pydantic_stats["p50"],
+                fast_stats["p50"],
+                pydantic_stats["p50"] / fast_stats["p50"],
+                pydantic_full_stats["p50"],
+                fast_full_stats["p50"],
+            ]
+        )
+    await db.get_engine().dispose()
+    print_table(
+        "Сериализация страницы ленты, p50, мс "
+        f"(orjson: {'да' if feed_serializer.HAS_ORJSON else 'нет'})",
+        ["page", "pydantic", "fast", "speedup", "pydantic+load", "fast+load"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+Бенчмарк подписки и отписки при росте количества подписок пользователя.
+
+Для каждого размера графа пользователь подписан на follows авторов
+и сам имеет follows подписчиков, после чего замеряется задержка
+подписки на нового автора и отписки от него.
+
+Запуск (из папки my_twitter):
+    python -m benchmarks.bench_follow
+    python -m benchmarks.bench_follow --sizes 1000 10000 100000 --repeat 200
+    python -m benchmarks.bench_follow --db-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+from typing import List
+
+from app.database.models import Subscriptions, User
+from app.utils.counters import reconcile_counters
+from benchmarks.utils import (
+    create_bench_app,
+    get_bench_settings,
+    get_client,
+    measure,
+    print_table,
+)
+from sqlalchemy import insert
+
+# Пачка строк на один INSERT при заполнении БД.
+CHUNK = 10000
+
+
+async def run_case(db_url: str, follows: int, args: argparse.Namespace) -> List[object]:
+    """
+    Прогон одного размера графа.
+
+    :param db_url: URL базы данных.
+    :param follows: Количество подписок и подписчиков пользователя.
+    :param args: Аргументы командной строки.
+    :return: Строка таблицы результатов.
+    """
+    app, db = await create_bench_app(get_bench_settings(db_url))
+    # Пользователь 1 - основной, 2..follows+1 - его подписки и подписчики,
+    # follows+2.. - авторы, на которых он подписывается во время замера.
+    users = follows + 1 + args.repeat
+    async with db.get_sessionmaker() as session:
+        for start in range(0, users, CHUNK):
+            await session.execute(
+                insert(User),
+                [
+                    dict(first_name="u", surname=str(i), api_key=f"key_{i}")
+                    for i in range(start + 1, min(start + CHUNK, users) + 1)
+                ],
+            )
+        for start in range(2, follows + 2, CHUNK):
+            ids = range(start, min(start + CHUNK, follows + 2))
+            await session.execute(
+                insert(Subscriptions),
+                [dict(user_id=1, follower_id=user_id) for user_id in ids]
+                + [dict(user_id=user_id, follower_id=1) for user_id in ids],
+            )
+        await session.commit()
+        await reconcile_counters(session)
+
+    client = get_client(app)
+    client.headers["api-key"] = "key_1"
+    authors = iter(range(follows + 2, users + 1))
+    followed: List[int] = []
+
+    async def follow() -> None:
+        author_id = next(authors)
+        response = await client.post(f"/api/users/{author_id}/follow")
+        assert response.status_code == 200
+        followed.append(author_id)
+
+    async def unfollow() -> None:
+        response = await client.delete(f"/api/users/{followed.pop()}/follow")
+        assert response.status_code == 200
+
+    follow_stats = await measure(follow, args.repeat)
+    unfollow_stats = await measure(unfollow, args.repeat)
+    await db.get_engine().dispose()
+    return [
+        follows,
+        follow_stats["p50"],
+        follow_stats["p95"],
+        unfollow_stats["p50"],
+        unfollow_stats["p95"],
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = [await run_case(args.db_url, size, args) for size in args.sizes]
+    print_table(
+        "Подписка и отписка, задержка, мс",
+        ["follows", "follow p50", "follow p95", "unfollow p50", "unfollow p95"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
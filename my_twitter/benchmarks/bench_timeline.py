@@ -0,0 +1,136 @@
+"""
+Бенчмарк домашней ленты при разных распределениях числа подписчиков.
+
+Для каждого распределения и каждого порога FAN_OUT_PULL_THRESHOLD замеряется:
+- задержка создания твита (включая фоновую раздачу по лентам);
+- задержка чтения первой страницы домашней ленты.
+
+Запуск (из папки my_twitter):
+    python -m benchmarks.bench_timeline --users 2000 --tweets 200
+    python -m benchmarks.bench_timeline --db-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+from typing import Dict, List
+
+from app.database.models import Subscriptions, User
+from app.utils.counters import reconcile_counters
+from benchmarks.utils import (
+    create_bench_app,
+    get_bench_settings,
+    get_client,
+    measure,
+    print_table,
+)
+from sqlalchemy import insert
+
+
+def followers_distribution(name: str, users: int, authors: int) -> List[int]:
+    """
+    Количество подписчиков у каждого автора.
+
+    :param name: Название распределения (uniform, skewed, celebrity).
+    :param users: Количество пользователей.
+    :param authors: Количество авторов.
+    :return: Список количества подписчиков.
+    """
+    if name == "uniform":
+        return [users // 20] * authors
+    if name == "skewed":
+        # Распределение Ципфа: у автора с рангом r примерно users / r подписчиков.
+        return [max(1, (users - 1) // rank) for rank in range(1, authors + 1)]
+    # celebrity: один автор, на которого подписаны все, остальные почти без подписчиков.
+    return [users - 1] + [2] * (authors - 1)
+
+
+async def run_case(
+    db_url: str, distribution: str, threshold: int, args: argparse.Namespace
+) -> List[object]:
+    """
+    Прогон одного сценария.
+
+    :param db_url: URL базы данных.
+    :param distribution: Название распределения подписчиков.
+    :param threshold: Порог FAN_OUT_PULL_THRESHOLD.
+    :param args: Аргументы командной строки.
+    :return: Строка таблицы результатов.
+    """
+    settings = get_bench_settings(db_url, FAN_OUT_PULL_THRESHOLD=threshold)
+    app, db = await create_bench_app(settings)
+    rnd = random.Random(42)
+    async with db.get_sessionmaker() as session:
+        await session.execute(
+            insert(User),
+            [
+                dict(first_name="u", surname=str(i), api_key=f"key_{i}")
+                for i in range(args.users)
+            ],
+        )
+        rows: List[Dict[str, int]] = []
+        for author_id, count in enumerate(
+            followers_distribution(distribution, args.users, args.authors), start=1
+        ):
+            candidates = rnd.sample(
+                range(1, args.users + 1), min(count + 1, args.users)
+            )
+            rows.extend(
+                dict(user_id=user_id, follower_id=author_id)
+                for user_id in candidates[:count]
+                if user_id != author_id
+            )
+        await session.execute(insert(Subscriptions), rows)
+        await session.commit()
+        await reconcile_counters(session)
+
+    client = get_client(app)
+
+    async def create_tweet() -> None:
+        client.headers["api-key"] = f"key_{rnd.randrange(args.authors)}"
+        await client.post(
+            "/api/tweets", json={"tweet_data": "x", "tweet_media_ids": []}
+        )
+
+    async def read_timeline() -> None:
+        client.headers["api-key"] = f"key_{rnd.randrange(args.users)}"
+        await client.get("/api/tweets/timeline", params={"limit": args.limit})
+
+    write = await measure(create_tweet, args.tweets)
+    read = await measure(read_timeline, args.reads)
+    await db.get_engine().dispose()
+    return [
+        distribution,
+        threshold,
+        write["p50"],
+        write["p95"],
+        read["p50"],
+        read["p95"],
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--tweets", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    # Порог больше числа пользователей = только push; 0 = только pull.
+    thresholds = [args.users + 1, args.users // 10, 0]
+    results = []
+    for distribution in ("uniform", "skewed", "celebrity"):
+        for threshold in thresholds:
+            results.append(await run_case(args.db_url, distribution, threshold, args))
+    print_table(
+        "Домашняя лента, задержка, мс",
+        ["distribution", "threshold", "write p50", "write p95", "read p50", "read p95"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import statistics
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.application.classes import CustomFastApi
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models.base import Base
+from app.settings.classes import DBSettings, Settings
+from app.settings.settings import log_settings
+from httpx import ASGITransport, AsyncClient
+
+
+def get_bench_settings(db_url: str, **kwargs: Any) -> Settings:
+    """
+    Настройки приложения для бенчмарков.
+
+    :param db_url: URL базы данных.
+    :param kwargs: Переопределяемые поля настроек.
+    :return: Settings.
+    """
+    base_dir = Path(__file__).resolve().parent
+    settings = Settings(
+        BASE_DIR=base_dir,
+        IMAGES_FOLDER_NAME="images",
+        MEDIA_FOLDER_ROOT=base_dir / "temp" / "media",
+        MEDIA_URL="/media",
+        STATIC_ROOT=base_dir / "temp" / "static",
+        STATIC_URL="/",
+        DB_SETTINGS=DBSettings(DATABASE_URL=db_url),
+        DEBUG=False,
+        LOG_SETTINGS=log_settings,
+    )
+    return replace(settings, **kwargs)
+
+
+async def create_bench_app(settings: Settings) -> tuple[CustomFastApi, Database]:
+    """
+    Создаёт приложение и пустую схему БД для бенчмарка.
+
+    :param settings: Settings.
+    :return: (Приложение, Database).
+    """
+    db = Database(settings.DB_SETTINGS.DATABASE_URL)
+    async with db.get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    return get_app(settings=settings, db=db), db
+
+
+def get_client(app: CustomFastApi) -> AsyncClient:
+    """
+    Асинхронный клиент приложения (без сети).
+
+    :param app: CustomFastApi.
+    :return: AsyncClient.
+    """
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+
+async def measure(func: Callable[[], Awaitable[Any]], repeat: int) -> Dict[str, float]:
+    """
+    Выполнит корутину repeat раз и вернёт статистику задержки в миллисекундах.
+
+    :param func: Фабрика корутины.
+    :param repeat: Количество повторов.
+    :return: Словарь с p50, p95 и mean.
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "mean": statistics.fmean(timings),
+    }
+
+
+def print_table(title: str, header: List[str], rows: List[List[Any]]) -> None:
+    """
+    Выведет таблицу результатов.
+
+    :param title: Заголовок.
+    :param header: Названия колонок.
+    :param rows: Строки.
+    :return: None.
+    """
+    print(f"\n{title}")
+    lines = [header] + [
+        [f"{value:.2f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths = [max(len(value) for value in column) for column in zip(*lines)]
+    for line in lines:
+        print("  ".join(value.rjust(width) for value, width in zip(line, widths)))
@@ -0,0 +1,126 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Hashtag, Tweet, TweetHashtag, User
+from app.utils.hashtags import MAX_TWEET_TAGS, backfill_hashtags, extract_tags
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+
+@pytest.mark.api_hashtags
+def test_extract_tags() -> None:
+    """
+    Проверяем разбор хэштегов и упоминаний из текста твита.
+    Ожидаем теги в нижнем регистре без повторов в порядке появления,
+    без e-mail адресов, двойных знаков и тегов сверх MAX_TWEET_TAGS.
+
+    :return: None.
+    """
+    content = "#Python и #python, привет @Alex_1! mail@example.com ##no #Код2024 @#no"
+    assert extract_tags(content) == [
+        ("#", "python"),
+        ("@", "alex_1"),
+        ("#", "код2024"),
+    ]
+    assert extract_tags("без тегов #") == []
+    many = " ".join(f"#t{i}" for i in range(MAX_TWEET_TAGS + 10))
+    assert len(extract_tags(many)) == MAX_TWEET_TAGS
+
+
+@pytest.mark.api_hashtags
+@pytest.mark.asyncio
+async def test_hashtag_tweets(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роут /api/hashtags/<tag>/tweets метод get.
+    Ожидаем твиты с хэштегом или упоминанием от новых к старым с обходом по курсору,
+    без учёта регистра и знака #, удалённый твит пропадает из индекса,
+    а лимит вне диапазона 1..MAX_PAGE_LIMIT отклоняется (422).
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    ids = []
+    for content in [
+        "#FastAPI для @alex",
+        "просто текст",
+        "ещё #fastapi",
+        "#fastapi #sql",
+    ]:
+        response = await client.post(
+            "/api/tweets", json={"tweet_data": content, "tweet_media_ids": []}
+        )
+        ids.append(response.json()["tweet_id"])
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get("/api/hashtags/FastAPI/tweets", params=params)
+        assert response.status_code == 200
+        pages.extend(tweet["id"] for tweet in response.json()["tweets"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [ids[3], ids[2], ids[0]]
+
+    response = await client.get("/api/hashtags/%23sql/tweets")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[3]]
+    response = await client.get("/api/hashtags/%40Alex/tweets")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[0]]
+    assert response.json()["tweets"][0]["content"] == "#FastAPI для @alex"
+    response = await client.get("/api/hashtags/alex/tweets")
+    assert response.json()["tweets"] == []
+
+    await client.delete(f"/api/tweets/{ids[3]}")
+    response = await client.get("/api/hashtags/fastapi/tweets")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[2], ids[0]]
+
+    for limit in (0, -1, MAX_PAGE_LIMIT + 1):
+        response = await client.get(
+            "/api/hashtags/fastapi/tweets", params={"limit": limit}
+        )
+        assert response.status_code == 422
+
+
+@pytest.mark.api_hashtags
+@pytest.mark.asyncio
+async def test_backfill_hashtags(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем заполнение индекса хэштегов по существующим твитам (команда backfillhashtags).
+    Ожидаем, что твиты, созданные в обход роута, находятся по хэштегу после заполнения,
+    а повторный запуск не создаёт дубликатов.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        tweets = [
+            Tweet(author=user, content=f"#старое @{user.api_key}") for user in users
+        ]
+        session.add_all(tweets)
+        await session.commit()
+
+    response = await client.get("/api/hashtags/старое/tweets", params={"limit": 100})
+    assert response.json()["tweets"] == []
+
+    async with db.get_sessionmaker() as session:
+        assert await backfill_hashtags(session) == 2 * len(users)
+        await backfill_hashtags(session)
+        entries_q = await session.execute(select(func.count(TweetHashtag.id)))
+        hashtags_q = await session.execute(select(func.count(Hashtag.id)))
+    assert entries_q.scalar_one() == 2 * len(users)
+    assert hashtags_q.scalar_one() == len(users) + 1
+
+    response = await client.get("/api/hashtags/старое/tweets", params={"limit": 100})
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [
+        tweet.id for tweet in reversed(tweets)
+    ]
+    response = await client.get(f"/api/hashtags/%40{users[0].api_key}/tweets")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [tweets[0].id]
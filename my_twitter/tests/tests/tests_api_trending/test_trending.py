@@ -0,0 +1,156 @@
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.settings.classes import Settings
+from app.utils.trending import SlidingCounter
+from httpx import ASGITransport, AsyncClient
+from tests.utils import count_queries
+
+
+@pytest.mark.api_trending
+def test_sliding_counter() -> None:
+    """
+    Проверяем счётчик событий в скользящем окне.
+    Ожидаем, что событие теряет половину веса за период полураспада,
+    отмена вычитает вес, удаление ключа убирает все его события,
+    а события старше окна не учитываются.
+
+    :return: None.
+    """
+    counter: SlidingCounter[str] = SlidingCounter(
+        bucket_s=60, buckets=10, half_life_s=60
+    )
+    counter.add("old", 0)
+    counter.add("old", 0)
+    counter.add("new", 60)
+    counter.add("gone", 60)
+    counter.add("gone", 60, -1)
+    counter.add("old", 0)
+    counter.add("deleted", 0, 5)
+    counter.add("deleted", 60)
+    counter.discard("deleted")
+    assert counter.top(10, 60) == [("old", 1.5), ("new", 1.0)]
+    assert counter.top(1, 120) == [("old", 0.75)]
+    assert counter.top(10, 659) == [("new", 0.5**9)]
+    assert counter.top(10, 660) == []
+
+
+@pytest.mark.api_trending
+@pytest.mark.asyncio
+async def test_trending(settings: Settings, db: Database) -> None:
+    """
+    Проверяем роут /api/trending метод get.
+    Ожидаем хэштеги новых твитов и лайкнутые твиты по убыванию счёта без запросов к БД,
+    удалённый твит сразу пропадает из трендов вместе со своими хэштегами,
+    а после перезапуска приложения тренды восстанавливаются из БД.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    settings = replace(settings, TRENDING_REFRESH_S=0)
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    ids = []
+    for content in ["#python #sql", "#Python @alex", "#python", "#fastapi"]:
+        response = await client.post(
+            "/api/tweets", json={"tweet_data": content, "tweet_media_ids": []}
+        )
+        ids.append(response.json()["tweet_id"])
+    for api_key in ["test_0000", "test_0001"]:
+        await client.post(f"/api/tweets/{ids[1]}/likes", headers={"api-key": api_key})
+    await client.post(f"/api/tweets/{ids[2]}/likes", headers={"api-key": "test_0000"})
+    await client.post(f"/api/tweets/{ids[3]}/likes", headers={"api-key": "test_0000"})
+    await client.delete(f"/api/tweets/{ids[3]}/likes", headers={"api-key": "test_0000"})
+
+    with count_queries(db) as statements:
+        response = await client.get("/api/trending")
+    assert statements == []
+    trending = response.json()
+    assert trending["result"] is True
+    assert [hashtag["tag"] for hashtag in trending["hashtags"]][0] == "python"
+    assert trending["hashtags"][0]["score"] == pytest.approx(3, rel=0.01)
+    assert {hashtag["tag"] for hashtag in trending["hashtags"]} == {
+        "python",
+        "sql",
+        "fastapi",
+    }
+    assert [tweet["id"] for tweet in trending["tweets"]] == [ids[1], ids[2]]
+
+    settings = replace(settings, TRENDING_REFRESH_S=3600)
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "#django", "tweet_media_ids": []}
+    )
+    ids.append(response.json()["tweet_id"])
+    await client.post(f"/api/tweets/{ids[4]}/likes", headers={"api-key": "test_0000"})
+    response = await client.get("/api/trending")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[4]]
+    assert [hashtag["tag"] for hashtag in response.json()["hashtags"]] == ["django"]
+    await client.delete(f"/api/tweets/{ids[4]}")
+    response = await client.get("/api/trending")
+    assert response.json()["tweets"] == []
+    assert response.json()["hashtags"] == []
+
+    restarted = get_app(settings=settings, db=db)
+    await restarted.get_trending().rebuild(db)
+    client = AsyncClient(transport=ASGITransport(app=restarted), base_url="http://test")
+    response = await client.get("/api/trending")
+    hashtags = [hashtag["tag"] for hashtag in response.json()["hashtags"]]
+    assert hashtags[0] == "python"
+    assert set(hashtags) == {"python", "sql", "fastapi"}
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[1], ids[2]]
+
+
+@pytest.mark.api_trending
+@pytest.mark.asyncio
+async def test_trending_like_buffer(settings: Settings, db: Database) -> None:
+    """
+    Проверяем тренды при включённом буфере лайков.
+    Ожидаем, что в тренды попадают только записанные в БД лайки и дизлайки:
+    повторные лайки одного пользователя и лайк несуществующего твита не учитываются.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    settings = replace(
+        settings,
+        TRENDING_REFRESH_S=0,
+        LIKE_BUFFER_ENABLED=True,
+        LIKE_BUFFER_FLUSH_INTERVAL_MS=60000,
+    )
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "buffered", "tweet_media_ids": []}
+    )
+    tweet_id = response.json()["tweet_id"]
+    for _ in range(5):
+        response = await client.post(f"/api/tweets/{tweet_id}/likes")
+        assert response.status_code == 200
+    await client.post("/api/tweets/100500/likes")
+    await client.post(f"/api/tweets/{tweet_id}/likes", headers={"api-key": "test_0000"})
+
+    # До записи пачки тренды пусты.
+    response = await client.get("/api/trending")
+    assert response.json()["tweets"] == []
+
+    await app.get_like_buffer().flush()
+    response = await client.get("/api/trending")
+    assert response.json()["tweets"] == [{"id": tweet_id, "score": 2.0}]
+
+    # Дизлайк без лайка ничего не удаляет и не уменьшает счёт.
+    await client.delete(
+        f"/api/tweets/{tweet_id}/likes", headers={"api-key": "test_0001"}
+    )
+    await client.delete(
+        f"/api/tweets/{tweet_id}/likes", headers={"api-key": "test_0000"}
+    )
+    await app.get_like_buffer().flush()
+    response = await client.get("/api/trending")
+    assert response.json()["tweets"] == [{"id": tweet_id, "score": 1.0}]
+    await app.get_like_buffer().close()
@@ -55,9 +55,9 @@ async def test_all_tweets(client: AsyncClient, db: Database) -> None:
     assert response.status_code == 200
 
     # Проверяем всё ли на месте.
-    tweets_sorted = sorted(tweets, key=lambda t: t.created, reverse=True)
+    tweets_sorted = sorted(tweets, key=lambda t: (t.created, t.id), reverse=True)
     data = response.json()
-    assert set(data.keys()) == {"result", "tweets"}
+    assert set(data.keys()) == {"result", "tweets", "next_cursor"}
     assert data["result"] is True
     assert set(data["tweets"][0].keys()) == {
         "id",
@@ -65,6 +65,8 @@ async def test_all_tweets(client: AsyncClient, db: Database) -> None:
         "attachments",
         "author",
         "likes",
+        "like_count",
+        "followed_by_me",
     }
     assert len(data["tweets"]) == limit
     assert len(data["tweets"][0]["attachments"]) == 1
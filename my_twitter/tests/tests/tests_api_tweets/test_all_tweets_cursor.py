@@ -0,0 +1,67 @@
+from random import choice, choices
+from string import ascii_letters
+
+import pytest
+from app.database.database import Database
+from app.database.models import Tweet, User
+from httpx import AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_all_tweets_cursor(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роут /api/tweets метод get с курсорной пагинацией.
+    Ожидаем, что проход по курсорам вернёт все твиты без повторов
+    в порядке убывания (created, id), а новые твиты не сдвинут страницы.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        # Определим пользователя для теста.
+        main_user = choice(users)
+        # Создадим 23 твита.
+        tweets = [
+            Tweet(author=main_user, content="".join(choices(ascii_letters, k=10)))
+            for _ in range(23)
+        ]
+        session.add_all(tweets)
+        await session.commit()
+    tweets_sorted = sorted(tweets, key=lambda t: (t.created, t.id), reverse=True)
+
+    limit = 5
+    # Первая страница (без курсора) совпадает с offset=1.
+    response = await client.get("/api/tweets", params={"limit": limit})
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data.keys()) == {"result", "tweets", "next_cursor"}
+    received = [tweet["id"] for tweet in data["tweets"]]
+    cursor = data["next_cursor"]
+    assert cursor
+
+    # Новый твит не должен сдвинуть следующие страницы.
+    async with db.get_sessionmaker() as session:
+        session.add(Tweet(user_id=main_user.id, content="new"))
+        await session.commit()
+
+    while cursor:
+        response = await client.get(
+            "/api/tweets", params={"limit": limit, "cursor": cursor}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        received.extend(tweet["id"] for tweet in data["tweets"])
+        cursor = data["next_cursor"]
+
+    assert received == [tweet.id for tweet in tweets_sorted]
+
+    # Повреждённый курсор.
+    response = await client.get("/api/tweets", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["result"] is False
@@ -0,0 +1,90 @@
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Tweet, User
+from app.settings.classes import Settings
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_cache(settings: Settings, db: Database) -> None:
+    """
+    Проверяем кэш страниц общей ленты (роут /api/tweets метод get).
+    Ожидаем, что повторный запрос страницы не идёт в БД и отдаёт те же байты,
+    создание, удаление твита, лайк и дизлайк сбрасывают кэш,
+    при превышении размера страницы вытесняются, а при выключенной настройке кэш не используется.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    feed_cache = app.get_feed_cache()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        session.add_all([Tweet(author=user, content=user.api_key) for user in users])
+        await session.commit()
+
+    # Промах, затем попадание без запросов к БД.
+    first = await client.get("/api/tweets")
+    with count_queries(db) as statements:
+        second = await client.get("/api/tweets")
+    assert second.status_code == 200
+    assert statements == []
+    assert second.content == first.content
+    assert (feed_cache.hits, feed_cache.misses) == (1, 1)
+    # Другие параметры - другие страницы, курсор не кэшируется.
+    await client.get("/api/tweets", params={"limit": 3})
+    await client.get("/api/tweets", params={"include_likes": False})
+    await client.get("/api/tweets", params={"cursor": first.json()["next_cursor"]})
+    assert len(feed_cache) == 3
+
+    # Каждая запись сбрасывает кэш, и следующая страница её отражает.
+    client.headers["api-key"] = users[0].api_key
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "new", "tweet_media_ids": []}
+    )
+    tweet_id = response.json()["tweet_id"]
+    assert len(feed_cache) == 0
+    response = await client.get("/api/tweets")
+    assert response.json()["tweets"][0]["id"] == tweet_id
+
+    await client.post(f"/api/tweets/{tweet_id}/likes")
+    response = await client.get("/api/tweets")
+    assert response.json()["tweets"][0]["like_count"] == 1
+    await client.delete(f"/api/tweets/{tweet_id}/likes")
+    response = await client.get("/api/tweets")
+    assert response.json()["tweets"][0]["like_count"] == 0
+    await client.delete(f"/api/tweets/{tweet_id}")
+    response = await client.get("/api/tweets")
+    assert response.json()["tweets"][0]["id"] != tweet_id
+
+    # Ограничение по размеру: помещается только одна страница.
+    app = get_app(
+        settings=replace(settings, FEED_CACHE_MAX_BYTES=len(first.content) + 1),
+        db=db,
+    )
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    feed_cache = app.get_feed_cache()
+    await client.get("/api/tweets")
+    await client.get("/api/tweets", params={"offset": 2, "limit": 9})
+    assert len(feed_cache) == 1
+    assert feed_cache.evictions == 1
+    assert feed_cache.size <= len(first.content) + 1
+
+    # Выключенный кэш.
+    app = get_app(settings=replace(settings, FEED_CACHE_ENABLED=False), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    response = await client.get("/api/tweets")
+    assert response.json() == first.json()
+    await client.get("/api/tweets")
+    assert len(app.get_feed_cache()) == 0
+    assert app.get_feed_cache().hits == 0
@@ -0,0 +1,79 @@
+import pytest
+from app.application.classes import CustomFastApi
+from app.database.database import Database
+from app.database.models import Tweet, User
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_etag(app: CustomFastApi, client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем ETag общей ленты (роут /api/tweets метод get).
+    Ожидаем, что повтор с If-None-Match возвращает 304 без тела, без запросов к БД и без обращения к кэшу,
+    а после записи (новый твит, лайк) ETag меняется и возвращается 200.
+
+    :param app: CustomFastApi.
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    feed_cache = app.get_feed_cache()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        session.add_all([Tweet(author=user, content=user.api_key) for user in users])
+        await session.commit()
+
+    first = await client.get("/api/tweets")
+    etag = first.headers["etag"]
+    lookups = feed_cache.hits + feed_cache.misses
+    with count_queries(db) as statements:
+        response = await client.get("/api/tweets", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert statements == []
+    assert feed_cache.hits + feed_cache.misses == lookups
+    # Слабый ETag и список ETag.
+    for if_none_match in [f"W/{etag}", f'"other", {etag}', "*"]:
+        response = await client.get(
+            "/api/tweets", headers={"if-none-match": if_none_match}
+        )
+        assert response.status_code == 304
+    response = await client.get("/api/tweets", headers={"if-none-match": '"other"'})
+    assert response.status_code == 200
+    # Курсорные страницы тоже с ETag.
+    response = await client.get(
+        "/api/tweets",
+        params={"cursor": first.json()["next_cursor"]},
+        headers={"if-none-match": etag},
+    )
+    assert response.status_code == 304
+
+    # Запись меняет ETag.
+    client.headers["api-key"] = users[0].api_key
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "new", "tweet_media_ids": []}
+    )
+    tweet_id = response.json()["tweet_id"]
+    response = await client.get("/api/tweets", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["tweets"][0]["id"] == tweet_id
+    etag = response.headers["etag"]
+    await client.post(f"/api/tweets/{tweet_id}/likes")
+    response = await client.get("/api/tweets", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["tweets"][0]["like_count"] == 1
+
+    # Персональная лента (followed_by_me) без ETag.
+    response = await client.get(
+        "/api/tweets",
+        params={"include_followed_by_me": True},
+        headers={"if-none-match": response.headers["etag"]},
+    )
+    assert response.status_code == 200
+    assert "etag" not in response.headers
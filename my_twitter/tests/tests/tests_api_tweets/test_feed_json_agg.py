@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+from app.database.database import Database
+from app.database.models import Tweet, User
+from app.settings.classes import Settings
+from app.utils.feed import get_feed_json_agg_query, load_feed_json
+from app.utils.pagination import encode_cursor
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_json_agg(settings: Settings, db: Database) -> None:
+    """
+    Проверяем сборку страницы ленты одним запросом PostgreSQL (json_agg).
+    Ожидаем, что запрос компилируется для PostgreSQL, лайки и вложения коррелируют
+    со страницей через LATERAL, а на SQLite используется запасной путь без json_agg.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    cursor = encode_cursor(datetime(2025, 1, 1), 1)
+    sql = str(
+        get_feed_json_agg_query(settings, 1, 10, cursor, True).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert sql.count("json_agg(") == 3
+    assert sql.count("LATERAL") == 3
+    assert "FROM likes, page" not in sql
+    sql = str(
+        get_feed_json_agg_query(settings, 1, 10, None, False).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "likes" not in sql.replace("likes_", "")
+
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        session.add_all([Tweet(author=user, content=user.api_key) for user in users])
+        await session.commit()
+        with count_queries(db) as statements:
+            await load_feed_json(session, settings, 1, 10, None, True)
+    assert len(statements) == 3
+    assert not any("json_agg" in statement for statement in statements)
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.database.database import Database
+from app.database.models import Tweet, User
+from app.utils.popularity import MIN_POPULARITY, get_popularity, recompute_popularity
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_popular(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем ленту с sort=popular (роут /api/tweets метод get).
+    Ожидаем твиты по убыванию лайков, затухающих с возрастом твита (твиты без лайков - от новых к старым),
+    пересчёт оценки при лайке и дизлайке, постраничную пагинацию без курсора
+    и обнуление затухших оценок фоновым пересчётом.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    now = datetime.now()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        # Старый твит с тремя лайками, свежий с двумя, свежий без лайков и древний с одним лайком.
+        tweets = [
+            Tweet(author=users[0], content="old", created=now - timedelta(days=1)),
+            Tweet(author=users[1], content="fresh", created=now),
+            Tweet(author=users[2], content="quiet", created=now),
+            Tweet(author=users[3], content="ancient", created=now - timedelta(days=30)),
+        ]
+        session.add_all(tweets)
+        await session.commit()
+        ids = [tweet.id for tweet in tweets]
+    likes = [(ids[0], users[i].api_key) for i in (4, 5, 6)]
+    likes += [(ids[1], users[i].api_key) for i in (4, 5)]
+    likes += [(ids[3], users[4].api_key)]
+    for tweet_id, api_key in likes:
+        response = await client.post(
+            f"/api/tweets/{tweet_id}/likes", headers={"api-key": api_key}
+        )
+        assert response.status_code == 200
+
+    response = await client.get("/api/tweets", params={"sort": "popular"})
+    assert response.status_code == 200
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [
+        ids[1],
+        ids[0],
+        ids[3],
+        ids[2],
+    ]
+    assert response.json()["next_cursor"] is None
+    assert response.json()["tweets"][0]["like_count"] == 2
+
+    async with db.get_sessionmaker() as session:
+        popularity_q = await session.execute(
+            select(Tweet.popularity).where(Tweet.id == ids[1])
+        )
+        assert popularity_q.scalar_one() == pytest.approx(2, rel=1e-3)
+
+    # Дизлайк опускает свежий твит ниже старого.
+    await client.delete(
+        f"/api/tweets/{ids[1]}/likes", headers={"api-key": users[4].api_key}
+    )
+    await client.delete(
+        f"/api/tweets/{ids[1]}/likes", headers={"api-key": users[5].api_key}
+    )
+    response = await client.get(
+        "/api/tweets", params={"sort": "popular", "limit": 1, "offset": 1}
+    )
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[0]]
+    response = await client.get(
+        "/api/tweets", params={"sort": "popular", "limit": 1, "offset": 2}
+    )
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [ids[3]]
+
+    # Фоновый пересчёт обнуляет затухшие оценки.
+    assert get_popularity(1, now - timedelta(days=30), now, 21600.0) == 0
+    assert get_popularity(1, now, now, 21600.0) > MIN_POPULARITY
+    async with db.get_sessionmaker() as session:
+        await session.execute(
+            update(Tweet).where(Tweet.id == ids[3]).values(popularity=5.0)
+        )
+        await session.commit()
+        assert await recompute_popularity(session, 21600.0) == 2
+        assert await recompute_popularity(session, 21600.0) == 1
+        popularity_q = await session.execute(
+            select(Tweet.id, Tweet.popularity).where(Tweet.id.in_(ids))
+        )
+        popularity = dict(popularity_q.all())
+        assert popularity[ids[3]] == 0
+        assert popularity[ids[0]] == pytest.approx(3 / 16, rel=1e-3)
+        assert await recompute_popularity(session, 21600.0, full=True) == 2
+
+    response = await client.get("/api/tweets", params={"sort": "newest"})
+    assert response.status_code == 422
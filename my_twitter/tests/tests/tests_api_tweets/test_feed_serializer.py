@@ -0,0 +1,82 @@
+import json
+from dataclasses import replace
+
+import pytest
+from app.database.database import Database
+from app.database.models import Attachment, Like, Tweet, User
+from app.settings.classes import Settings
+from app.utils import feed_serializer
+from app.utils.feed import get_feed_response, load_feed_json, load_feed_tweets
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_serializer_parity(
+    settings: Settings, db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Проверяем быструю сериализацию ленты из Core-строк (load_feed_json).
+    Ожидаем, что для любых параметров страницы ответ побайтно совпадает
+    с OutResponseTweet.model_dump_json(), в том числе без orjson.
+
+    :param settings: Settings.
+    :param db: Database.
+    :param monkeypatch: MonkeyPatch.
+    :return: None.
+    """
+    settings = replace(settings, LIKES_PREVIEW_LIMIT=3)
+    contents = [
+        "обычный текст",
+        'кавычки " и \\ обратный слэш',
+        "перевод\nстроки\tи\x01управляющий символ",
+        "эмодзи 🐦 и </script>",
+        "",
+    ]
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        users[0].middle_name = "Отчество"
+        users[1].middle_name = ""
+        tweets = [
+            Tweet(author=users[i % len(users)], content=contents[i % len(contents)])
+            for i in range(12)
+        ]
+        session.add_all(tweets)
+        await session.flush()
+        for i, tweet in enumerate(tweets):
+            tweet.like_count = i % 6
+            session.add_all(
+                [Like(tweet_id=tweet.id, user_id=users[j].id) for j in range(i % 6)]
+            )
+            session.add_all(
+                [
+                    Attachment(
+                        tweet_id=tweet.id, image_path=f"images\\{tweet.id}_{j}.png"
+                    )
+                    for j in range(i % 3)
+                ]
+            )
+        await session.commit()
+
+    params = [
+        dict(offset=1, limit=10, cursor=None, include_likes=True),
+        dict(offset=2, limit=5, cursor=None, include_likes=True),
+        dict(offset=1, limit=100, cursor=None, include_likes=False),
+        dict(offset=5, limit=10, cursor=None, include_likes=True),
+    ]
+    for use_orjson in (True, False):
+        if not use_orjson:
+            monkeypatch.setattr(feed_serializer, "HAS_ORJSON", False)
+        async with db.get_sessionmaker() as session:
+            first = await load_feed_json(session, settings, 1, 5, None, True)
+        cursor = json.loads(first)["next_cursor"]
+        assert cursor is not None
+        pages = [*params, dict(offset=1, limit=5, cursor=cursor, include_likes=True)]
+        for page in pages:
+            async with db.get_sessionmaker() as session:
+                fast = await load_feed_json(session, settings, **page)
+                tweets = await load_feed_tweets(session, settings, **page)
+            expected = get_feed_response(settings, tweets, page["limit"])
+            assert fast == expected.model_dump_json().encode()
@@ -0,0 +1,67 @@
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.routers.app_routers.schemas.tweets import OutResponseTweetDelta, OutTweet
+from app.settings.classes import Settings
+from app.utils.feed import load_feed_tweets
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_feed_since(settings: Settings, db: Database) -> None:
+    """
+    Проверяем ленту с since_id (роут /api/tweets метод get).
+    Ожидаем только твиты новее since_id от новых к старым в формате ленты,
+    не больше FEED_SINCE_MAX_TWEETS и has_gap=true, если новых твитов больше.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    settings = replace(settings, FEED_SINCE_MAX_TWEETS=3)
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        tweets = [Tweet(author=user, content=user.api_key) for user in users[:5]]
+        session.add_all(tweets)
+        await session.commit()
+        session.add(Like(user_id=users[0].id, tweet_id=tweets[4].id))
+        tweets[4].like_count = 1
+        await session.commit()
+        ids = [tweet.id for tweet in tweets]
+        feed = await load_feed_tweets(session, settings, 1, 10, None, True)
+    expected = [OutTweet.model_validate(tweet) for tweet in feed]
+    for tweet in expected:
+        tweet.set_settings(settings)
+
+    with count_queries(db) as statements:
+        response = await client.get("/api/tweets", params={"since_id": ids[2]})
+    assert response.status_code == 200
+    assert len(statements) == 3
+    assert response.content == (
+        OutResponseTweetDelta(tweets=expected[:2], has_gap=False)
+        .model_dump_json()
+        .encode()
+    )
+
+    response = await client.get("/api/tweets", params={"since_id": ids[0]})
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == ids[:0:-1][:3]
+    assert response.json()["has_gap"] is True
+    response = await client.get("/api/tweets", params={"since_id": ids[0], "limit": 2})
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == ids[:2:-1]
+    assert response.json()["has_gap"] is True
+    response = await client.get(
+        "/api/tweets", params={"since_id": ids[-1], "include_followed_by_me": True}
+    )
+    assert response.json() == {"result": True, "tweets": [], "has_gap": False}
+    response = await client.get("/api/tweets", params={"since_id": 0})
+    assert response.status_code == 422
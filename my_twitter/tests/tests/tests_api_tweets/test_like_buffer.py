@@ -0,0 +1,214 @@
+import asyncio
+import logging
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.settings.classes import Settings
+from app.utils.like_buffer import MAX_FLUSH_RETRIES, LikeBuffer
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from tests.utils import count_queries
+
+
+async def get_likes(db: Database, tweet_id: int) -> tuple[int, int]:
+    """
+    Вернёт количество строк лайков твита и значение его счётчика like_count.
+
+    :param db: Database.
+    :param tweet_id: ID твита.
+    :return: (количество строк в likes, like_count).
+    """
+    async with db.get_sessionmaker() as session:
+        rows_q = await session.execute(
+            select(func.count(Like.id)).where(Like.tweet_id == tweet_id)
+        )
+        count_q = await session.execute(
+            select(Tweet.like_count).where(Tweet.id == tweet_id)
+        )
+        return rows_q.scalar_one(), count_q.scalar_one()
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_like_buffer(settings: Settings, db: Database) -> None:
+    """
+    Проверяем буфер лайков с отложенной записью.
+    Ожидаем, что лайки подтверждаются сразу, повторы и пары лайк-дизлайк схлопываются,
+    при остановке буфер записывается в БД, а при накоплении max_ops запись происходит сама.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    settings = replace(
+        settings,
+        LIKE_BUFFER_ENABLED=True,
+        LIKE_BUFFER_FLUSH_INTERVAL_MS=60000,
+        LIKE_BUFFER_MAX_OPS=1000,
+    )
+    app = get_app(settings=settings, db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        # Твит без лайков и твит с одним лайком.
+        tweet_a = Tweet(author=users[0], content="a")
+        tweet_b = Tweet(author=users[0], content="b", like_count=1)
+        session.add_all([tweet_a, tweet_b])
+        await session.commit()
+        session.add(Like(user_id=users[6].id, tweet_id=tweet_b.id))
+        await session.commit()
+
+    async def request(method: str, user: User, tweet_id: int) -> None:
+        client.headers["api-key"] = user.api_key
+        response = await client.request(method, f"/api/tweets/{tweet_id}/likes")
+        assert response.status_code == 200
+
+    # 5 лайков и повтор лайка.
+    for user in users[:5]:
+        await request("POST", user, tweet_a.id)
+    await request("POST", users[0], tweet_a.id)
+    # Лайк и дизлайк в одной пачке.
+    await request("POST", users[5], tweet_a.id)
+    await request("DELETE", users[5], tweet_a.id)
+    # Дизлайк существующего лайка и лайк несуществующего твита.
+    await request("DELETE", users[6], tweet_b.id)
+    await request("POST", users[6], 100500)
+
+    # Запросы подтверждены, но в БД ещё ничего нет.
+    buffer = app.get_like_buffer()
+    assert buffer.pending == 8
+    assert await get_likes(db, tweet_a.id) == (0, 0)
+
+    # Остановка записывает всё, что накопилось.
+    await buffer.close()
+    assert buffer.pending == 0
+    assert await get_likes(db, tweet_a.id) == (5, 5)
+    assert await get_likes(db, tweet_b.id) == (0, 0)
+
+    # Запись по количеству операций.
+    app = get_app(settings=replace(settings, LIKE_BUFFER_MAX_OPS=2), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    for user in users[5:7]:
+        await request("POST", user, tweet_b.id)
+    buffer = app.get_like_buffer()
+    # Ждём, пока фоновая запись заберёт пачку (таймер на 60 сек, значит сработал max_ops).
+    for _ in range(100):
+        if buffer.pending == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert buffer.pending == 0
+    # flush дождётся окончания начатой записи.
+    await buffer.flush()
+    assert await get_likes(db, tweet_b.id) == (2, 2)
+    await buffer.close()
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_like_buffer_retry(tmp_path: Path) -> None:
+    """
+    Проверяем буфер лайков при временной ошибке записи (БД недоступна).
+    Ожидаем, что пачка возвращается в буфер вместе с более новыми операциями,
+    а после MAX_FLUSH_RETRIES неудачных повторов подряд отбрасывается.
+
+    :param tmp_path: Временный каталог.
+    :return: None.
+    """
+    unavailable = Database(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite3'}")
+    buffer = LikeBuffer(
+        db=unavailable,
+        flush_interval=60,
+        max_ops=1000,
+        popularity_half_life_s=21600.0,
+        logger=logging.getLogger("test_like_buffer"),
+    )
+    await buffer.add(1, 1, True)
+    await buffer.add(2, 1, True)
+    await buffer.flush()
+    assert buffer.pending == 2
+
+    # Новая операция с той же парой объединяется с возвращённой пачкой.
+    await buffer.add(1, 1, False)
+    await buffer.add(3, 1, True)
+    await buffer.flush()
+    assert buffer.pending == 3
+
+    for _ in range(MAX_FLUSH_RETRIES - 2):
+        await buffer.flush()
+        assert buffer.pending == 3
+    await buffer.flush()
+    assert buffer.pending == 0
+
+    await buffer.close()
+    await unavailable.get_engine().dispose()
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_like_buffer_chunks(
+    db: Database, caplog: pytest.LogCaptureFixture
+) -> None:
+    """
+    Проверяем запись пачки, в которой больше max_ops операций.
+    Ожидаем, что лайки и дизлайки пишутся запросами не больше чем по max_ops строк,
+    а операция, нарушающая ограничение целостности (лайк несуществующего пользователя),
+    отбрасывается без потери остальных операций пачки.
+
+    :param db: Database.
+    :param caplog: LogCaptureFixture.
+    :return: None.
+    """
+    buffer = LikeBuffer(
+        db=db,
+        flush_interval=60,
+        max_ops=3,
+        popularity_half_life_s=21600.0,
+        logger=logging.getLogger("test_like_buffer"),
+    )
+    async with db.get_sessionmaker() as session:
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        tweets = [
+            Tweet(author=users[0], content=str(i), like_count=i) for i in range(2)
+        ]
+        session.add_all(tweets)
+        await session.commit()
+        session.add(Like(user_id=users[9].id, tweet_id=tweets[1].id))
+        await session.commit()
+
+    # 9 лайков каждого твита и дизлайк, которого нет в БД.
+    for tweet in tweets:
+        for user in users[:9]:
+            await buffer.add(tweet.id, user.id, True)
+    await buffer.add(tweets[0].id, users[9].id, False)
+    assert buffer.pending == 19
+    with count_queries(db) as statements:
+        await buffer.flush()
+    assert buffer.pending == 0
+    inserts = [sql for sql in statements if sql.startswith("INSERT INTO likes")]
+    assert len(inserts) == 6
+    assert await get_likes(db, tweets[0].id) == (9, 9)
+    assert await get_likes(db, tweets[1].id) == (10, 10)
+
+    # Лайк удалённого пользователя нарушает внешний ключ likes.user_id.
+    async with db.get_engine().connect() as connection:
+        await connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+    try:
+        await buffer.add(tweets[0].id, 100500, True)
+        for user in users[:9]:
+            await buffer.add(tweets[1].id, user.id, False)
+        await buffer.flush()
+    finally:
+        async with db.get_engine().connect() as connection:
+            await connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    assert buffer.pending == 0
+    assert await get_likes(db, tweets[0].id) == (9, 9)
+    assert await get_likes(db, tweets[1].id) == (1, 1)
+    assert "отброшена" in caplog.text
+    await buffer.close()
@@ -0,0 +1,59 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.utils.counters import reconcile_counters
+from httpx import AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_like_count(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем счётчик like_count.
+    Ожидаем, что лайк и дизлайк меняют счётчик, лента без лайков отдаёт счётчик,
+    а пересчёт счётчиков восстанавливает рассинхронизированное значение.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        # Создадим твит.
+        tweet = Tweet(author=users[0], content="text")
+        session.add(tweet)
+        await session.commit()
+
+    # Три лайка и один дизлайк.
+    for user in users[:3]:
+        client.headers["api-key"] = user.api_key
+        response = await client.post(f"/api/tweets/{tweet.id}/likes")
+        assert response.status_code == 200
+    response = await client.delete(f"/api/tweets/{tweet.id}/likes")
+    assert response.status_code == 200
+
+    # Лента без чтения таблицы likes.
+    response = await client.get("/api/tweets", params={"include_likes": False})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tweets"][0]["like_count"] == 2
+    assert data["tweets"][0]["likes"] == []
+
+    # Лента с лайками.
+    response = await client.get("/api/tweets")
+    data = response.json()
+    assert data["tweets"][0]["like_count"] == 2
+    assert len(data["tweets"][0]["likes"]) == 2
+
+    # Лайк в обход API рассинхронизирует счётчик, пересчёт его восстановит.
+    async with db.get_sessionmaker() as session:
+        session.add(Like(user_id=users[5].id, tweet_id=tweet.id))
+        await session.commit()
+        await reconcile_counters(session)
+        tweet_q = await session.execute(
+            select(Tweet.like_count).where(Tweet.id == tweet.id)
+        )
+        assert tweet_q.scalar_one() == 3
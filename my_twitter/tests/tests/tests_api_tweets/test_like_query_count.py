@@ -0,0 +1,69 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_like_query_count(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем количество запросов к БД в роуте /api/tweets/<id>/likes (post и delete).
+    Ожидаем постоянное число запросов, не зависящее от количества лайков твита:
+    ID пользователя (только в первом запросе, дальше он берётся из кэша),
+    INSERT/DELETE лайка, изменение счётчика и оценки популярности.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        # Создадим твит, который лайкнули все, кроме main_user.
+        main_user = users[0]
+        tweet = Tweet(author=main_user, content="text")
+        session.add(tweet)
+        await session.commit()
+        session.add_all(
+            [Like(user_id=user.id, tweet_id=tweet.id) for user in users[1:]]
+        )
+        await session.commit()
+
+    client.headers["api-key"] = main_user.api_key
+    # Лайк.
+    with count_queries(db) as statements:
+        response = await client.post(f"/api/tweets/{tweet.id}/likes")
+    assert response.status_code == 200
+    assert len(statements) == 4
+
+    # Повторный лайк: INSERT ничего не вставил, счётчик не трогаем.
+    with count_queries(db) as statements:
+        response = await client.post(f"/api/tweets/{tweet.id}/likes")
+    assert response.status_code == 400
+    assert len(statements) == 1
+
+    # Дизлайк.
+    with count_queries(db) as statements:
+        response = await client.delete(f"/api/tweets/{tweet.id}/likes")
+    assert response.status_code == 200
+    assert len(statements) == 3
+
+    # Повторный дизлайк.
+    with count_queries(db) as statements:
+        response = await client.delete(f"/api/tweets/{tweet.id}/likes")
+    assert response.status_code == 400
+    assert len(statements) == 1
+
+    # Лайк несуществующего твита.
+    response = await client.post("/api/tweets/100500/likes")
+    assert response.status_code == 400
+
+    async with db.get_sessionmaker() as session:
+        like_count_q = await session.execute(
+            select(Tweet.like_count).where(Tweet.id == tweet.id)
+        )
+        assert like_count_q.scalar_one() == 0
@@ -0,0 +1,110 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Tweet, User
+from app.utils.pagination import MAX_PAGE_LIMIT, encode_cursor
+from app.utils.search import select_search_ids, select_search_truncated
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_search_tweets(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем полнотекстовый поиск (роут /api/tweets/search метод get).
+    Ожидаем твиты со всеми словами запроса от наиболее релевантных к наименее,
+    обход всех результатов по курсору, без учёта регистра и знаков препинания,
+    а удалённые и изменённые твиты ищутся по актуальному тексту.
+    Совпадения старше окна ранжирования помечаются в ответе truncated.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    contents = [
+        "Кошка спит на диване",
+        "КОШКА, кошка и ещё раз кошка!",
+        "собака спит",
+        "кошка ловит мышь, а собака спит",
+        "про погоду",
+    ]
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        tweets = [
+            Tweet(author=users[i], content=content)
+            for i, content in enumerate(contents)
+        ]
+        session.add_all(tweets)
+        await session.commit()
+    ids = [tweet.id for tweet in tweets]
+
+    response = await client.get("/api/tweets/search", params={"q": "кошка"})
+    assert response.status_code == 200
+    found = response.json()["tweets"]
+    assert found[0]["id"] == ids[1]
+    assert sorted(tweet["id"] for tweet in found) == [ids[0], ids[1], ids[3]]
+    assert found[0]["author"]["id"] == users[1].id
+    assert response.json()["next_cursor"] is None
+    assert response.json()["truncated"] is False
+
+    # В окно из двух самых новых совпадений не попадает самый старый твит.
+    async with db.get_sessionmaker() as session:
+        for window, truncated in ((2, True), (3, False)):
+            truncated_q = await session.execute(
+                select_search_truncated("sqlite", ["кошка"], window)
+            )
+            assert (truncated_q.first() is not None) is truncated
+
+    response = await client.get("/api/tweets/search", params={"q": "Спит, собака!"})
+    assert sorted(tweet["id"] for tweet in response.json()["tweets"]) == [
+        ids[2],
+        ids[3],
+    ]
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"q": "спит", "limit": 1}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get("/api/tweets/search", params=params)
+        pages.extend(tweet["id"] for tweet in response.json()["tweets"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(pages) == [ids[0], ids[2], ids[3]]
+    assert len(set(pages)) == len(pages)
+
+    await client.delete(f"/api/tweets/{ids[1]}", headers={"api-key": users[1].api_key})
+    async with db.get_sessionmaker() as session:
+        tweet = await session.get(Tweet, ids[4])
+        tweet.content = "кошка и погода"
+        await session.commit()
+    response = await client.get("/api/tweets/search", params={"q": "кошка"})
+    assert sorted(tweet["id"] for tweet in response.json()["tweets"]) == [
+        ids[0],
+        ids[3],
+        ids[4],
+    ]
+
+    response = await client.get("/api/tweets/search", params={"q": "?!"})
+    assert response.status_code == 400
+    response = await client.get(
+        "/api/tweets/search", params={"q": "кошка", "limit": MAX_PAGE_LIMIT + 1}
+    )
+    assert response.status_code == 422
+    response = await client.get(
+        "/api/tweets/search", params={"q": "кошка", "cursor": "xxx"}
+    )
+    assert response.status_code == 400
+
+    sql = str(
+        select_search_ids(
+            "postgresql", ["кошка", "спит"], 10, encode_cursor(0.5, 1), 100
+        ).compile(dialect=postgresql.dialect())
+    )
+    assert "search_vector @@ to_tsquery" in sql
+    assert "ts_rank_cd" in sql
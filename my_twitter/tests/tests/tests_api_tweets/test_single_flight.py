@@ -0,0 +1,116 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Tweet, User
+from app.settings.classes import Settings
+from app.utils.single_flight import SingleFlight
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_single_flight_routes(settings: Settings, db: Database) -> None:
+    """
+    Проверяем объединение одновременных запросов в роутах /api/tweets, /api/users/me и /api/users/<id>.
+    Ожидаем, что одинаковые одновременные запросы выполняют один запрос к БД
+    и получают одинаковые ответы.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    app = get_app(settings=replace(settings, FEED_CACHE_ENABLED=False), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    single_flight = app.get_single_flight()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        session.add_all([Tweet(author=user, content=user.api_key) for user in users])
+        await session.commit()
+
+    # Лента: 10 одновременных запросов одной страницы.
+    single = await client.get("/api/tweets")
+    with count_queries(db) as single_statements:
+        await client.get("/api/tweets")
+    with count_queries(db) as statements:
+        responses = await asyncio.gather(
+            *[client.get("/api/tweets") for _ in range(10)]
+        )
+    assert {response.content for response in responses} == {single.content}
+    assert len(statements) == len(single_statements)
+    assert single_flight.coalesced == 9
+
+    # Профиль: /users/me и /users/<id> одного пользователя объединяются.
+    client.headers["api-key"] = users[0].api_key
+    await client.get("/api/users/me")  # Прогреваем кэш пользователя.
+    responses = await asyncio.gather(
+        *[client.get("/api/users/me") for _ in range(5)],
+        *[client.get(f"/api/users/{users[0].id}") for _ in range(5)],
+    )
+    assert len({response.content for response in responses}) == 1
+    assert responses[0].json()["user"]["id"] == users[0].id
+    assert single_flight.coalesced == 18
+    assert single_flight.in_flight == 0
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_single_flight() -> None:
+    """
+    Проверяем SingleFlight.
+    Ожидаем, что ошибка пробрасывается всем ожидающим, отмена одного ожидающего
+    не отменяет работу для остальных, а отмена всех ожидающих отменяет работу.
+
+    :return: None.
+    """
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    started = 0
+
+    async def work() -> int:
+        nonlocal started
+        started += 1
+        await release.wait()
+        return started
+
+    async def fail() -> int:
+        await release.wait()
+        raise ValueError("boom")
+
+    # Ошибка у всех ожидающих.
+    waiters = [asyncio.create_task(single_flight.do("fail", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.in_flight == 0
+
+    # Отмена первого ожидающего не мешает второму.
+    release.clear()
+    first = asyncio.create_task(single_flight.do("work", work))
+    second = asyncio.create_task(single_flight.do("work", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == 1
+    assert first.cancelled()
+    assert started == 1
+
+    # Отмена всех ожидающих отменяет работу.
+    release.clear()
+    waiter = asyncio.create_task(single_flight.do("work", work))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert single_flight.cancelled == 1
+    await asyncio.sleep(0)
+    assert single_flight.in_flight == 0
+    assert (single_flight.calls, single_flight.coalesced) == (3, 3)
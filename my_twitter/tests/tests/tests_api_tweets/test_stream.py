@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from app.application.classes import CustomFastApi
+from app.database.database import Database
+from app.database.models import User
+from app.utils.event_hub import (
+    NOTIFY_MAX_PAYLOAD,
+    StreamSubscriber,
+    decode_notify_payload,
+    encode_notify_payloads,
+    sse_frame,
+)
+from httpx import AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_stream(app: CustomFastApi, client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем поток событий ленты (роут /api/tweets/stream).
+    Ожидаем, что клиент получает новый твит в формате ленты и изменения количества лайков,
+    а после отключения клиента подписка удаляется.
+
+    :param app: CustomFastApi.
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    event_hub = app.get_event_hub()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    client.headers["api-key"] = users[0].api_key
+
+    # Поток читаем напрямую через ASGI: httpx ASGITransport дожидается конца ответа.
+    chunks: asyncio.Queue[bytes] = asyncio.Queue()
+    disconnect = asyncio.Event()
+    messages: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        if not messages:
+            messages.append({})
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+        if message["type"] == "http.response.body" and message.get("body"):
+            await chunks.put(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/tweets/stream",
+        "raw_path": b"/api/tweets/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    stream = asyncio.create_task(app(scope, receive, send))
+    assert await asyncio.wait_for(chunks.get(), 1) == b"retry: 3000\n\n"
+    start = next(m for m in messages if m.get("type") == "http.response.start")
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    assert event_hub.subscribers == 1
+
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "в поток", "tweet_media_ids": []}
+    )
+    tweet_id = response.json()["tweet_id"]
+    feed = await client.get("/api/tweets")
+    tweet = feed.json()["tweets"][0]
+    assert await asyncio.wait_for(chunks.get(), 1) == sse_frame("tweet", tweet)
+
+    await client.post(f"/api/tweets/{tweet_id}/likes")
+    await client.post(f"/api/users/{users[1].id}/follow")  # Не событие ленты.
+    assert await asyncio.wait_for(chunks.get(), 1) == sse_frame(
+        "like_count", {"id": tweet_id, "like_count": 1}
+    )
+
+    disconnect.set()
+    await asyncio.wait_for(stream, 1)
+    assert event_hub.subscribers == 0
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_stream_subscriber_and_notify_payload() -> None:
+    """
+    Проверяем очередь подписчика потока и упаковку событий для NOTIFY.
+    Ожидаем, что при переполнении очереди отбрасываются самые старые кадры и клиент
+    получает событие dropped, а события NOTIFY разбиваются на части допустимого размера.
+
+    :return: None.
+    """
+    subscriber = StreamSubscriber(max_size=2)
+    assert await subscriber.get(0.01) == []
+    for i in range(5):
+        subscriber.put(sse_frame("like_count", {"id": i, "like_count": 1}))
+    assert await subscriber.get(0.01) == [
+        sse_frame("dropped", {"count": 3}),
+        sse_frame("like_count", {"id": 3, "like_count": 1}),
+        sse_frame("like_count", {"id": 4, "like_count": 1}),
+    ]
+    subscriber.put(b"frame")
+    assert await subscriber.get(0.01) == [b"frame"]
+    assert subscriber.dropped_total == 3
+
+    events = {
+        "t": dict.fromkeys([1, 2]),
+        "l": dict.fromkeys(range(10**6, 10**6 + 3000)),
+    }
+    payloads = encode_notify_payloads(events)
+    assert len(payloads) > 1
+    assert all(len(payload) <= NOTIFY_MAX_PAYLOAD for payload in payloads)
+    decoded = [decode_notify_payload(payload) for payload in payloads]
+    assert [i for part in decoded for i in part["t"]] == [1, 2]
+    assert [i for part in decoded for i in part["l"]] == list(events["l"])
+    with pytest.raises(ValueError):
+        decode_notify_payload("x:1")
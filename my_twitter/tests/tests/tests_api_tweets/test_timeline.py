@@ -0,0 +1,78 @@
+import pytest
+from app.database.database import Database
+from app.database.models import User
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_timeline(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роут /api/tweets/timeline метод get.
+    Ожидаем, что в домашнюю ленту попадают твиты авторов, на которых подписан пользователь,
+    и его собственные твиты, а после отписки твиты автора из ленты пропадают.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    # Определим пользователей для теста.
+    main_user, author, stranger = users[0], users[1], users[2]
+
+    # Автор пишет твит до подписки (попадёт в ленту при подписке).
+    client.headers["api-key"] = author.api_key
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "old", "tweet_media_ids": []}
+    )
+    old_tweet_id = response.json()["tweet_id"]
+
+    # Подписываемся на автора.
+    client.headers["api-key"] = main_user.api_key
+    response = await client.post(f"/api/users/{author.id}/follow")
+    assert response.status_code == 200
+
+    # Автор и посторонний пользователь пишут твиты.
+    client.headers["api-key"] = author.api_key
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "new", "tweet_media_ids": []}
+    )
+    new_tweet_id = response.json()["tweet_id"]
+    client.headers["api-key"] = stranger.api_key
+    await client.post(
+        "/api/tweets", json={"tweet_data": "stranger", "tweet_media_ids": []}
+    )
+    # Свой твит.
+    client.headers["api-key"] = main_user.api_key
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "mine", "tweet_media_ids": []}
+    )
+    my_tweet_id = response.json()["tweet_id"]
+
+    # Читаем ленту по одному твиту на страницу.
+    received = []
+    params = {"limit": 1}
+    while True:
+        response = await client.get("/api/tweets/timeline", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        received.extend(tweet["id"] for tweet in data["tweets"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert received == [my_tweet_id, new_tweet_id, old_tweet_id]
+
+    # Отписываемся: твиты автора пропадают из ленты.
+    response = await client.delete(f"/api/users/{author.id}/follow")
+    assert response.status_code == 200
+    response = await client.get("/api/tweets/timeline")
+    assert [tweet["id"] for tweet in response.json()["tweets"]] == [my_tweet_id]
+
+    for limit in (0, -1, MAX_PAGE_LIMIT + 1):
+        response = await client.get("/api/tweets/timeline", params={"limit": limit})
+        assert response.status_code == 422
@@ -0,0 +1,140 @@
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Timeline, User
+from app.settings.classes import Settings
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_timeline_hybrid(settings: Settings, db: Database) -> None:
+    """
+    Проверяем роут /api/tweets/timeline метод get при гибридной раздаче ленты.
+    Ожидаем, что твиты автора с числом подписчиков больше порога не разносятся по лентам,
+    но подмешиваются в ленту подписчика при чтении в правильном порядке.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    app = get_app(settings=replace(settings, FAN_OUT_PULL_THRESHOLD=1), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    # Определим пользователей для теста.
+    main_user, star, regular, fan = users[0], users[1], users[2], users[3]
+
+    # У star 2 подписчика (больше порога), у regular 1 подписчик.
+    for follower, author in ((main_user, star), (fan, star), (main_user, regular)):
+        client.headers["api-key"] = follower.api_key
+        response = await client.post(f"/api/users/{author.id}/follow")
+        assert response.status_code == 200
+
+    # Твиты по очереди от обоих авторов.
+    tweet_ids = []
+    for author in (star, regular, star, regular, star):
+        client.headers["api-key"] = author.api_key
+        response = await client.post(
+            "/api/tweets", json={"tweet_data": "text", "tweet_media_ids": []}
+        )
+        tweet_ids.append(response.json()["tweet_id"])
+
+    # Твиты star есть только в ленте самого star.
+    async with db.get_sessionmaker() as session:
+        star_rows_q = await session.execute(
+            select(func.count(Timeline.id)).where(Timeline.author_id == star.id)
+        )
+        assert star_rows_q.scalar_one() == 3
+
+    # Лента main_user содержит твиты обоих авторов в порядке создания (новые первыми).
+    client.headers["api-key"] = main_user.api_key
+    received = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/api/tweets/timeline", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        received.extend(tweet["id"] for tweet in data["tweets"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert received == tweet_ids[::-1]
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_timeline_mode_switch(settings: Settings, db: Database) -> None:
+    """
+    Проверяем роут /api/tweets/timeline метод get, когда автор пересекает порог FAN_OUT_PULL_THRESHOLD
+    в обе стороны. Ожидаем, что ни один твит автора не пропадает из ленты подписчика:
+    при переходе в pull-режим разнесённые твиты остаются в ленте, а при возврате в push-режим
+    твиты, опубликованные в pull-режиме, разносятся по лентам подписчиков.
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    app = get_app(settings=replace(settings, FAN_OUT_PULL_THRESHOLD=1), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    # Определим пользователей для теста.
+    main_user, author, fan = users[0], users[1], users[2]
+
+    async def post_tweet() -> int:
+        client.headers["api-key"] = author.api_key
+        response = await client.post(
+            "/api/tweets", json={"tweet_data": "text", "tweet_media_ids": []}
+        )
+        return int(response.json()["tweet_id"])
+
+    async def timeline(user: User) -> list[int]:
+        client.headers["api-key"] = user.api_key
+        response = await client.get("/api/tweets/timeline")
+        assert response.status_code == 200
+        return [tweet["id"] for tweet in response.json()["tweets"]]
+
+    async def pushed(user: User) -> int:
+        async with db.get_sessionmaker() as session:
+            rows_q = await session.execute(
+                select(func.count(Timeline.id)).where(
+                    Timeline.user_id == user.id, Timeline.author_id == author.id
+                )
+            )
+            return rows_q.scalar_one()
+
+    # Push-режим: у автора 1 подписчик, твит разносится по ленте.
+    client.headers["api-key"] = main_user.api_key
+    response = await client.post(f"/api/users/{author.id}/follow")
+    assert response.status_code == 200
+    tweet_ids = [await post_tweet()]
+    assert await pushed(main_user) == 1
+
+    # Переход в pull-режим: второму подписчику лента не дозаполняется,
+    # новый твит не разносится, но оба твита видны обоим подписчикам.
+    client.headers["api-key"] = fan.api_key
+    response = await client.post(f"/api/users/{author.id}/follow")
+    assert response.status_code == 200
+    assert await pushed(fan) == 0
+    tweet_ids.append(await post_tweet())
+    assert await pushed(main_user) == 1
+    assert await timeline(main_user) == tweet_ids[::-1]
+    assert await timeline(fan) == tweet_ids[::-1]
+
+    # Возврат в push-режим: твит, опубликованный в pull-режиме, разносится по ленте оставшегося подписчика.
+    client.headers["api-key"] = fan.api_key
+    response = await client.delete(f"/api/users/{author.id}/follow")
+    assert response.status_code == 200
+    assert await pushed(main_user) == 2
+    tweet_ids.append(await post_tweet())
+    assert await pushed(main_user) == 3
+    assert await timeline(main_user) == tweet_ids[::-1]
+    assert await timeline(fan) == []
@@ -0,0 +1,81 @@
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.settings.classes import Settings
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_tweet_likes(settings: Settings, db: Database) -> None:
+    """
+    Проверяем роут /api/tweets/<id>/likes метод get и ограничение лайков в ленте.
+    Ожидаем, что лента содержит только первые LIKES_PREVIEW_LIMIT лайков и полное количество
+    (без ограничения по умолчанию - все лайки),
+    а постраничный обход лайков вернёт всех лайкнувших в порядке лайков
+    (лимит вне диапазона 1..MAX_PAGE_LIMIT отклоняется с 422).
+
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    app = get_app(settings=replace(settings, LIKES_PREVIEW_LIMIT=3), db=db)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        # Два твита: популярный (лайк от каждого пользователя) и с одним лайком.
+        popular = Tweet(author=users[0], content="popular")
+        regular = Tweet(author=users[1], content="regular")
+        session.add_all([popular, regular])
+        await session.commit()
+        likes = [Like(user_id=user.id, tweet_id=popular.id) for user in users]
+        likes.append(Like(user_id=users[2].id, tweet_id=regular.id))
+        session.add_all(likes)
+        await session.commit()
+    popular_likers = [user.id for user in users]
+
+    # Лента содержит только первые 3 лайка популярного твита.
+    response = await client.get("/api/tweets")
+    assert response.status_code == 200
+    tweets = {tweet["id"]: tweet for tweet in response.json()["tweets"]}
+    preview = [like["user_id"] for like in tweets[popular.id]["likes"]]
+    assert preview == popular_likers[:3]
+    assert [like["user_id"] for like in tweets[regular.id]["likes"]] == [users[2].id]
+
+    # По умолчанию лента содержит все лайки: по ним встроенный фронтенд считает лайки и ищет свой лайк.
+    default_app = get_app(settings=settings, db=db)
+    default_client = AsyncClient(
+        transport=ASGITransport(app=default_app), base_url="http://test"
+    )
+    response = await default_client.get("/api/tweets")
+    assert response.status_code == 200
+    tweets = {tweet["id"]: tweet for tweet in response.json()["tweets"]}
+    assert [like["user_id"] for like in tweets[popular.id]["likes"]] == popular_likers
+
+    # Постраничный обход лайков популярного твита.
+    received = []
+    params = {"limit": 4}
+    while True:
+        response = await client.get(f"/api/tweets/{popular.id}/likes", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] is True
+        assert all(like["name"] for like in data["likes"])
+        received.extend(like["user_id"] for like in data["likes"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert received == popular_likers
+
+    for limit in (0, -1, MAX_PAGE_LIMIT + 1):
+        response = await client.get(
+            f"/api/tweets/{popular.id}/likes", params={"limit": limit}
+        )
+        assert response.status_code == 422
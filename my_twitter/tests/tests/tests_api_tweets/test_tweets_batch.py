@@ -0,0 +1,77 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.routers.app_routers.schemas.tweets import (
+    MAX_BATCH_TWEETS,
+    OutResponseTweetBatch,
+    OutTweet,
+)
+from app.settings.classes import Settings
+from app.utils.feed import load_feed_tweets
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_tweets
+@pytest.mark.asyncio
+async def test_tweets_batch(
+    client: AsyncClient, settings: Settings, db: Database
+) -> None:
+    """
+    Проверяем загрузку твитов по ID (роут /api/tweets/batch метод post).
+    Ожидаем твиты в формате ленты в порядке запроса без повторов,
+    несуществующие ID в missing_ids и постоянное число запросов к БД.
+
+    :param client: AsyncClient.
+    :param settings: Settings.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        tweets = [Tweet(author=user, content=user.api_key) for user in users[:4]]
+        session.add_all(tweets)
+        await session.commit()
+        session.add(Like(user_id=users[0].id, tweet_id=tweets[2].id))
+        tweets[2].like_count = 1
+        await session.commit()
+        ids = [tweet.id for tweet in tweets]
+        feed = await load_feed_tweets(session, settings, 1, 10, None, True)
+    by_id = {
+        tweet.id: OutTweet.model_validate(tweet).set_settings(settings)
+        for tweet in feed
+    }
+
+    requested = [ids[2], 100500, ids[0], ids[2], ids[3]]
+    with count_queries(db) as statements:
+        response = await client.post("/api/tweets/batch", json={"ids": requested})
+    assert response.status_code == 200
+    assert len(statements) == 3
+    assert response.content == (
+        OutResponseTweetBatch(
+            tweets=[by_id[ids[2]], by_id[ids[0]], by_id[ids[3]]],
+            missing_ids=[100500],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+    response = await client.post(
+        "/api/tweets/batch",
+        params={"include_likes": False},
+        json={"ids": [ids[2]]},
+    )
+    assert response.json()["tweets"][0]["likes"] == []
+    assert response.json()["tweets"][0]["like_count"] == 1
+
+    response = await client.post("/api/tweets/batch", json={"ids": [100500]})
+    assert response.json() == {"result": True, "tweets": [], "missing_ids": [100500]}
+    response = await client.post("/api/tweets/batch", json={"ids": []})
+    assert response.status_code == 422
+    response = await client.post(
+        "/api/tweets/batch", json={"ids": list(range(1, MAX_BATCH_TWEETS + 2))}
+    )
+    assert response.status_code == 422
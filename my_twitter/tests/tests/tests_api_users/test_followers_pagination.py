@@ -0,0 +1,89 @@
+import pytest
+from app.database.database import Database
+from app.database.models import User
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_followers_pagination(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роуты api/users/<id>/followers и api/users/<id>/following и профиль без списков.
+    Ожидаем, что профиль по умолчанию содержит только количество подписчиков и подписок,
+    а списки отдаются постранично по курсору без повторов и пропусков
+    (лимит вне диапазона 1..MAX_PAGE_LIMIT отклоняется с 422).
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+    main_user = users[0]
+    # На main_user подписываются 7 пользователей, сам он подписан на 2-х.
+    for user in users[1:8]:
+        client.headers["api-key"] = user.api_key
+        response = await client.post(f"/api/users/{main_user.id}/follow")
+        assert response.status_code == 200
+    client.headers["api-key"] = main_user.api_key
+    for user in users[8:10]:
+        response = await client.post(f"/api/users/{user.id}/follow")
+        assert response.status_code == 200
+
+    # Профиль без списков.
+    response = await client.get("/api/users/me", params={"include_lists": False})
+    assert response.status_code == 200
+    profile = response.json()["user"]
+    assert profile["followers_count"] == 7
+    assert profile["following_count"] == 2
+    assert "followers" not in profile
+    assert "following" not in profile
+    response = await client.get(
+        f"/api/users/{users[8].id}", params={"include_lists": False}
+    )
+    profile = response.json()["user"]
+    assert profile["followers_count"] == 1
+    assert profile["following_count"] == 0
+
+    # Подписчики постранично.
+    followers = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get(
+            f"/api/users/{main_user.id}/followers", params=params
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["users"]) <= 3
+        followers.extend(user["id"] for user in data["users"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert followers == [user.id for user in users[1:8]]
+
+    # Подписки.
+    response = await client.get(f"/api/users/{main_user.id}/following")
+    data = response.json()
+    assert [user["id"] for user in data["users"]] == [user.id for user in users[8:10]]
+    assert data["users"][0]["name"]
+    assert data["next_cursor"] is None
+
+    # Неверный курсор.
+    response = await client.get(
+        f"/api/users/{main_user.id}/followers", params={"cursor": "bad"}
+    )
+    assert response.status_code == 400
+
+    for path in ("followers", "following"):
+        for limit in (0, -1, MAX_PAGE_LIMIT + 1):
+            response = await client.get(
+                f"/api/users/{main_user.id}/{path}", params={"limit": limit}
+            )
+            assert response.status_code == 422
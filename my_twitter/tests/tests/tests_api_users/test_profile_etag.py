@@ -0,0 +1,72 @@
+import pytest
+from app.database.database import Database
+from app.database.models import User
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_profile_etag(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем ETag профиля (роуты /api/users/me и /api/users/<id> метод get).
+    Ожидаем, что повтор с If-None-Match возвращает 304 без тела и без запросов к БД,
+    а подписка и отписка меняют ETag профилей обоих пользователей.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    main_user, another_user = users[0], users[5]
+    client.headers["api-key"] = main_user.api_key
+
+    response = await client.get("/api/users/me")
+    etag = response.headers["etag"]
+    with count_queries(db) as statements:
+        response = await client.get("/api/users/me", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert statements == []
+    # /users/<id> того же пользователя - тот же ресурс, другой include_lists - другой ETag.
+    response = await client.get(
+        f"/api/users/{main_user.id}", headers={"if-none-match": etag}
+    )
+    assert response.status_code == 304
+    response = await client.get(
+        "/api/users/me",
+        params={"include_lists": False},
+        headers={"if-none-match": etag},
+    )
+    assert response.status_code == 200
+    lists_etag = response.headers["etag"]
+    other = await client.get(f"/api/users/{another_user.id}")
+    other_etag = other.headers["etag"]
+
+    # Подписка меняет оба профиля.
+    await client.post(f"/api/users/{another_user.id}/follow")
+    response = await client.get("/api/users/me", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["user"]["following_count"] == 1
+    etag = response.headers["etag"]
+    response = await client.get(
+        "/api/users/me",
+        params={"include_lists": False},
+        headers={"if-none-match": lists_etag},
+    )
+    assert response.status_code == 200
+    response = await client.get(
+        f"/api/users/{another_user.id}", headers={"if-none-match": other_etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["user"]["followers_count"] == 1
+
+    # Отписка тоже.
+    await client.delete(f"/api/users/{another_user.id}/follow")
+    response = await client.get("/api/users/me", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["user"]["following_count"] == 0
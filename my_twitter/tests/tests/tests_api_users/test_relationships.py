@@ -0,0 +1,73 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Subscriptions, Tweet, User
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_relationships(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роут api/users/relationships и признак followed_by_me в ленте.
+    Ожидаем флаги подписки, обратной подписки и взаимности в порядке запроса
+    за один запрос к subscriptions, ограничение на количество ID
+    и followed_by_me у твитов только по запросу.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        main_user = users[0]
+        # main_user -> 1, 2; 2, 3 -> main_user.
+        session.add_all(
+            [
+                Subscriptions(user_id=main_user.id, follower_id=users[1].id),
+                Subscriptions(user_id=main_user.id, follower_id=users[2].id),
+                Subscriptions(user_id=users[2].id, follower_id=main_user.id),
+                Subscriptions(user_id=users[3].id, follower_id=main_user.id),
+            ]
+        )
+        session.add_all([Tweet(author=users[i], content=str(i)) for i in range(1, 5)])
+        await session.commit()
+
+    client.headers["api-key"] = main_user.api_key
+    # Прогреваем кэш пользователя.
+    await client.get("/api/tweets/timeline")
+    ids = [users[4].id, users[3].id, users[2].id, users[1].id]
+    with count_queries(db) as statements:
+        response = await client.get("/api/users/relationships", params={"ids": ids})
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert response.json()["relationships"] == [
+        {"id": users[4].id, "following": False, "followed_by": False, "mutual": False},
+        {"id": users[3].id, "following": False, "followed_by": True, "mutual": False},
+        {"id": users[2].id, "following": True, "followed_by": True, "mutual": True},
+        {"id": users[1].id, "following": True, "followed_by": False, "mutual": False},
+    ]
+
+    # Слишком много ID.
+    response = await client.get(
+        "/api/users/relationships", params={"ids": list(range(1, 102))}
+    )
+    assert response.status_code == 422
+
+    # followed_by_me в ленте.
+    response = await client.get("/api/tweets")
+    assert {tweet["followed_by_me"] for tweet in response.json()["tweets"]} == {None}
+    response = await client.get("/api/tweets", params={"include_followed_by_me": True})
+    followed_by_me = {
+        tweet["author"]["id"]: tweet["followed_by_me"]
+        for tweet in response.json()["tweets"]
+    }
+    assert followed_by_me == {
+        users[1].id: True,
+        users[2].id: True,
+        users[3].id: False,
+        users[4].id: False,
+    }
@@ -0,0 +1,69 @@
+import pytest
+from app.database.database import Database
+from app.database.models import Subscriptions, User
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_subscription_query_count(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем количество запросов к БД в роуте api/users/<id>/follow (post и delete).
+    Ожидаем постоянное число запросов, не зависящее от количества подписок:
+    INSERT/DELETE подписки, изменение счётчика и изменение ленты,
+    а при повторе, подписке на себя или на несуществующего пользователя - один запрос и 400.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+        main_user, another_user = users[0], users[5]
+        # main_user подписан на всех, кроме another_user.
+        session.add_all(
+            [
+                Subscriptions(user_id=main_user.id, follower_id=user.id)
+                for user in users[1:]
+                if user is not another_user
+            ]
+        )
+        await session.commit()
+
+    client.headers["api-key"] = main_user.api_key
+    # Прогреваем кэш пользователя.
+    response = await client.get("/api/users/me")
+    assert response.status_code == 200
+
+    # Подписка.
+    with count_queries(db) as statements:
+        response = await client.post(f"/api/users/{another_user.id}/follow")
+    assert response.status_code == 200
+    assert len(statements) == 3
+
+    # Повторная подписка, подписка на себя и на несуществующего пользователя.
+    for user_id in (another_user.id, main_user.id, 100500):
+        with count_queries(db) as statements:
+            response = await client.post(f"/api/users/{user_id}/follow")
+        assert response.status_code == 400
+        assert len(statements) == 1
+
+    # Отписка.
+    with count_queries(db) as statements:
+        response = await client.delete(f"/api/users/{another_user.id}/follow")
+    assert response.status_code == 200
+    assert len(statements) == 3
+
+    # Повторная отписка.
+    response = await client.delete(f"/api/users/{another_user.id}/follow")
+    assert response.status_code == 400
+
+    async with db.get_sessionmaker() as session:
+        user_q = await session.execute(
+            select(User.followers_count).where(User.id == another_user.id)
+        )
+        assert user_q.scalar_one() == 0
@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+from app.application.factory_function import get_app
+from app.database.database import Database
+from app.database.models import Subscriptions, User
+from app.settings.classes import Settings
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+
+@pytest.mark.api_users
+@pytest.mark.parametrize("compact_threshold", [10000, 1])
+@pytest.mark.asyncio
+async def test_suggestions(
+    settings: Settings, db: Database, compact_threshold: int
+) -> None:
+    """
+    Проверяем роут api/users/me/suggestions.
+    Ожидаем друзей друзей по убыванию количества общих связей без самого пользователя
+    и его подписок, а также учёт подписок и отписок после построения графа
+    (в том числе со слиянием изменений в CSR после каждой операции),
+    а также сохранение изменений, пришедших во время фонового слияния.
+
+    :param settings: Settings.
+    :param db: Database.
+    :param compact_threshold: Порог слияния изменений графа.
+    :return: None.
+    """
+    app = get_app(
+        settings=replace(settings, FOLLOW_GRAPH_COMPACT_THRESHOLD=compact_threshold),
+        db=db,
+    )
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        a, b, c, d, e, f = users_q.scalars().all()[:6]
+        # a -> b, c; b -> a, d, e; c -> d, f.
+        session.add_all(
+            [
+                Subscriptions(user_id=user.id, follower_id=author.id)
+                for user, author in [
+                    (a, b),
+                    (a, c),
+                    (b, a),
+                    (b, d),
+                    (b, e),
+                    (c, d),
+                    (c, f),
+                ]
+            ]
+        )
+        await session.commit()
+
+    async def suggestions() -> list[tuple[int, int]]:
+        response = await client.get("/api/users/me/suggestions")
+        assert response.status_code == 200
+        return [(user["id"], user["mutual_count"]) for user in response.json()["users"]]
+
+    client.headers["api-key"] = a.api_key
+    assert await suggestions() == [(d.id, 2), (e.id, 1), (f.id, 1)]
+    response = await client.get("/api/users/me/suggestions", params={"limit": 1})
+    assert response.json()["users"][0]["name"]
+    assert len(response.json()["users"]) == 1
+    for limit in (-1, MAX_PAGE_LIMIT + 1):
+        response = await client.get(
+            "/api/users/me/suggestions", params={"limit": limit}
+        )
+        assert response.status_code == 422
+
+    # Подписка убирает кандидата.
+    response = await client.post(f"/api/users/{e.id}/follow")
+    assert response.status_code == 200
+    assert await suggestions() == [(d.id, 2), (f.id, 1)]
+
+    # Отписка убирает связи через автора.
+    response = await client.delete(f"/api/users/{c.id}/follow")
+    assert response.status_code == 200
+    assert await suggestions() == [(d.id, 1)]
+
+    # Повторная подписка возвращает их.
+    response = await client.post(f"/api/users/{c.id}/follow")
+    assert response.status_code == 200
+    assert await suggestions() == [(d.id, 2), (f.id, 1)]
+
+    # Слияние в CSR не меняет граф, отписка во время слияния не теряется.
+    graph = app.get_follow_graph()
+    await graph.compact()
+    assert graph.edges == 8
+    compaction = asyncio.create_task(graph.compact())
+    await asyncio.sleep(0)
+    graph.unfollow(a.id, e.id)
+    await compaction
+    assert not graph.is_following(a.id, e.id)
+    assert sorted(graph.following(a.id)) == sorted([b.id, c.id])
+    await graph.compact()
+    assert graph.edges == 7
+    assert sorted(graph.following(a.id)) == sorted([b.id, c.id])
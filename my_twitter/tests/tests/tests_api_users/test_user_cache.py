@@ -0,0 +1,78 @@
+import pytest
+from app.application.classes import CustomFastApi
+from app.database.database import Database
+from app.database.models import User
+from app.utils.user_cache import UserIdentity
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_user_cache(
+    app: CustomFastApi, client: AsyncClient, db: Database
+) -> None:
+    """
+    Проверяем кэш пользователей по api_key.
+    Ожидаем, что повторный запрос не идёт в БД за пользователем,
+    неизвестный api_key кэшируется как отрицательная запись,
+    подписка запись не меняет (в ней только id и api_key), а удаление пользователя её сбрасывает.
+
+    :param app: CustomFastApi.
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    user_cache = app.get_user_cache()
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User))
+        users = users_q.scalars().all()
+    main_user, another_user = users[0], users[5]
+
+    # Первый запрос ищет пользователя в БД, второй - нет.
+    client.headers["api-key"] = main_user.api_key
+    with count_queries(db) as first:
+        response = await client.get("/api/tweets/timeline")
+    assert response.status_code == 200
+    with count_queries(db) as second:
+        response = await client.get("/api/tweets/timeline")
+    assert response.status_code == 200
+    assert len(second) == len(first) - 1
+    assert not any("WHERE users.api_key" in statement for statement in second)
+    assert user_cache.get(main_user.api_key) == (
+        True,
+        UserIdentity(id=main_user.id, api_key=main_user.api_key),
+    )
+
+    # Неизвестный api_key: тестовый пользователь, ключ закэширован как отсутствующий.
+    client.headers["api-key"] = "unknown"
+    response = await client.post(
+        "/api/tweets", json={"tweet_data": "text", "tweet_media_ids": []}
+    )
+    assert response.status_code == 200
+    assert user_cache.get("unknown") == (True, None)
+    with count_queries(db) as statements:
+        response = await client.get("/api/tweets/timeline")
+    assert response.status_code == 200
+    assert not any("WHERE users.api_key" in statement for statement in statements)
+
+    # Подписка не сбрасывает запись и не ищет пользователя в БД.
+    client.headers["api-key"] = main_user.api_key
+    with count_queries(db) as statements:
+        response = await client.post(f"/api/users/{another_user.id}/follow")
+    assert response.status_code == 200
+    assert not any("WHERE users.api_key" in statement for statement in statements)
+    assert user_cache.get(main_user.api_key)[0] is True
+
+    # Удаление пользователя сбрасывает его запись.
+    deleted_user = users[7]
+    client.headers["api-key"] = deleted_user.api_key
+    response = await client.get("/api/tweets/timeline")
+    assert response.status_code == 200
+    assert user_cache.get(deleted_user.api_key)[0] is True
+    async with db.get_sessionmaker() as session:
+        await session.delete(await session.get(User, deleted_user.id))
+        await session.commit()
+    assert user_cache.get(deleted_user.api_key) == (False, None)
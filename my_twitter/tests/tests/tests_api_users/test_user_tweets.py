@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+from app.database.database import Database
+from app.database.models import Like, Tweet, User
+from app.utils.pagination import MAX_PAGE_LIMIT
+from httpx import AsyncClient
+from sqlalchemy import select
+from tests.utils import count_queries
+
+
+@pytest.mark.api_users
+@pytest.mark.asyncio
+async def test_user_tweets(client: AsyncClient, db: Database) -> None:
+    """
+    Проверяем роут api/users/<id>/tweets.
+    Ожидаем только твиты автора от новых к старым в формате ленты,
+    обход всех твитов по курсору без повторов и пропусков (в том числе при одинаковом created)
+    и постоянное число запросов к БД без чтения подписок.
+
+    :param client: AsyncClient.
+    :param db: Database.
+    :return: None.
+    """
+    created = datetime(2026, 1, 1)
+    async with db.get_sessionmaker() as session:
+        # Получим всех пользователей.
+        users_q = await session.execute(select(User).order_by(User.id))
+        users = users_q.scalars().all()
+        author, other = users[0], users[1]
+        # У автора 5 твитов с одинаковым временем создания, у другого пользователя - 2.
+        tweets = [
+            Tweet(author=author, content=f"author {i}", created=created)
+            for i in range(5)
+        ]
+        tweets += [Tweet(author=other, content=f"other {i}") for i in range(2)]
+        session.add_all(tweets)
+        await session.commit()
+        session.add(Like(user_id=other.id, tweet_id=tweets[1].id))
+        tweets[1].like_count = 1
+        await session.commit()
+        author_ids = [tweet.id for tweet in tweets[:5]]
+
+    with count_queries(db) as statements:
+        response = await client.get(
+            f"/api/users/{author.id}/tweets", params={"limit": 10}
+        )
+    assert response.status_code == 200
+    assert len(statements) == 3
+    assert not any("subscriptions" in statement for statement in statements)
+    page = response.json()
+    assert [tweet["id"] for tweet in page["tweets"]] == author_ids[::-1]
+    assert {tweet["author"]["id"] for tweet in page["tweets"]} == {author.id}
+    assert page["tweets"][3]["like_count"] == 1
+    assert page["tweets"][3]["likes"][0]["user_id"] == other.id
+    assert page["next_cursor"] is None
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get(f"/api/users/{author.id}/tweets", params=params)
+        pages.append([tweet["id"] for tweet in response.json()["tweets"]])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [author_ids[:2:-1], author_ids[2:0:-1], author_ids[:1]]
+
+    response = await client.get("/api/users/100500/tweets")
+    assert response.json() == {"result": True, "tweets": [], "next_cursor": None}
+    response = await client.get(
+        f"/api/users/{author.id}/tweets", params={"cursor": "xxx"}
+    )
+    assert response.status_code == 400
+    response = await client.get(
+        f"/api/users/{author.id}/tweets", params={"limit": MAX_PAGE_LIMIT + 1}
+    )
+    assert response.status_code == 422
@@ -1,10 +1,13 @@
+from contextlib import contextmanager
 from random import choices
 from string import ascii_letters
+from typing import Any, Generator, List
 
 from app.database.database import Database
 from app.database.models import Attachment, Like, User
 from app.database.models.base import Base
 from app.database.models.tweet import MAX_TWEET_LENGTH, Tweet
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -92,3 +95,24 @@ async def create_attachment_tweet_like(
     await session.commit()
     assert like.id
     return attachment, tweet, like
+
+
+@contextmanager
+def count_queries(db: Database) -> Generator[List[str], None, None]:
+    """
+    Контекстный менеджер собирает SQL-запросы, выполненные движком БД внутри блока.
+
+    :param db: Экземпляр класса Database для работы с БД.
+    :return: Список выполненных запросов.
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = db.get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)